@@ -0,0 +1,417 @@
+# Balance Simulator - Play thousands of headless games with a bot and report how they went
+#
+# Example:
+#   python balance_sim.py --games 10000 --set ENEMY_SPAWN_TIME=150 --json report.json
+#
+# --set takes any game_config constant, or a dotted path into EVOLUTIONS / PET_DATA:
+#   --set BOSS_SPAWN_INTERVAL=8
+#   --set "PET_DATA.Range Owl.cost=5"
+#   --set EVOLUTIONS.3.stats.damage=4
+# Values are Python literals (numbers, strings, lists, dicts).
+import argparse
+import ast
+import json
+import math
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+import numpy as np
+import pygame
+from game_config import *
+from event_bus import bus
+from game_manager import GameManager
+from headless import KeyState
+from pets import get_pet_cost
+
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Bot tuning
+BOT_CLICKS_PER_SECOND = 6  # how fast the bot can click, roughly a determined human
+BOT_FLEE_HEALTH = 0.3  # run from enemies below this fraction of max health
+BOT_STUCK_FRAMES = 20  # frames without moving before the bot tries a sidestep
+BOT_SAFETY_MARGIN = 10  # pixels the bot keeps outside enemy attack range
+
+
+class BalanceBot:
+    """Scripted player: kites the nearest enemy, grabs pickups, flees when hurt, buys pets
+
+    The bot only talks to the game the way a player does: held movement keys
+    and mouse/keyboard events passed to GameManager.handle_input.
+    """
+
+    def __init__(self, rng, clicks_per_second=BOT_CLICKS_PER_SECOND, flee_health=BOT_FLEE_HEALTH):
+        self.rng = rng
+        self.keys = KeyState()
+        self.click_interval = max(1, round(FPS / clicks_per_second))
+        self.flee_health = flee_health
+        self.frames_since_click = 0
+        self.last_position = None
+        self.still_frames = 0
+        self.sidestep = None  # (dx, dy, frames left) while working around a wall
+
+    def act(self, game_manager):
+        """Set this frame's held keys and return the input events to send"""
+        player = game_manager.player
+        events = self._shop_events(game_manager)
+
+        nearest_enemy, enemy_distance = self._nearest_enemy(game_manager)
+        nearest_pickup, pickup_distance = self._nearest_pickup(game_manager)
+
+        # Clicking: enemies in reach first, then pickups in reach
+        self.frames_since_click += 1
+        if self.frames_since_click >= self.click_interval:
+            target = None
+            if nearest_enemy is not None and enemy_distance <= player.attack_range + nearest_enemy[2] / 2:
+                target = (nearest_enemy[0], nearest_enemy[1])
+            elif nearest_pickup is not None and pickup_distance <= player.attack_range + nearest_pickup.rect.width / 2:
+                target = nearest_pickup.rect.center
+            if target is not None:
+                events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=target, button=1))
+                self.frames_since_click = 0
+
+        # Movement: our clicks reach further than enemy attacks, so hover in between
+        center = player.rect.center
+        hurt = player.health < player.max_health * self.flee_health
+        too_close = ENEMY_ATTACK_RANGE + BOT_SAFETY_MARGIN
+        if nearest_enemy is not None and (enemy_distance < too_close or (hurt and enemy_distance < too_close * 2)):
+            move = (center[0] - nearest_enemy[0], center[1] - nearest_enemy[1])  # back off
+        elif nearest_pickup is not None and (nearest_enemy is None or enemy_distance > player.attack_range):
+            move = (nearest_pickup.rect.centerx - center[0], nearest_pickup.rect.centery - center[1])
+        elif nearest_enemy is not None and enemy_distance > player.attack_range + nearest_enemy[2] / 2 - BOT_SAFETY_MARGIN:
+            move = (nearest_enemy[0] - center[0], nearest_enemy[1] - center[1])
+        else:
+            move = (0, 0)
+        self._steer(player, move)
+        return events
+
+    def _nearest_enemy(self, game_manager):
+        """(center_x, center_y, width) of the closest enemy and its distance, or (None, inf)"""
+        store = game_manager.enemies
+        n = store.count
+        if n == 0:
+            return None, math.inf
+        center_x = store.x[:n] + store.width[:n] // 2
+        center_y = store.y[:n] + store.height[:n] // 2
+        player_x, player_y = game_manager.player.rect.center
+        distance = np.hypot(center_x - player_x, center_y - player_y)
+        slot = int(np.argmin(distance))
+        return (int(center_x[slot]), int(center_y[slot]), int(store.width[slot])), float(distance[slot])
+
+    def _nearest_pickup(self, game_manager):
+        """Closest golden apple or shield fruit and its distance, or (None, inf)"""
+        player_x, player_y = game_manager.player.rect.center
+        best, best_distance = None, math.inf
+        for pickup in game_manager.golden_apples:
+            distance = math.hypot(pickup.rect.centerx - player_x, pickup.rect.centery - player_y)
+            if distance < best_distance:
+                best, best_distance = pickup, distance
+        return best, best_distance
+
+    def _steer(self, player, move):
+        """Hold the movement keys for a direction, sidestepping if a wall stops us"""
+        position = player.rect.topleft
+        if move != (0, 0) and position == self.last_position:
+            self.still_frames += 1
+        else:
+            self.still_frames = 0
+        self.last_position = position
+
+        if self.sidestep is None and self.still_frames >= BOT_STUCK_FRAMES:
+            # Slide perpendicular to where we were heading for a moment
+            side = self.rng.choice((-1, 1))
+            self.sidestep = (-move[1] * side, move[0] * side, BOT_STUCK_FRAMES)
+            self.still_frames = 0
+        if self.sidestep is not None:
+            dx, dy, frames_left = self.sidestep
+            move = (dx, dy)
+            self.sidestep = (dx, dy, frames_left - 1) if frames_left > 1 else None
+
+        dead_zone = player.speed
+        self._hold(pygame.K_a, move[0] < -dead_zone)
+        self._hold(pygame.K_d, move[0] > dead_zone)
+        self._hold(pygame.K_w, move[1] < -dead_zone)
+        self._hold(pygame.K_s, move[1] > dead_zone)
+
+    def _hold(self, key, down):
+        if down:
+            self.keys.press(key)
+        else:
+            self.keys.release(key)
+
+    def _shop_events(self, game_manager):
+        """Buy and equip the cheapest affordable pet while a pet slot is free, through the menus"""
+        player = game_manager.player
+        if None not in player.pet_objects:
+            return []
+        available = player.get_available_pets()
+        affordable = [name for name in available if player.can_buy_pet(name)]
+        if not affordable:
+            return []
+        pet_name = min(affordable, key=get_pet_cost)
+
+        # Same click positions the pet shop and pet team screens use
+        shop_row = (60, 100 + available.index(pet_name) * 60 + 10)
+        confirm_button = (SCREEN_WIDTH // 2 - 90, 440)
+        team_row = (60, 100 + len(player.owned_pets) * 40 + 10)  # the new pet is appended last
+        return [
+            pygame.event.Event(pygame.KEYDOWN, key=pygame.K_p),
+            pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=shop_row, button=1),
+            pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=confirm_button, button=1),
+            pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE),
+            pygame.event.Event(pygame.KEYDOWN, key=pygame.K_t),
+            pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=team_row, button=1),
+            pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE),
+        ]
+
+
+def _death_cause(game_manager):
+    """Classify what killed the player from the enemies standing next to them"""
+    store = game_manager.enemies
+    n = store.count
+    player_x, player_y = game_manager.player.rect.center
+    center_x = store.x[:n] + store.width[:n] // 2
+    center_y = store.y[:n] + store.height[:n] // 2
+    in_range = np.hypot(center_x - player_x, center_y - player_y) < ENEMY_ATTACK_RANGE
+    if (in_range & store.is_boss[:n]).any():
+        return "boss"
+    if in_range.sum() >= 3:
+        return "swarmed"
+    return "enemy"
+
+
+def play_game(seed, max_frames=FPS * 600, game_manager=None):
+    """Play one bot game to death or the frame limit and return what happened
+
+    Passing in a GameManager from an earlier game reuses its start-up work
+    (like cached enemy path fields); the game itself is reset.
+    """
+    random.seed(seed)
+    bot = BalanceBot(random.Random(seed ^ 0x5EED))
+    if game_manager is None:
+        game_manager = GameManager()
+    else:
+        game_manager.reset_game()
+    player = game_manager.player
+
+    level_times = {1: 0.0}  # level -> seconds when first reached
+    wins_by_level = Counter()  # wins earned while at each level
+    pets_bought = []  # (pet name, level when bought)
+    wins_spent = 0
+    wins_earned = 0
+    death_cause = None
+
+    frame = 0
+    for frame in range(1, max_frames + 1):
+        level = player.level
+        owned_before = len(player.owned_pets)
+        for event in bot.act(game_manager):
+            game_manager.handle_input(event)
+        for pet_name in player.owned_pets[owned_before:]:
+            pets_bought.append((pet_name, level))
+            wins_spent += get_pet_cost(pet_name)
+
+        game_manager.update_game(bot.keys)
+
+        earned = player.wins + wins_spent
+        wins_by_level[level] += earned - wins_earned
+        wins_earned = earned
+        if player.level != level:
+            for reached in range(level + 1, player.level + 1):
+                level_times[reached] = frame / FPS
+        if not player.is_alive():
+            death_cause = _death_cause(game_manager)
+            break
+
+    return {
+        "seed": seed,
+        "frames": frame,
+        "seconds": frame / FPS,
+        "died": death_cause is not None,
+        "death_cause": death_cause,
+        "final_level": player.level,
+        "level_times": level_times,
+        "wins_earned": wins_earned,
+        "wins_by_level": dict(wins_by_level),
+        "pets_bought": pets_bought,
+    }
+
+
+def apply_overrides(overrides):
+    """Change balance values in every loaded game module
+
+    Modules copy game_config constants with "from game_config import *", so a
+    plain name is re-bound in each module that has it. Dotted paths edit
+    EVOLUTIONS / PET_DATA entries in place. Modules with precomputed
+    progression tables rebuild them afterwards.
+    """
+    modules = [module for module in list(sys.modules.values())
+               if os.path.dirname(os.path.abspath(getattr(module, "__file__", None) or "")) == GAME_DIR]
+    for path, value in overrides.items():
+        name, *keys = path.split(".")
+        owners = [module for module in modules if hasattr(module, name)]
+        if not owners:
+            raise KeyError(f"Unknown balance setting: {name}")
+        if not keys:
+            for module in owners:
+                setattr(module, name, value)
+            continue
+        for table in {id(getattr(module, name)): getattr(module, name) for module in owners}.values():
+            for key in keys[:-1]:
+                table = table[_table_key(table, key)]
+            table[_table_key(table, keys[-1])] = value
+    for module in modules:
+        if hasattr(module, "rebuild_tables"):
+            module.rebuild_tables()
+
+
+def _table_key(table, key):
+    """Dict keys from the command line are strings; EVOLUTIONS is keyed by int"""
+    if key not in table and key.lstrip("-").isdigit():
+        return int(key)
+    return key
+
+
+def parse_override(text):
+    """Turn "NAME=value" into (NAME, value)"""
+    if "=" not in text:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text!r}")
+    path, raw_value = text.split("=", 1)
+    try:
+        value = ast.literal_eval(raw_value)
+    except (ValueError, SyntaxError):
+        value = raw_value
+    return path.strip(), value
+
+
+_worker_game = None  # each worker process reuses one GameManager
+
+
+def _init_worker(overrides):
+    """Per-process setup: silence the game's console messages and apply the overrides"""
+    global _worker_game
+    bus.set_console_level(None)
+    apply_overrides(overrides)
+    _worker_game = GameManager()
+
+
+def _play_task(task):
+    seed, max_frames = task
+    return play_game(seed, max_frames, _worker_game)
+
+
+def run_sweep(games, first_seed=0, max_frames=FPS * 600, overrides=None, processes=None, progress=None):
+    """Play many games across a process pool and return the per-game results"""
+    overrides = overrides or {}
+    tasks = [(seed, max_frames) for seed in range(first_seed, first_seed + games)]
+    processes = processes or os.cpu_count() or 1
+    chunksize = max(1, min(32, games // (processes * 8)))
+
+    results = []
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(overrides,)) as pool:
+        for result in pool.imap_unordered(_play_task, tasks, chunksize):
+            results.append(result)
+            if progress is not None:
+                progress(len(results), games)
+    results.sort(key=lambda result: result["seed"])
+    return results
+
+
+def _percentile(values, percent):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(percent / 100 * len(ordered)) - 1))]
+
+
+def build_report(results):
+    """Aggregate per-game results into the balance report"""
+    games = len(results)
+    deaths = [result for result in results if result["died"]]
+    max_level = max(result["final_level"] for result in results)
+
+    levels = []
+    for level in range(1, max_level + 1):
+        reached = [result["level_times"][level] for result in results if level in result["level_times"]]
+        pets = [pet for result in results for pet, pet_level in result["pets_bought"] if pet_level == level]
+        levels.append({
+            "level": level,
+            "reached": len(reached) / games,
+            "median_seconds_to_reach": statistics.median(reached) if reached else None,
+            "p90_seconds_to_reach": _percentile(reached, 90) if reached else None,
+            "wins_per_game": sum(result["wins_by_level"].get(level, 0) for result in results) / games,
+            "pets_bought_per_game": len(pets) / games,
+            "pets_bought": dict(Counter(pets).most_common()),
+            "deaths": sum(1 for result in deaths if result["final_level"] == level),
+        })
+
+    survival = [result["seconds"] for result in results]
+    return {
+        "games": games,
+        "death_rate": len(deaths) / games,
+        "median_survival_seconds": statistics.median(survival),
+        "p90_survival_seconds": _percentile(survival, 90),
+        "mean_wins_earned": sum(result["wins_earned"] for result in results) / games,
+        "death_causes": dict(Counter(result["death_cause"] for result in deaths).most_common()),
+        "levels": levels,
+    }
+
+
+def print_report(report):
+    """Human-readable version of build_report()"""
+    print(f"Games: {report['games']}   deaths: {report['death_rate']:.1%}   "
+          f"survival median {report['median_survival_seconds']:.1f}s, p90 {report['p90_survival_seconds']:.1f}s   "
+          f"wins earned per game: {report['mean_wins_earned']:.1f}")
+    causes = ", ".join(f"{cause} {count}" for cause, count in report["death_causes"].items())
+    print(f"Death causes: {causes or 'none'}")
+    print()
+    print(f"{'Level':>5} {'Reached':>8} {'Median s':>9} {'p90 s':>8} {'Wins':>6} {'Pets':>6} {'Deaths':>7}")
+    for row in report["levels"]:
+        median = f"{row['median_seconds_to_reach']:.1f}" if row["median_seconds_to_reach"] is not None else "-"
+        p90 = f"{row['p90_seconds_to_reach']:.1f}" if row["p90_seconds_to_reach"] is not None else "-"
+        print(f"{row['level']:>5} {row['reached']:>8.1%} {median:>9} {p90:>8} "
+              f"{row['wins_per_game']:>6.2f} {row['pets_bought_per_game']:>6.2f} {row['deaths']:>7}")
+
+
+def main():
+    """Command line entry point for balance sweeps"""
+    parser = argparse.ArgumentParser(description="Monte Carlo balance simulation with a bot player")
+    parser.add_argument("--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game (games use consecutive seeds)")
+    parser.add_argument("--minutes", type=float, default=10, help="stop each game after this much gameplay")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--set", dest="overrides", action="append", type=parse_override, default=[],
+                        metavar="NAME=VALUE", help="override a balance value (repeatable)")
+    parser.add_argument("--json", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    overrides = dict(args.overrides)
+    try:
+        apply_overrides(overrides)  # fail fast on typos before starting the pool
+    except (KeyError, IndexError, TypeError) as error:
+        parser.error(f"--set: {error}")
+
+    def progress(done, total):
+        if done == total or done % max(1, total // 20) == 0:
+            print(f"\r{done}/{total} games", end="", file=sys.stderr, flush=True)
+
+    start_time = time.perf_counter()
+    results = run_sweep(args.games, args.seed, int(args.minutes * 60 * FPS), overrides, args.processes, progress)
+    elapsed = time.perf_counter() - start_time
+    print(file=sys.stderr)
+
+    report = build_report(results)
+    report["overrides"] = overrides
+    report["elapsed_seconds"] = elapsed
+    print_report(report)
+    print(f"\nPlayed {args.games} games in {elapsed:.1f}s")
+
+    if args.json:
+        with open(args.json, "w") as report_file:
+            json.dump(report, report_file, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
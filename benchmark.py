@@ -0,0 +1,388 @@
+# Benchmarks - Fixed-seed scenarios at increasing scale, update and render timed separately
+#
+# Example:
+#   python benchmark.py --output baseline.json                 # record a baseline
+#   python benchmark.py --compare baseline.json                # fails (exit 1) on regressions
+#   python benchmark.py --scenarios enemies_100 particles_burst --frames 600
+#   python benchmark.py --memory --scenarios enemies_10     # also bytes per entity and GC pauses
+#
+# Every scenario starts from the same seed and plays the same scripted input,
+# so two runs do the same work; only the timings depend on the machine.
+# Rendering goes to an offscreen display (SDL dummy driver) and present()
+# isn't timed. Compare against baselines recorded on the same machine.
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pygame
+from game_config import *
+from event_bus import bus, EnemyDefeated
+from game_manager import GameManager
+from enemies import Enemy, Boss
+from flow_field import FlowField
+from frame_profiler import FrameProfiler
+from golden_apple import GoldenApple
+from headless import KeyState
+from particles import ParticlePool
+from pets import PET_DATA, Pet
+from shield_fruit import ShieldFruit
+from walls import Wall, WallGrid
+
+BENCHMARK_SEED = 1234
+BENCHMARK_FRAMES = 300  # timed frames per scenario
+WARMUP_FRAMES = 30  # untimed frames first (fills caches, builds flow fields)
+REGRESSION_THRESHOLD = 1.25  # a p50 this many times the baseline counts as a regression
+MOVE_PATTERN = (pygame.K_d, pygame.K_s, pygame.K_a, pygame.K_w)  # the player walks a square
+MOVE_STEP_FRAMES = 45
+MEMORY_SAMPLE_SIZE = 1000  # entities of each kind created to measure bytes per entity
+GC_SESSION_MINUTES = 10  # shielded bot gameplay watched for garbage collector pauses
+KILL_CHURN_KILLS = 100000  # enemies spawned and killed back to back for the kill-heavy measurement
+
+
+def _free_position(game_manager, width, height, attempts=10000):
+    """Random top-left corner inside the gameplay area that doesn't touch a wall"""
+    for _ in range(attempts):
+        x = random.randint(GAMEPLAY_LEFT, GAMEPLAY_RIGHT - width)
+        y = random.randint(GAMEPLAY_TOP, GAMEPLAY_BOTTOM - height)
+        if not game_manager.wall_grid.collides(pygame.Rect(x, y, width, height)):
+            return x, y
+    raise RuntimeError(f"No room for a {width}x{height} rect between the walls")
+
+
+def _add_enemies(game_manager, count, level=3, boss_every=25):
+    """Spawn enemies scattered over the arena (every boss_every-th one a boss)"""
+    for index in range(count):
+        enemy_type = Boss if boss_every and index % boss_every == boss_every - 1 else Enemy
+        enemy = enemy_type(game_manager.enemies, level)
+        rect = enemy.rect
+        rect.topleft = _free_position(game_manager, rect.width, rect.height)
+        enemy.rect = rect
+
+
+def _add_pickups(game_manager, count):
+    for index in range(count):
+        pickup_type = ShieldFruit if index % 5 == 0 else GoldenApple
+        pickup = pickup_type(position=_free_position(game_manager, 30, 30))
+        game_manager.golden_apples.insert(pickup, pickup.rect.x, pickup.rect.y)
+
+
+def _use_walls(game_manager, walls):
+    game_manager.walls = walls
+    game_manager.wall_grid = WallGrid(walls)
+    game_manager.flow_field = FlowField(game_manager.wall_grid)
+    game_manager.boss_flow_field = FlowField(game_manager.wall_grid, agent_size=BOSS_SIZE)
+
+
+def _pillar_walls(columns=12, rows=10, size=12):
+    """A dense grid of small pillars covering the arena (gaps fit an enemy, not a boss)"""
+    walls = []
+    spacing_x = (GAMEPLAY_RIGHT - GAMEPLAY_LEFT) // columns
+    spacing_y = (GAMEPLAY_BOTTOM - GAMEPLAY_TOP) // rows
+    for column in range(columns):
+        for row in range(rows):
+            walls.append(Wall(GAMEPLAY_LEFT + column * spacing_x + spacing_x // 2,
+                              GAMEPLAY_TOP + row * spacing_y + spacing_y // 2, size, size))
+    return walls
+
+
+def _fill_pet_slots(game_manager):
+    player = game_manager.player
+    for slot, name in enumerate(list(PET_DATA)[:3]):
+        player.owned_pets.append(name)
+        player.set_active_pet(slot, name)
+
+
+def _explode_every_lifetime(explosions):
+    """Per-frame hook: a wave of explosions whenever the last wave has burnt out"""
+    def before_frame(game_manager, frame):
+        if frame % PARTICLE_LIFETIME == 0:
+            for _ in range(explosions):
+                x, y = _free_position(game_manager, 1, 1)
+                game_manager.particles.spawn_explosion(x, y)
+    return before_frame
+
+
+# name -> (description, setup(game_manager), before_frame(game_manager, frame) or None, share of the frames)
+# The biggest scenarios take long per frame, so they time fewer frames
+SCENARIOS = {
+    "enemies_10": ("10 enemies", lambda game: _add_enemies(game, 10), None, 1),
+    "enemies_100": ("100 enemies", lambda game: _add_enemies(game, 100), None, 1),
+    "enemies_1000": ("1,000 enemies", lambda game: _add_enemies(game, 1000), None, 0.5),
+    "enemies_10000": ("10,000 enemies", lambda game: _add_enemies(game, 10000), None, 0.1),
+    "particles_burst": ("200 explosions (2,000 particles) every particle lifetime", lambda game: None,
+                        _explode_every_lifetime(200), 1),
+    "pickups_dense": ("400 golden apples and shield fruits", lambda game: _add_pickups(game, 400), None, 1),
+    "walls_many": ("120 pillar walls and 200 enemies",
+                   lambda game: (_use_walls(game, _pillar_walls()), _add_enemies(game, 200, boss_every=0)), None, 1),
+    "pets_full": ("all three pet slots filled, 100 enemies",
+                  lambda game: (_fill_pet_slots(game), _add_enemies(game, 100)), None, 1),
+}
+
+
+def run_scenario(name, screen, font, frames=BENCHMARK_FRAMES, warmup=WARMUP_FRAMES, seed=BENCHMARK_SEED):
+    """Play one scenario and return its timing summary (milliseconds per frame)"""
+    _, setup, before_frame, share = SCENARIOS[name]
+    frames = max(1, round(frames * share))
+    random.seed(seed)
+    game_manager = GameManager(screen, font)
+    setup(game_manager)
+    game_manager.player.activate_shield(10 ** 9)  # the player must survive the whole run
+    game_manager.player.rect.topleft = _free_position(game_manager, 40, 40)
+
+    profiler = FrameProfiler(game_manager, history=frames)
+    profiler.show_overlay = False
+    keys = KeyState()
+    for frame in range(warmup + frames):
+        if frame == warmup:
+            profiler.enable()
+        profiler.start_frame()
+        if before_frame is not None:
+            before_frame(game_manager, frame)
+        keys.pressed = {MOVE_PATTERN[frame // MOVE_STEP_FRAMES % len(MOVE_PATTERN)]}
+        game_manager.update_game(keys)
+        game_manager.draw_game()
+    profiler.disable()
+
+    summary = profiler.summary()
+    return {
+        "update_ms": summary["update"],
+        "render_ms": summary["draw"],
+        "phases_p50_ms": {phase: stats["p50"] for phase, stats in summary.items()
+                          if phase not in ("update", "draw")},
+        "frames": frames,
+        "enemies_at_end": len(game_manager.enemies),
+        "particles_at_end": len(game_manager.particles),
+    }
+
+
+def run_benchmarks(names, frames=BENCHMARK_FRAMES, warmup=WARMUP_FRAMES, seed=BENCHMARK_SEED, progress=None):
+    """Run scenarios offscreen and return machine-readable results"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    font = pygame.font.Font(None, 24)
+    bus.set_console_level(None)
+
+    results = {
+        "meta": {
+            "seed": seed, "frames": frames, "warmup_frames": warmup,
+            "python": platform.python_version(), "numpy": np.__version__, "pygame": pygame.version.ver,
+            "machine": platform.machine(), "system": platform.system(),
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "scenarios": {},
+    }
+    for name in names:
+        if progress is not None:
+            progress(name)
+        results["scenarios"][name] = run_scenario(name, screen, font, frames, warmup, seed)
+    return results
+
+
+def entity_memory(count=MEMORY_SAMPLE_SIZE):
+    """Bytes allocated per entity of each kind, averaged over count new ones (tracemalloc)
+
+    Enemies count their share of the store's columns; particles are the
+    pool's columns per slot. "removed_enemy" is what a killed enemy keeps
+    while something still holds it (its values, detached from the store).
+    """
+    bus.set_console_level(None)
+    random.seed(BENCHMARK_SEED)
+    game_manager = GameManager()
+    pet_name = next(iter(PET_DATA))
+    makers = {
+        "enemy": lambda: Enemy(game_manager.enemies, 10),
+        "boss": lambda: Boss(game_manager.enemies, 10),
+        "golden_apple": GoldenApple,
+        "shield_fruit": ShieldFruit,
+        "pet": lambda: Pet(pet_name, 0),
+        "wall": lambda: Wall(GAMEPLAY_LEFT, GAMEPLAY_TOP, 25, 150),
+    }
+    result = {}
+    tracemalloc.start()
+    gc.disable()  # a collection in the middle would free unrelated memory
+    try:
+        for kind, make in makers.items():
+            game_manager.reset_game()
+            gc.collect()
+            before = tracemalloc.get_traced_memory()[0]
+            entities = [make() for _ in range(count)]
+            result[kind] = (tracemalloc.get_traced_memory()[0] - before) / count
+            if kind == "enemy":
+                before = tracemalloc.get_traced_memory()[0]
+                for enemy in entities:
+                    game_manager.enemies.remove(enemy)
+                result["removed_enemy"] = (tracemalloc.get_traced_memory()[0] - before) / count
+            del entities
+        before = tracemalloc.get_traced_memory()[0]
+        pool = ParticlePool(count)
+        result["particle"] = (tracemalloc.get_traced_memory()[0] - before) / count
+        del pool
+    finally:
+        gc.enable()
+        tracemalloc.stop()
+    return result
+
+
+def gc_pauses(minutes=GC_SESSION_MINUTES, seed=BENCHMARK_SEED):
+    """Garbage collections and their pauses (ms) per generation during a long bot session"""
+    from balance_sim import play_game  # balance_sim's bot plays; the shield keeps it alive to the end
+    bus.set_console_level(None)
+    game_manager = GameManager()
+    reset_game = game_manager.reset_game
+
+    def reset_with_shield():
+        reset_game()
+        game_manager.player.activate_shield(10 ** 9)
+
+    game_manager.reset_game = reset_with_shield
+    game, generations = _watch_gc(lambda: play_game(seed, max_frames=round(minutes * 60 * FPS),
+                                                    game_manager=game_manager))
+    return {"seconds": game["seconds"], "final_level": game["final_level"], "generations": generations}
+
+
+def kill_churn(kills=KILL_CHURN_KILLS, seed=BENCHMARK_SEED):
+    """Spawn and kill enemies back to back (as a click kills them): time per kill and GC pauses"""
+    bus.set_console_level(None)
+    random.seed(seed)
+    enemies = GameManager().enemies
+
+    def churn():
+        started = time.perf_counter()
+        for kill in range(kills):
+            enemy = Enemy(enemies, 10)
+            enemies.remove(enemy)
+            bus.emit(EnemyDefeated, enemy.name, 1)
+            if kill % FPS == 0:
+                bus.flush()
+        bus.flush()
+        return (time.perf_counter() - started) / kills * 1e6
+
+    microseconds, generations = _watch_gc(churn)
+    return {"kills": kills, "us_per_kill": microseconds, "generations": generations}
+
+
+def _watch_gc(run):
+    """Call run() and return its result with the collections and pauses (ms) per GC generation meanwhile"""
+    pauses = {generation: [] for generation in range(3)}
+    started = []
+
+    def on_collection(phase, info):
+        if phase == "start":
+            started.append(time.perf_counter())
+        else:
+            pauses[info["generation"]].append((time.perf_counter() - started.pop()) * 1000)
+
+    gc.collect()
+    gc.callbacks.append(on_collection)
+    try:
+        result = run()
+    finally:
+        gc.callbacks.remove(on_collection)
+    return result, {str(generation): {"collections": len(times), "total_ms": sum(times),
+                                      "max_ms": max(times, default=0.0)}
+                    for generation, times in pauses.items()}
+
+
+def _print_generations(generations):
+    for generation, stats in generations.items():
+        print(f"  generation {generation}: {stats['collections']:>4} collections, "
+              f"{stats['total_ms']:.1f} ms in total, longest {stats['max_ms']:.2f} ms")
+
+
+def print_memory(memory):
+    print("\nBytes per entity:")
+    for kind, size in memory["bytes_per_entity"].items():
+        print(f"  {kind:<14} {size:>8.0f}")
+    session = memory["gc_pauses"]
+    print(f"Garbage collection over {session['seconds'] / 60:.0f} minutes of play (reached level {session['final_level']}):")
+    _print_generations(session["generations"])
+    churn = memory["kill_churn"]
+    print(f"Garbage collection over {churn['kills']:,} kills back to back ({churn['us_per_kill']:.1f} us per kill):")
+    _print_generations(churn["generations"])
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Rows of (scenario, metric, baseline ms, current ms, ratio, regressed) for the p50s of both runs"""
+    rows = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        metrics = [("update", previous["update_ms"]["p50"], current["update_ms"]["p50"]),
+                   ("render", previous["render_ms"]["p50"], current["render_ms"]["p50"])]
+        for phase, value in current["phases_p50_ms"].items():
+            if phase in previous["phases_p50_ms"]:
+                metrics.append((phase, previous["phases_p50_ms"][phase], value))
+        for metric, before, after in metrics:
+            ratio = after / before if before > 0 else float("inf")
+            # Sub-microsecond phases are all noise; only flag ones that take real time
+            regressed = ratio > threshold and after - before > 0.01
+            rows.append((name, metric, before, after, ratio, regressed))
+    return rows
+
+
+def print_results(results):
+    print(f"{'scenario':<18} {'update p50':>10} {'p95':>8} {'p99':>8}   {'render p50':>10} {'p95':>8} {'p99':>8}")
+    for name, result in results["scenarios"].items():
+        update, render = result["update_ms"], result["render_ms"]
+        print(f"{name:<18} {update['p50']:>10.3f} {update['p95']:>8.3f} {update['p99']:>8.3f}   "
+              f"{render['p50']:>10.3f} {render['p95']:>8.3f} {render['p99']:>8.3f}")
+    print("(milliseconds per frame)")
+
+
+def print_comparison(rows, threshold):
+    print(f"\nAgainst the baseline (p50, regression = over {threshold:.2f}x):")
+    for name, metric, before, after, ratio, regressed in rows:
+        if metric in ("update", "render") or regressed:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"  {name:<18} {metric:<18} {before:>8.3f} -> {after:>8.3f} ms  ({ratio:.2f}x){flag}")
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Run the fixed-seed benchmark scenarios")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS),
+                        help="scenarios to run (default: all)")
+    parser.add_argument("--frames", type=int, default=BENCHMARK_FRAMES, help="timed frames per scenario")
+    parser.add_argument("--warmup", type=int, default=WARMUP_FRAMES, help="untimed frames before timing")
+    parser.add_argument("--seed", type=int, default=BENCHMARK_SEED, help="random seed for every scenario")
+    parser.add_argument("--output", help="write the results as JSON (e.g. to use as a baseline later)")
+    parser.add_argument("--compare", help="baseline JSON to compare against; exits with 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="p50 ratio over the baseline that counts as a regression")
+    parser.add_argument("--memory", action="store_true",
+                        help=f"also measure bytes per entity and GC pauses over {GC_SESSION_MINUTES} minutes of play")
+    args = parser.parse_args()
+
+    def progress(name):
+        print(f"Running {name}: {SCENARIOS[name][0]}", file=sys.stderr)
+
+    results = run_benchmarks(args.scenarios, args.frames, args.warmup, args.seed, progress)
+    print_results(results)
+    if args.memory:
+        print("Measuring memory and garbage collection", file=sys.stderr)
+        results["memory"] = {"bytes_per_entity": entity_memory(), "gc_pauses": gc_pauses(seed=args.seed),
+                             "kill_churn": kill_churn(seed=args.seed)}
+        print_memory(results["memory"])
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        rows = compare(results, baseline, args.threshold)
+        print_comparison(rows, args.threshold)
+        if any(row[-1] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import pygame
+from game_config import DIRTY_RECT_FULL_UPDATE_RATIO, DIRTY_RECT_MERGE_COUNT
+
+
+class DirtyRectTracker:
+    """Collects the screen regions that changed this frame and pushes only those
+
+    The renderer still draws the whole frame to the screen surface; the tracker
+    just decides which parts of it need copying to the window. A region is
+    dirty if something moving was drawn there this frame or last frame (so the
+    old position gets cleaned up too).
+    """
+
+    def __init__(self, screen_rect, full_update_ratio=DIRTY_RECT_FULL_UPDATE_RATIO):
+        self.screen_rect = pygame.Rect(screen_rect)
+        self.full_update_ratio = full_update_ratio
+        self._current = []  # rects drawn this frame
+        self._previous = []  # rects drawn last frame
+        self._full_update = True  # the first frame always goes out whole
+        self.full_updates = 0
+        self.partial_updates = 0
+
+    def mark(self, rect):
+        """Record a region that was drawn this frame"""
+        self._current.append(rect)
+
+    def mark_many(self, rects):
+        """Record several regions at once"""
+        self._current.extend(rects)
+
+    def mark_all(self):
+        """Force the next present() to update the whole window"""
+        self._full_update = True
+
+    def present(self):
+        """Send this frame's changes to the window (a full flip when the dirty area is large)"""
+        rects = self._previous + self._current
+        if len(rects) > DIRTY_RECT_MERGE_COUNT:
+            # Lots of small rects (e.g. particles) cost more to submit than one bigger one
+            rects = [rects[0].unionall(rects[1:])]
+        rects = [rect.clip(self.screen_rect) for rect in rects]
+        rects = [rect for rect in rects if rect.width and rect.height]
+
+        dirty_area = sum(rect.width * rect.height for rect in rects)
+        screen_area = self.screen_rect.width * self.screen_rect.height
+        if self._full_update or dirty_area > screen_area * self.full_update_ratio:
+            pygame.display.flip()
+            self.full_updates += 1
+        elif rects:
+            pygame.display.update(rects)
+            self.partial_updates += 1
+
+        self._previous = self._current
+        self._current = []
+        self._full_update = False
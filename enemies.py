@@ -1,35 +1,113 @@
 import pygame
 import random
 from game_config import *
+from event_bus import bus, EnemyAttacked
 from game_math import (
     generate_random_spawn_position,
     calculate_enemy_stats_for_level,
-    calculate_boss_stats_for_level,
-    calculate_distance,
-    normalize_vector,
-    clamp_value
+    calculate_boss_stats_for_level
 )
 
 
+def _store_field(name, cast):
+    """Expose one EnemyStore column as an attribute of the enemy view"""
+    def getter(self):
+        return cast(getattr(self._store, name)[self._slot])
+
+    def setter(self, value):
+        getattr(self._store, name)[self._slot] = value
+
+    return property(getter, setter)
+
+
 class Enemy:
-    def __init__(self, walls, player_level=1):
-        # Generate spawn position outside gameplay area
-        x, y = generate_random_spawn_position()
-        self.rect = pygame.Rect(x, y, 40, 40)
+    """A view onto one row of an EnemyStore; the store owns the actual values"""
+
+    __slots__ = ("_store", "_slot")
+
+    health = _store_field("health", float)
+    max_health = _store_field("max_health", float)
+    speed = _store_field("speed", int)
+    attack_damage = _store_field("attack_damage", int)
+    last_attack = _store_field("last_attack", int)
+    is_boss = _store_field("is_boss", bool)
+
+    def __init__(self, store, player_level=1):
+        self._store = store
+        self._slot = store.add(self)
+
+        # Generate spawn position outside gameplay area (written straight into the store, no Rect)
+        store, slot = self._store, self._slot
+        store.x[slot], store.y[slot] = generate_random_spawn_position()
+        store.width[slot] = store.height[slot] = ENEMY_SIZE
+        store.reindex(slot)
 
         # Generate random appearance
         self._generate_random_appearance()
 
         # Set stats based on player level
         self._set_stats_for_level(player_level)
-        self.is_boss = False
+
+    @classmethod
+    def from_store(cls, store, slot):
+        """View onto an enemy whose values are already in a store slot (e.g. a loaded save)"""
+        enemy = cls.__new__(cls)
+        enemy._store = store
+        enemy._slot = slot
+        return enemy
+
+    @property
+    def clock(self):
+        """SimulationClock shared by every enemy in the store"""
+        return self._store.clock
+
+    @property
+    def rect(self):
+        """Collision box built from the store (assign a Rect back to move the enemy)"""
+        store, slot = self._store, self._slot
+        return pygame.Rect(store.x[slot], store.y[slot], store.width[slot], store.height[slot])
+
+    @rect.setter
+    def rect(self, rect):
+        store, slot = self._store, self._slot
+        store.x[slot], store.y[slot] = rect.x, rect.y
+        store.width[slot], store.height[slot] = rect.width, rect.height
+        store.reindex(slot)
+
+    @property
+    def head(self):
+        return ENEMY_HEADS[self._store.head_id[self._slot]][0]
+
+    @property
+    def head_color(self):
+        return ENEMY_HEADS[self._store.head_id[self._slot]][1]
+
+    @property
+    def body(self):
+        return ENEMY_BODIES[self._store.body_id[self._slot]][0]
+
+    @property
+    def body_color(self):
+        return ENEMY_BODIES[self._store.body_id[self._slot]][1]
+
+    @property
+    def accessory(self):
+        return ENEMY_ACCESSORIES[self._store.accessory_id[self._slot]][0]
+
+    @property
+    def accessory_color(self):
+        return ENEMY_ACCESSORIES[self._store.accessory_id[self._slot]][1]
+
+    @property
+    def name(self):
+        return f"{self.head}-{self.body}-{self.accessory}"
 
     def _generate_random_appearance(self):
         """Create random enemy appearance from available parts"""
-        self.head, self.head_color = random.choice(ENEMY_HEADS)
-        self.body, self.body_color = random.choice(ENEMY_BODIES)
-        self.accessory, self.accessory_color = random.choice(ENEMY_ACCESSORIES)
-        self.name = f"{self.head}-{self.body}-{self.accessory}"
+        store, slot = self._store, self._slot
+        store.head_id[slot] = random.randrange(len(ENEMY_HEADS))
+        store.body_id[slot] = random.randrange(len(ENEMY_BODIES))
+        store.accessory_id[slot] = random.randrange(len(ENEMY_ACCESSORIES))
 
     def _set_stats_for_level(self, player_level):
         """Set enemy stats based on player level using mathematical scaling"""
@@ -40,70 +118,14 @@ class Enemy:
         self.attack_damage = random.randint(enemy_stats["min_damage"], enemy_stats["max_damage"])
         self.last_attack = 0
 
-    def update_movement(self, player, walls):
-        """Move towards player while avoiding walls"""
-        # Calculate direction to player
-        dx = player.rect.centerx - self.rect.centerx
-        dy = player.rect.centery - self.rect.centery
-
-        # Normalize direction and apply speed
-        norm_dx, norm_dy = normalize_vector(dx, dy)
-        move_x = norm_dx * self.speed
-        move_y = norm_dy * self.speed
-
-        # Try to move towards player
-        self._attempt_movement(move_x, move_y, walls)
-
-        # Keep enemies near gameplay area (allow slight off-screen movement)
-        self.rect.x = clamp_value(self.rect.x, GAMEPLAY_LEFT - 12, GAMEPLAY_RIGHT + 12)
-        self.rect.y = clamp_value(self.rect.y, GAMEPLAY_TOP - 12, GAMEPLAY_BOTTOM + 12)
-
-    def _attempt_movement(self, move_x, move_y, walls):
-        """Try to move, handling wall collisions intelligently"""
-        # Store original position
-        old_x, old_y = self.rect.x, self.rect.y
-
-        # Try full movement
-        self.rect.x += int(move_x)
-        self.rect.y += int(move_y)
-
-        # If we hit a wall, try alternative movements
-        if self._check_wall_collision(walls):
-            self.rect.x, self.rect.y = old_x, old_y  # Reset position
-
-            # Try moving only horizontally
-            self.rect.x += int(move_x)
-            if self._check_wall_collision(walls):
-                self.rect.x = old_x  # Reset horizontal movement
-
-                # Try moving only vertically
-                self.rect.y += int(move_y)
-                if self._check_wall_collision(walls):
-                    self.rect.y = old_y  # Reset if that also fails
-
-    def _check_wall_collision(self, walls):
-        """Check if enemy is colliding with any wall"""
-        for wall in walls:
-            if self.rect.colliderect(wall.rect):
-                return True
-        return False
-
-    def can_attack_player(self, player):
-        """Check if player is within attack range"""
-        distance = calculate_distance(
-            (player.rect.centerx, player.rect.centery),
-            (self.rect.centerx, self.rect.centery)
-        )
-        return distance < ENEMY_ATTACK_RANGE
-
     def attempt_attack(self, player):
         """Attack player if cooldown has passed"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         if current_time - self.last_attack > ENEMY_ATTACK_COOLDOWN:
             self.last_attack = current_time
             player.take_damage(self.attack_damage)
             # No need to check shield here - the player.take_damage method handles that
-            print(f"{self.name} attacked for {self.attack_damage} damage!")
+            bus.emit(EnemyAttacked, self.name, self.attack_damage)
             return True
         return False
 
@@ -122,17 +144,22 @@ class Enemy:
 class Boss(Enemy):
     """A much stronger boss enemy with 10-30x health."""
 
-    def __init__(self, walls, player_level=1):
-        super().__init__(walls, player_level)
-        self.rect.width = 80  # Boss is twice as wide
-        self.rect.height = 80 # Boss is twice as tall
+    # Bosses have a unique, royal appearance.
+    head, head_color = ("Crown", (255, 215, 0))  # Gold
+    body, body_color = ("Royal Robe", (75, 0, 130))  # Indigo
+    accessory, accessory_color = ("Scepter", (192, 192, 192))  # Silver
+    name = "The Meme King"
+
+    __slots__ = ()
+
+    def __init__(self, store, player_level=1):
+        super().__init__(store, player_level)
+        self.is_boss = True
+        # Boss is twice as wide and twice as tall (the top-left corner stays, so the hash cell does too)
+        self._store.width[self._slot] = self._store.height[self._slot] = BOSS_SIZE
 
     def _generate_random_appearance(self):
-        """Bosses have a unique, royal appearance."""
-        self.head, self.head_color = ("Crown", (255, 215, 0))  # Gold
-        self.body, self.body_color = ("Royal Robe", (75, 0, 130))  # Indigo
-        self.accessory, self.accessory_color = ("Scepter", (192, 192, 192))  # Silver
-        self.name = "The Meme King"
+        """Bosses always look the same (see the class attributes)."""
 
     def _set_stats_for_level(self, player_level):
         """Set boss stats to be much higher than normal enemies."""
@@ -0,0 +1,395 @@
+import math
+import numpy as np
+from game_config import *
+from spatial_index import SpatialHash
+
+# Every per-enemy value lives in one NumPy column; Enemy objects are views onto a row
+ENEMY_FIELDS = (
+    ("x", np.int64),
+    ("y", np.int64),
+    ("width", np.int64),
+    ("height", np.int64),
+    ("speed", np.int64),
+    ("health", np.float64),
+    ("max_health", np.float64),
+    ("attack_damage", np.int64),
+    ("last_attack", np.int64),  # clock.get_ticks() of the last attack (cooldown start)
+    ("head_id", np.int8),  # index into ENEMY_HEADS
+    ("body_id", np.int8),  # index into ENEMY_BODIES
+    ("accessory_id", np.int8),  # index into ENEMY_ACCESSORIES
+    ("is_boss", np.bool_),
+    ("cell_column", np.int64),  # spatial hash cell of the top-left corner
+    ("cell_row", np.int64),
+    ("lod_phase", np.int64),  # offsets the ticks a far enemy moves on (its slot when added; see _due_to_move)
+    ("moved_frame", np.int64),  # clock frame of the last move
+)
+
+NO_PREVIOUS_POSITION = np.iinfo(np.int64).min  # spawned or loaded since the last move: drawn where it is
+
+# Per-enemy values only needed from one tick to the next; saves leave these out.
+# (name, dtype, value for a new enemy)
+TRANSIENT_FIELDS = (
+    ("previous_x", np.int64, NO_PREVIOUS_POSITION),  # where the enemy was before its last move,
+    ("previous_y", np.int64, NO_PREVIOUS_POSITION),  # so frames in between can be interpolated
+    ("update_interval", np.int64, 1),  # ticks covered by the last move (see ENEMY_LOD_DISTANCES)
+)
+
+_ALL_FIELD_NAMES = tuple(field[0] for field in ENEMY_FIELDS + TRANSIENT_FIELDS)
+_ROW_DTYPE = np.dtype([field[:2] for field in ENEMY_FIELDS + TRANSIENT_FIELDS])  # one enemy as a record
+
+# Below this many enemies a plain Python loop beats NumPy's per-call overhead
+SCALAR_MOVEMENT_LIMIT = 12
+
+
+class EnemyStore:
+    """Structure-of-arrays storage for all live enemies with vectorized updates
+
+    Live enemies are packed into slots 0..count-1. Removing an enemy moves the
+    last enemy into the freed slot, so removal is O(1) and the arrays never
+    have holes to skip over.
+    """
+
+    def __init__(self, clock, capacity=64):
+        self.clock = clock  # SimulationClock read by Enemy.attempt_attack
+        self.count = 0
+        self.views = []  # views[slot] is the Enemy object for that slot
+        self.index = SpatialHash()  # click hit-testing, kept in sync as enemies move
+        for name, dtype in ENEMY_FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        for name, dtype, initial in TRANSIENT_FIELDS:
+            setattr(self, name, np.full(capacity, initial, dtype=dtype))
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def __getitem__(self, index):
+        return self.views[index]
+
+    @property
+    def capacity(self):
+        return len(self.x)
+
+    def add(self, enemy):
+        """Reserve a slot for a new enemy and return its index"""
+        if self.count == self.capacity:
+            self._grow()
+        slot = self.count
+        for name, _ in ENEMY_FIELDS:
+            getattr(self, name)[slot] = 0
+        for name, _, initial in TRANSIENT_FIELDS:
+            getattr(self, name)[slot] = initial
+        self.lod_phase[slot] = slot
+        self.moved_frame[slot] = self.clock.frame - 1  # its first move covers the tick it appeared on
+        self.views.append(enemy)
+        self.count += 1
+        return slot
+
+    def remove(self, enemy):
+        """Remove an enemy in O(1); the enemy keeps its last values as a detached copy"""
+        slot = enemy._slot
+        last = self.count - 1
+
+        # Keep the removed enemy readable (callers still use its rect and name)
+        detached = DetachedRow(self.clock, self, slot)
+
+        # Fill the hole with the last enemy
+        if slot != last:
+            _copy_row(self, last, self, slot)
+            moved = self.views[last]
+            self.views[slot] = moved
+            moved._slot = slot
+        self.views.pop()
+        self.count -= 1
+        self.index.remove(enemy)
+
+        enemy._store = detached
+        enemy._slot = 0
+
+    def reindex(self, slot):
+        """Refresh the spatial hash after one enemy's rect was changed directly"""
+        column, row = self.index.cell_of(int(self.x[slot]), int(self.y[slot]))
+        self.cell_column[slot], self.cell_row[slot] = column, row
+        self.index.move_to_cell(self.views[slot], (column, row))
+
+    def snapshot(self, clock):
+        """Copy of the live enemies for drawing on another thread (same view types, no click index)"""
+        n = self.count
+        store = EnemyStore(clock, capacity=0)
+        for name in _ALL_FIELD_NAMES:
+            setattr(store, name, getattr(self, name)[:n].copy())
+        store.count = n
+        store.views = [type(enemy).from_store(store, slot) for slot, enemy in enumerate(self.views)]
+        return store
+
+    def replace_all(self, columns, order, view_types):
+        """Swap in saved enemies: ENEMY_FIELDS columns, their click priority ranks and (Enemy, Boss)
+
+        Loading happens all at once, so the store, its arrays and the old
+        enemies' views are reused (a view whose type fits is handed to a new
+        enemy). Views of the old enemies mustn't be used afterwards.
+        """
+        count = len(order)
+        old_count = self.count
+        old_bosses = self.is_boss[:old_count].copy()
+        while self.capacity < count:
+            self._grow()
+        for (name, _), column in zip(ENEMY_FIELDS, columns):
+            getattr(self, name)[:count] = column
+        for name, _, initial in TRANSIENT_FIELDS:
+            getattr(self, name)[:count] = initial
+
+        # A slot whose old view has the right type keeps it as it is; only the rest are handed around
+        shared = min(count, old_count)
+        bosses = self.is_boss[:count]
+        changed = np.flatnonzero(old_bosses[:shared] != bosses[:shared]).tolist()
+        views = self.views[:count]
+        spare = {}
+        for view in [views[slot] for slot in changed] + self.views[count:]:
+            spare.setdefault(type(view), []).append(view)
+        for slot in changed + list(range(shared, count)):
+            view_type = view_types[bool(bosses[slot])]
+            reusable = spare.get(view_type)
+            if reusable:
+                view = reusable.pop()
+                view._slot = slot
+            else:
+                view = view_type.from_store(self, slot)
+            if slot < shared:
+                views[slot] = view
+            else:
+                views.append(view)
+        self.views = views
+        self.count = count
+        self.index.replace_all(views, self.cell_column[:count], self.cell_row[:count], order)
+
+    def enemy_at(self, point):
+        """The oldest enemy whose rect contains the point, or None"""
+        enemies = self.index.query_point(point)
+        return enemies[0] if enemies else None
+
+    def _grow(self):
+        """Double the capacity of every column"""
+        new_capacity = max(1, self.capacity * 2)
+        for name, dtype, *_ in ENEMY_FIELDS + TRANSIENT_FIELDS:
+            column = np.zeros(new_capacity, dtype=dtype)
+            column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+
+    def interpolated_positions(self, alpha):
+        """Top-left corners (lists of x and y by slot) a fraction alpha of the way through the last tick
+
+        An enemy whose last move covered several ticks is drawn gliding over
+        all of them instead of jumping on the tick it moved.
+        """
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        previous_x = np.where(self.previous_x[:n] == NO_PREVIOUS_POSITION, x, self.previous_x[:n])
+        previous_y = np.where(self.previous_y[:n] == NO_PREVIOUS_POSITION, y, self.previous_y[:n])
+        progress = np.minimum((self.clock.frame - self.moved_frame[:n] + alpha) / self.update_interval[:n], 1.0)
+        xs = previous_x + np.rint((x - previous_x) * progress).astype(np.int64)
+        ys = previous_y + np.rint((y - previous_y) * progress).astype(np.int64)
+        return xs.tolist(), ys.tolist()
+
+    def _due_to_move(self, player):
+        """Slots of the enemies that move this tick, and how many ticks each of their steps covers
+
+        Past each of ENEMY_LOD_DISTANCES from the player an enemy moves half as
+        often, by a step twice as long, so far enemies cost a fraction of near
+        ones. Steps stay within ENEMY_LOD_MAX_STEP so none skips through a wall.
+
+        The ticks an enemy moves on follow its own lod_phase, not its slot, so
+        they don't shift when a kill moves it to another slot. Each step
+        covers exactly the ticks since the enemy's last move, so one that
+        changes distance band neither skips ticks nor covers them twice.
+        """
+        n = self.count
+        dx = player.rect.centerx - (self.x[:n] + self.width[:n] // 2)
+        dy = player.rect.centery - (self.y[:n] + self.height[:n] // 2)
+        thresholds = np.array(ENEMY_LOD_DISTANCES) ** 2
+        doublings = np.searchsorted(thresholds, dx * dx + dy * dy, side="right")
+
+        # How often each speed can be doubled before a step is longer than ENEMY_LOD_MAX_STEP
+        speed = self.speed[:n]
+        most_doublings = [len(thresholds)] + [max(0, (ENEMY_LOD_MAX_STEP // value).bit_length() - 1)
+                                              for value in range(1, int(speed.max()) + 1)]
+        longest = 1 << np.array(most_doublings)[speed]
+        interval = np.minimum(1 << doublings, longest)
+
+        # Offsetting by phase spreads each group's moves over its ticks. Every `longest` ticks an
+        # enemy is due at any of its intervals, so the ticks since its last move never exceed that
+        frame = self.clock.frame
+        slots = np.flatnonzero(((frame + self.lod_phase[:n]) & (interval - 1)) == 0)
+        return slots, np.minimum(frame - self.moved_frame[slots], longest[slots])
+
+    def update_movement(self, player, wall_grid, flow_field=None, boss_flow_field=None):
+        """Move every enemy towards the player at once, sliding along walls
+
+        With a flow field, enemies that have no straight path to the player
+        follow the field around walls instead of pushing into them. Bosses
+        follow boss_flow_field when given, which avoids gaps they don't fit.
+        """
+        n = self.count
+        if n == 0:
+            return
+        if n < SCALAR_MOVEMENT_LIMIT:
+            self._update_movement_scalar(player, wall_grid, flow_field, boss_flow_field)
+            return
+
+        if ENEMY_LOD and n >= ENEMY_LOD_MIN_ENEMIES:
+            slots, steps = self._due_to_move(player)
+        else:
+            slots, steps = slice(0, n), 1
+        x = self.x[slots]
+        y = self.y[slots]
+        width = self.width[slots]
+        height = self.height[slots]
+        self.previous_x[slots] = x
+        self.previous_y[slots] = y
+        self.update_interval[slots] = steps
+        self.moved_frame[slots] = self.clock.frame
+
+        center_x = x + width // 2
+        center_y = y + height // 2
+        if flow_field is not None:
+            direction_x, direction_y = flow_field.directions(center_x, center_y, player.rect.center)
+            if boss_flow_field is not None:
+                bosses = np.flatnonzero(self.is_boss[slots])
+                if len(bosses):
+                    direction_x[bosses], direction_y[bosses] = boss_flow_field.directions(
+                        center_x[bosses], center_y[bosses], player.rect.center)
+        else:
+            # Direction to player, normalized
+            dx = player.rect.centerx - center_x
+            dy = player.rect.centery - center_y
+            distance = np.sqrt(dx * dx + dy * dy)
+            safe_distance = np.where(distance == 0, 1.0, distance)
+            direction_x = dx / safe_distance
+            direction_y = dy / safe_distance
+        move_x = np.trunc(direction_x * (self.speed[slots] * steps)).astype(np.int64)
+        move_y = np.trunc(direction_y * (self.speed[slots] * steps)).astype(np.int64)
+
+        new_x = x + move_x
+        new_y = y + move_y
+
+        # Blocked enemies try moving only horizontally, then only vertically
+        blocked = wall_grid.collides_any(new_x, new_y, width, height)
+        if blocked.any():
+            idx = np.nonzero(blocked)[0]
+            old_x, old_y = x[idx], y[idx]
+            w, h = width[idx], height[idx]
+
+            try_x = old_x + move_x[idx]
+            hit_x = wall_grid.collides_any(try_x, old_y, w, h)
+            try_y = old_y + move_y[idx]
+            hit_y = wall_grid.collides_any(old_x, try_y, w, h)
+
+            new_x[idx] = np.where(hit_x, old_x, try_x)
+            new_y[idx] = np.where(hit_x & ~hit_y, try_y, old_y)
+
+        # Keep enemies near gameplay area (allow slight off-screen movement)
+        np.minimum(np.maximum(new_x, GAMEPLAY_LEFT - 12), GAMEPLAY_RIGHT + 12, out=x)
+        np.minimum(np.maximum(new_y, GAMEPLAY_TOP - 12), GAMEPLAY_BOTTOM + 12, out=y)
+        self.x[slots] = x
+        self.y[slots] = y
+
+        # Only enemies that crossed into a new cell need touching in the spatial hash
+        column = x // self.index.cell_size
+        row = y // self.index.cell_size
+        changed = np.nonzero((column != self.cell_column[slots]) | (row != self.cell_row[slots]))[0]
+        self.cell_column[slots] = column
+        self.cell_row[slots] = row
+        changed_slots = changed if isinstance(slots, slice) else slots[changed]
+        for moved, slot in zip(changed.tolist(), changed_slots.tolist()):
+            self.index.move_to_cell(self.views[slot], (int(column[moved]), int(row[moved])))
+
+    def _update_movement_scalar(self, player, wall_grid, flow_field, boss_flow_field=None):
+        """update_movement() one enemy at a time, with exactly the same results (every enemy moves every tick)"""
+        n = self.count
+        self.previous_x[:n] = self.x[:n]
+        self.previous_y[:n] = self.y[:n]
+        self.update_interval[:n] = 1
+        self.moved_frame[:n] = self.clock.frame
+        player_x, player_y = player.rect.center
+        cell_size = self.index.cell_size
+        xs, ys = self.x[:n].tolist(), self.y[:n].tolist()
+        widths, heights, speeds = self.width[:n].tolist(), self.height[:n].tolist(), self.speed[:n].tolist()
+        columns, rows = self.cell_column[:n].tolist(), self.cell_row[:n].tolist()
+        bosses = self.is_boss[:n].tolist()
+        for slot in range(n):
+            x, y, width, height, speed = xs[slot], ys[slot], widths[slot], heights[slot], speeds[slot]
+            center_x = x + width // 2
+            center_y = y + height // 2
+            if flow_field is not None:
+                field = boss_flow_field if bosses[slot] and boss_flow_field is not None else flow_field
+                direction_x, direction_y = field.direction(center_x, center_y, (player_x, player_y))
+            else:
+                dx = player_x - center_x
+                dy = player_y - center_y
+                distance = math.sqrt(dx * dx + dy * dy) or 1.0
+                direction_x = dx / distance
+                direction_y = dy / distance
+            move_x = int(direction_x * speed)
+            move_y = int(direction_y * speed)
+
+            new_x, new_y = x + move_x, y + move_y
+            if wall_grid.collides_at(new_x, new_y, width, height):
+                if not wall_grid.collides_at(x + move_x, y, width, height):
+                    new_x, new_y = x + move_x, y
+                elif not wall_grid.collides_at(x, y + move_y, width, height):
+                    new_x, new_y = x, y + move_y
+                else:
+                    new_x, new_y = x, y
+
+            x = min(max(new_x, GAMEPLAY_LEFT - 12), GAMEPLAY_RIGHT + 12)
+            y = min(max(new_y, GAMEPLAY_TOP - 12), GAMEPLAY_BOTTOM + 12)
+            xs[slot], ys[slot] = x, y
+            cell = (x // cell_size, y // cell_size)
+            if cell != (columns[slot], rows[slot]):
+                columns[slot], rows[slot] = cell
+                self.index.move_to_cell(self.views[slot], cell)
+
+        self.x[:n], self.y[:n] = xs, ys
+        self.cell_column[:n], self.cell_row[:n] = columns, rows
+
+    def enemies_ready_to_attack(self, player):
+        """Return enemies within attack range of the player whose cooldown has passed"""
+        n = self.count
+        if n == 0:
+            return []
+
+        dx = player.rect.centerx - (self.x[:n] + self.width[:n] // 2)
+        dy = player.rect.centery - (self.y[:n] + self.height[:n] // 2)
+        in_range = np.sqrt(dx * dx + dy * dy) < ENEMY_ATTACK_RANGE
+        cooled_down = self.clock.get_ticks() - self.last_attack[:n] > ENEMY_ATTACK_COOLDOWN
+        return [self.views[slot] for slot in np.nonzero(in_range & cooled_down)[0]]
+
+
+class DetachedRow:
+    """A removed enemy's values in one record, so its view stays readable without a store
+
+    Looks like a one-slot EnemyStore to the view: every column is a
+    length-1 array (a field of the record) read and written at slot 0.
+    """
+
+    __slots__ = ("clock", "_record")
+
+    def __init__(self, clock, store, slot):
+        self.clock = clock
+        self._record = np.empty(1, dtype=_ROW_DTYPE)
+        self._record[0] = tuple(getattr(store, name)[slot] for name in _ALL_FIELD_NAMES)
+
+    def __getattr__(self, name):
+        return self._record[name]
+
+    def reindex(self, slot):
+        """Removed enemies aren't in any spatial hash"""
+
+
+def _copy_row(source, source_slot, target, target_slot):
+    """Copy one enemy's values between slots (possibly of different stores)"""
+    for name in _ALL_FIELD_NAMES:
+        getattr(target, name)[target_slot] = getattr(source, name)[source_slot]
+
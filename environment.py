@@ -0,0 +1,265 @@
+# Bot Environment - reset()/step() wrappers around GameManager for automated players
+#
+# Example:
+#   env = VectorGameEnv(num_envs=64, seed=0)
+#   observations, infos = env.reset()
+#   for _ in range(10000):
+#       actions = my_policy(observations)  # (64, 2) ints: [move, click]
+#       observations, rewards, terminated, truncated, infos = env.step(actions)
+#
+# Actions are [move, click]:
+#   move   0 = stand still, 1-8 = up, up-right, right, down-right, down, down-left, left, up-left
+#   click  0 = no click, 1..OBSERVED_ENEMIES = click the k-th nearest enemy,
+#          then 1..OBSERVED_PICKUPS more = click the k-th nearest pickup
+# Rewards are enemies defeated during the step, and -1 on the step the player dies.
+import random
+import numpy as np
+import pygame
+from game_config import *
+from game_manager import GameManager
+from headless import KeyState
+from shield_fruit import ShieldFruit
+
+OBSERVED_ENEMIES = 5  # nearest enemies included in each observation
+OBSERVED_PICKUPS = 3  # nearest golden apples / shield fruits included in each observation
+
+# Observation layout (all float32, positions and distances in pixels)
+PLAYER_FEATURES = ("x", "y", "health_fraction", "max_health", "level", "exp_fraction",
+                   "damage", "attack_range", "speed", "wins", "shield_seconds")
+ENEMY_FEATURES = ("present", "dx", "dy", "distance", "health", "is_boss")
+PICKUP_FEATURES = ("present", "dx", "dy", "distance", "is_shield")
+OBSERVATION_SIZE = (len(PLAYER_FEATURES) + OBSERVED_ENEMIES * len(ENEMY_FEATURES)
+                    + OBSERVED_PICKUPS * len(PICKUP_FEATURES))
+ENEMIES_OFFSET = len(PLAYER_FEATURES)
+PICKUPS_OFFSET = ENEMIES_OFFSET + OBSERVED_ENEMIES * len(ENEMY_FEATURES)
+
+# Keys held for each move action
+MOVE_KEYS = (
+    (),
+    (pygame.K_w,),
+    (pygame.K_w, pygame.K_d),
+    (pygame.K_d,),
+    (pygame.K_s, pygame.K_d),
+    (pygame.K_s,),
+    (pygame.K_s, pygame.K_a),
+    (pygame.K_a,),
+    (pygame.K_w, pygame.K_a),
+)
+NUM_MOVES = len(MOVE_KEYS)
+NUM_CLICKS = 1 + OBSERVED_ENEMIES + OBSERVED_PICKUPS
+
+
+class _Game:
+    """One game plus the state the environment keeps next to it"""
+
+    def __init__(self, flow_field=None, boss_flow_field=None):
+        self.game_manager = GameManager(flow_field=flow_field, boss_flow_field=boss_flow_field)
+        self.keys = KeyState()
+        self.rng_state = None  # this game's copy of the random module state
+        self.frame = 0
+        self.click_targets = np.zeros((NUM_CLICKS, 2), dtype=np.int64)  # from the last observation
+        self.click_valid = np.zeros(NUM_CLICKS, dtype=bool)
+
+    def reset(self, seed):
+        saved = random.getstate()
+        random.seed(seed)
+        self.game_manager.reset_game()
+        self.rng_state = random.getstate()
+        random.setstate(saved)
+        self.keys = KeyState()
+        self.frame = 0
+
+    def step(self, move, click, frame_skip):
+        """Advance the game; returns the reward (the caller swaps in this game's random state)"""
+        game_manager = self.game_manager
+        self.keys.pressed = set(MOVE_KEYS[move])
+        wins_before = game_manager.player.wins
+        if click and self.click_valid[click]:
+            game_manager.click(tuple(self.click_targets[click]))
+        for _ in range(frame_skip):
+            game_manager.update_game(self.keys)
+            self.frame += 1
+            if not game_manager.player.is_alive():
+                break
+        reward = float(game_manager.player.wins - wins_before)
+        if not game_manager.player.is_alive():
+            reward -= 1.0
+        return reward
+
+    def info(self):
+        player = self.game_manager.player
+        return {"frame": self.frame, "level": player.level, "wins": player.wins,
+                "health": player.health, "enemies": len(self.game_manager.enemies)}
+
+
+def _observe(games):
+    """Build the (len(games), OBSERVATION_SIZE) observation batch and remember click targets
+
+    Enemies of every game are gathered into one set of arrays so the nearest-k
+    search runs as a handful of NumPy calls for the whole batch.
+    """
+    count = len(games)
+    observations = np.zeros((count, OBSERVATION_SIZE), dtype=np.float32)
+    player_x = np.empty(count)
+    player_y = np.empty(count)
+
+    for row, game in enumerate(games):
+        player = game.game_manager.player
+        player_x[row], player_y[row] = player.rect.center
+        observations[row, :ENEMIES_OFFSET] = (
+            player_x[row], player_y[row], player.health / player.max_health, player.max_health,
+            player.level, player.exp / player.exp_to_next_level, player.damage, player.attack_range,
+            player.speed, player.wins, player.shield_time_remaining(),
+        )
+        game.click_valid[:] = False
+
+    # Nearest enemies, all games at once
+    stores = [game.game_manager.enemies for game in games]
+    counts = np.array([store.count for store in stores])
+    if counts.sum():
+        owner = np.repeat(np.arange(count), counts)
+        center_x = np.concatenate([store.x[:store.count] + store.width[:store.count] // 2 for store in stores])
+        center_y = np.concatenate([store.y[:store.count] + store.height[:store.count] // 2 for store in stores])
+        health = np.concatenate([store.health[:store.count] for store in stores])
+        is_boss = np.concatenate([store.is_boss[:store.count] for store in stores])
+        dx = center_x - player_x[owner]
+        dy = center_y - player_y[owner]
+        distance = np.sqrt(dx * dx + dy * dy)
+
+        order = np.lexsort((distance, owner))  # by game, nearest first
+        rank = np.arange(order.size) - np.repeat(np.cumsum(counts) - counts, counts)
+        keep = rank < OBSERVED_ENEMIES
+        order, rank = order[keep], rank[keep]
+        rows = owner[order]
+        features = np.stack([np.ones(order.size), dx[order], dy[order], distance[order],
+                             health[order], is_boss[order]], axis=1)
+        enemy_block = np.zeros((count, OBSERVED_ENEMIES, len(ENEMY_FEATURES)), dtype=np.float32)
+        enemy_block[rows, rank] = features
+        observations[:, ENEMIES_OFFSET:PICKUPS_OFFSET] = enemy_block.reshape(count, -1)
+        for row, slot, x, y in zip(rows.tolist(), rank.tolist(), center_x[order].tolist(), center_y[order].tolist()):
+            games[row].click_targets[1 + slot] = (x, y)
+            games[row].click_valid[1 + slot] = True
+
+    # Nearest pickups (only a handful per game)
+    for row, game in enumerate(games):
+        nearby = []
+        for pickup in game.game_manager.golden_apples:
+            dx = pickup.rect.centerx - player_x[row]
+            dy = pickup.rect.centery - player_y[row]
+            nearby.append(((dx * dx + dy * dy) ** 0.5, dx, dy, pickup))
+        nearby.sort(key=lambda entry: entry[0])
+        for slot, (distance, dx, dy, pickup) in enumerate(nearby[:OBSERVED_PICKUPS]):
+            start = PICKUPS_OFFSET + slot * len(PICKUP_FEATURES)
+            observations[row, start:start + len(PICKUP_FEATURES)] = (
+                1.0, dx, dy, distance, isinstance(pickup, ShieldFruit))
+            game.click_targets[1 + OBSERVED_ENEMIES + slot] = pickup.rect.center
+            game.click_valid[1 + OBSERVED_ENEMIES + slot] = True
+
+    return observations
+
+
+class VectorGameEnv:
+    """N independent headless games stepped together with batched observations
+
+    Each game keeps its own random module state, so results only depend on
+    the seeds and actions, not on how many games run side by side. Finished
+    games reset automatically with a fresh seed; the observation returned
+    for them is the first one of the new game and infos carries the final
+    stats under "final_info".
+    """
+
+    def __init__(self, num_envs, seed=0, max_frames=FPS * 600, frame_skip=1):
+        self.num_envs = num_envs
+        self.seed = seed
+        self.max_frames = max_frames
+        self.frame_skip = frame_skip
+        first = _Game()
+        # Games are stepped one at a time, so they can share their flow fields and caches
+        shared = first.game_manager
+        self.games = [first] + [_Game(shared.flow_field, shared.boss_flow_field) for _ in range(num_envs - 1)]
+        self.episodes = np.zeros(num_envs, dtype=np.int64)
+
+    def _episode_seed(self, index):
+        return self.seed + index + int(self.episodes[index]) * self.num_envs
+
+    def reset(self, seed=None):
+        """Start every game over; returns (observations, infos)"""
+        if seed is not None:
+            self.seed = seed
+        self.episodes[:] = 0
+        for index, game in enumerate(self.games):
+            game.reset(self._episode_seed(index))
+        return _observe(self.games), [game.info() for game in self.games]
+
+    def step(self, actions):
+        """Apply an (N, 2) array of [move, click] actions to all games
+
+        Returns (observations, rewards, terminated, truncated, infos).
+        """
+        actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs, 2)
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        terminated = np.zeros(self.num_envs, dtype=bool)
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        infos = []
+
+        saved = random.getstate()
+        for index, (game, (move, click)) in enumerate(zip(self.games, actions.tolist())):
+            random.setstate(game.rng_state)
+            rewards[index] = game.step(move, click, self.frame_skip)
+            game.rng_state = random.getstate()
+
+            info = game.info()
+            terminated[index] = not game.game_manager.player.is_alive()
+            truncated[index] = not terminated[index] and game.frame >= self.max_frames
+            if terminated[index] or truncated[index]:
+                self.episodes[index] += 1
+                game.reset(self._episode_seed(index))
+                info = dict(game.info(), final_info=info)
+            infos.append(info)
+        random.setstate(saved)
+
+        return _observe(self.games), rewards, terminated, truncated, infos
+
+    def sample_actions(self, rng=None):
+        """Uniformly random actions for every game (handy for smoke tests and baselines)"""
+        rng = rng if rng is not None else np.random.default_rng()
+        return np.stack([rng.integers(0, NUM_MOVES, self.num_envs),
+                         rng.integers(0, NUM_CLICKS, self.num_envs)], axis=1)
+
+
+class GameEnv:
+    """Single headless game with reset()/step(action); see VectorGameEnv for batches
+
+    Unlike the vector version, a finished game is not reset automatically;
+    call reset() after terminated or truncated comes back True.
+    """
+
+    def __init__(self, seed=0, max_frames=FPS * 600, frame_skip=1):
+        self.seed = seed
+        self.max_frames = max_frames
+        self.frame_skip = frame_skip
+        self.game = _Game()
+
+    @property
+    def game_manager(self):
+        return self.game.game_manager
+
+    def reset(self, seed=None):
+        """Start a new game; returns (observation, info)"""
+        if seed is not None:
+            self.seed = seed
+        self.game.reset(self.seed)
+        return _observe([self.game])[0], self.game.info()
+
+    def step(self, action):
+        """Apply one [move, click] action; returns (observation, reward, terminated, truncated, info)"""
+        move, click = (int(value) for value in action)
+        saved = random.getstate()
+        random.setstate(self.game.rng_state)
+        reward = self.game.step(move, click, self.frame_skip)
+        self.game.rng_state = random.getstate()
+        random.setstate(saved)
+
+        terminated = not self.game_manager.player.is_alive()
+        truncated = not terminated and self.game.frame >= self.max_frames
+        return _observe([self.game])[0], reward, terminated, truncated, self.game.info()
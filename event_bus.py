@@ -0,0 +1,191 @@
+# Event Bus - Game messages as typed events instead of print() calls
+#
+# Example:
+#   from event_bus import bus, EnemyDefeated
+#   bus.emit(EnemyDefeated, enemy.name, damage)  # in game code; cheap when nobody listens
+#   bus.subscribe(on_kill, EnemyDefeated)        # UI, analytics, tests ...
+#   bus.set_console_level("debug")               # also print every hit; None prints nothing
+#   bus.flush()                                  # once per frame, after presenting it
+#
+# Events are only built if the console or a subscriber wants them, and are
+# buffered until flush(). Text is only formatted for events that actually
+# get printed, and all of a frame's lines go out in one write, made on a
+# background thread so a slow terminal never holds up a frame. Events hold
+# plain values (an enemy's name, not the Enemy), since an enemy's store slot
+# can belong to another enemy by the time the event is delivered.
+#
+# emit() can be called from any thread (the simulation thread emits while
+# the main thread flushes); flush() delivers on the thread that calls it.
+import atexit
+import queue
+import sys
+import threading
+from collections import namedtuple
+from game_config import CONSOLE_LOG_LEVEL, EVENT_BUFFER_SIZE
+
+DEBUG = 10  # per hit / per attack chatter
+INFO = 20  # kills, level ups, pickups, purchases
+WARNING = 30  # something the caller did wrong
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING}
+
+
+def _event(name, fields, level, text):
+    """Define an event type: a named tuple with a level and a console text template"""
+    event_type = namedtuple(name, fields)
+    event_type.log_level = level
+    event_type.__str__ = lambda event: text.format(e=event)
+    return event_type
+
+
+# Combat
+EnemyAttacked = _event("EnemyAttacked", "name damage", DEBUG, "{e.name} attacked for {e.damage} damage!")
+ShieldBlocked = _event("ShieldBlocked", "damage remaining", DEBUG,
+                       "Shield blocked {e.damage} damage! {e.remaining:.1f}s remaining")
+EnemyHit = _event("EnemyHit", "name damage health", DEBUG,
+                  "Hit {e.name} for {e.damage} damage! Enemy health: {e.health}")
+EnemyOutOfRange = _event("EnemyOutOfRange", "name", DEBUG, "Enemy too far away!")
+EnemyDefeated = _event("EnemyDefeated", "name damage", INFO, "Defeated {e.name} with {e.damage} damage!")
+
+# Progress
+ExpGained = _event("ExpGained", "amount total", DEBUG, "Gained {e.amount} EXP! Total EXP: {e.total}")
+WinAdded = _event("WinAdded", "wins", DEBUG, "Win! Total wins: {e.wins}")
+LevelUp = _event("LevelUp", "level evolution damage max_health speed specialty", INFO,
+                 "Leveled up to {e.level}! Evolved to {e.evolution}\n"
+                 "New stats - Damage: {e.damage}, Health: {e.max_health}, Speed: {e.speed}\n"
+                 "Specialty: {e.specialty}")
+
+# Pickups
+AppleCollected = _event("AppleCollected", "exp", INFO, "Collected Golden Apple for {e.exp} EXP!")
+ShieldFruitCollected = _event("ShieldFruitCollected", "duration", INFO,
+                              "Collected Shield Fruit for {e.duration}s of immunity!")
+ShieldActivated = _event("ShieldActivated", "duration remaining", INFO,
+                         "Shield activated for {e.duration}s! Total shield time: {e.remaining:.1f}s")
+
+# Pets
+PetBought = _event("PetBought", "pet cost", INFO, "Bought {e.pet} for {e.cost} wins!")
+PetAlreadyOwned = _event("PetAlreadyOwned", "pet", INFO, "{e.pet} already owned!")
+PetTooExpensive = _event("PetTooExpensive", "pet cost wins", INFO,
+                         "Need {e.cost} wins to buy {e.pet} (you have {e.wins})")
+PetActivated = _event("PetActivated", "pet slot", INFO, "Added {e.pet} to slot {e.slot}")
+PetRemoved = _event("PetRemoved", "slot", INFO, "Removed pet from slot {e.slot}")
+PetSlotsFull = _event("PetSlotsFull", "pet", INFO, "All slots full! Click on a slot to replace a pet.")
+InvalidPetSlot = _event("InvalidPetSlot", "slot", WARNING, "Invalid slot index: {e.slot}")
+
+
+class _ConsoleWriter:
+    """Writes text to stdout on a thread of its own, in the order it was handed over"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def write(self, text):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="console", daemon=True)
+            self._thread.start()
+            atexit.register(self.wait)  # don't lose the last lines on exit
+        self._queue.put(text)
+
+    def wait(self):
+        """Block until everything written so far is out"""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            text = self._queue.get()
+            try:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+            except (OSError, ValueError):
+                pass  # stdout closed or gone; the game carries on without its console
+            finally:
+                self._queue.task_done()
+
+
+class EventBus:
+    """Collects game events and hands them to the console and subscribers on flush()"""
+
+    def __init__(self, console_level=CONSOLE_LOG_LEVEL, max_buffered=EVENT_BUFFER_SIZE):
+        self.max_buffered = max_buffered  # flush early rather than let the buffer grow
+        self._console_level = None
+        self._subscribers = {}  # event type (None = every type) -> [callbacks]
+        self._wanted = {}  # event type -> whether anyone wants it (cleared on changes)
+        self._buffer = []
+        self._lock = threading.Lock()  # guards the buffer, subscribers and console level
+        self._delivering = threading.RLock()  # one flush at a time, so batches arrive in order
+        self._console = _ConsoleWriter()
+        self.set_console_level(console_level)
+
+    def set_console_level(self, level):
+        """Print events at this level and above: "debug", "info", "warning" (or a number); None prints nothing"""
+        with self._lock:
+            self._console_level = LEVELS.get(level, level)
+            self._wanted.clear()
+
+    def subscribe(self, callback, event_type=None):
+        """Call callback(event) on flush() for every event of a type (or of every type)"""
+        with self._lock:
+            # Lists are replaced, not changed, so a flush in progress keeps iterating its own copy
+            self._subscribers[event_type] = self._subscribers.get(event_type, []) + [callback]
+            self._wanted.clear()
+
+    def unsubscribe(self, callback, event_type=None):
+        """Stop sending events to a callback"""
+        with self._lock:
+            callbacks = [existing for existing in self._subscribers.get(event_type, []) if existing != callback]
+            if callbacks:
+                self._subscribers[event_type] = callbacks
+            else:
+                self._subscribers.pop(event_type, None)
+            self._wanted.clear()
+
+    def _is_wanted(self, event_type):
+        with self._lock:
+            wanted = (None in self._subscribers or event_type in self._subscribers
+                      or (self._console_level is not None and event_type.log_level >= self._console_level))
+            self._wanted[event_type] = wanted
+        return wanted
+
+    def emit(self, event_type, *fields):
+        """Queue an event; does nothing (not even build it) if nobody would see it"""
+        wanted = self._wanted.get(event_type)
+        if wanted is None:
+            wanted = self._is_wanted(event_type)
+        if wanted:
+            event = event_type(*fields)
+            with self._lock:
+                self._buffer.append(event)
+                full = len(self._buffer) >= self.max_buffered
+            if full:
+                self.flush()
+
+    def flush(self, wait=False):
+        """Deliver the queued events: console lines in one write, then subscribers in order
+
+        The console write happens in the background; wait=True blocks until
+        it's done (e.g. before printing a summary that should come after).
+        """
+        with self._delivering:
+            with self._lock:
+                events, self._buffer = self._buffer, []
+                console_level, subscribers = self._console_level, self._subscribers
+            if events and console_level is not None:
+                lines = [str(event) for event in events if event.log_level >= console_level]
+                if lines:
+                    self._console.write("\n".join(lines) + "\n")
+            catch_all = subscribers.get(None, ())
+            for event in events:
+                for callback in subscribers.get(type(event), ()):
+                    callback(event)
+                for callback in catch_all:
+                    callback(event)
+        if wait:
+            self._console.wait()
+
+    def clear(self):
+        """Drop queued events without delivering them"""
+        with self._lock:
+            self._buffer.clear()
+
+
+bus = EventBus()  # the game's shared bus
@@ -1,5 +1,7 @@
 # Evolution System - Player Stats and Appearance by Level
 # Each evolution roughly doubles the previous stats with some variation
+from types import MappingProxyType
+from game_config import PROGRESSION_TABLE_LEVELS
 
 EVOLUTIONS = {
     1: {
@@ -245,13 +247,21 @@ EVOLUTIONS = {
 
 
 def get_evolution_data(level):
-    """Get evolution data for a specific level"""
-    if level in EVOLUTIONS:
-        return EVOLUTIONS[level]
-    else:
-        # Return the highest evolution if level exceeds available evolutions
-        max_level = max(EVOLUTIONS.keys())
-        return EVOLUTIONS[max_level]
+    """Get evolution data for a specific level (read-only; a table lookup)"""
+    if 0 <= level < len(EVOLUTION_BY_LEVEL):
+        return EVOLUTION_BY_LEVEL[level]
+    return EVOLUTION_BY_LEVEL[-1]
+
+
+def rebuild_tables():
+    """Precompute the evolution for every level (call again after changing EVOLUTIONS)
+
+    Levels past the last evolution keep the final form, as they always have.
+    """
+    global EVOLUTION_BY_LEVEL
+    final_form = EVOLUTIONS[max(EVOLUTIONS)]
+    levels = range(max(PROGRESSION_TABLE_LEVELS, max(EVOLUTIONS)) + 1)
+    EVOLUTION_BY_LEVEL = tuple(MappingProxyType(EVOLUTIONS.get(level, final_form)) for level in levels)
 
 
 def get_player_stats_for_level(level):
@@ -269,4 +279,7 @@ def get_evolution_name(level):
 def get_evolution_colors(level):
     """Get just the colors for a specific level"""
     evolution_data = get_evolution_data(level)
-    return evolution_data["body_color"], evolution_data["head_color"]
\ No newline at end of file
+    return evolution_data["body_color"], evolution_data["head_color"]
+
+
+rebuild_tables()
@@ -0,0 +1,209 @@
+import heapq
+import math
+from collections import OrderedDict
+import numpy as np
+from game_config import *
+
+# Neighbor offsets (column, row) with their step cost; diagonals cost sqrt(2)
+NEIGHBOR_STEPS = (
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (-1, -1, math.sqrt(2)),
+)
+STEP_COLUMNS = np.array([step[0] for step in NEIGHBOR_STEPS])
+STEP_ROWS = np.array([step[1] for step in NEIGHBOR_STEPS])
+STEP_COSTS = np.array([step[2] for step in NEIGHBOR_STEPS])
+# Unit vector of each step; index -1 (the extra last entry) means "head straight at the player"
+STEP_UNIT_X = np.append(STEP_COLUMNS / STEP_COSTS, 0.0)
+STEP_UNIT_Y = np.append(STEP_ROWS / STEP_COSTS, 0.0)
+STEP_UNIT_X_LIST = STEP_UNIT_X.tolist()
+STEP_UNIT_Y_LIST = STEP_UNIT_Y.tolist()
+NO_STEP = -1
+
+
+class FlowField:
+    """One shared map of "which way to the player" for every enemy
+
+    The area enemies can reach is split into cells. A cell is blocked if an
+    enemy centered anywhere in it could overlap a wall. Whenever the player enters a
+    new cell, Dijkstra's algorithm runs once outwards from the player and every
+    cell that needs a detour stores which neighbor to step to. Enemies then
+    read their step with one array lookup, so pathing cost doesn't grow with
+    the number of enemies. Blocked cells depend on the agent size, so bosses
+    need a field of their own.
+    """
+
+    def __init__(self, wall_grid, cell_size=FLOW_FIELD_CELL_SIZE, agent_size=ENEMY_SIZE,
+                 max_cached=FLOW_FIELD_CACHE_SIZE):
+        self.layout = wall_layout(wall_grid.walls)
+        self.cell_size = cell_size
+        # The grid covers every position an enemy center can reach (see EnemyStore clamping)
+        self.origin_x = GAMEPLAY_LEFT - 12
+        self.origin_y = GAMEPLAY_TOP - 12
+        self.columns = (GAMEPLAY_RIGHT + 12 + agent_size - self.origin_x) // cell_size + 1
+        self.rows = (GAMEPLAY_BOTTOM + 12 + agent_size - self.origin_y) // cell_size + 1
+
+        self.blocked = self._find_blocked_cells(wall_grid, agent_size)
+        self._neighbors = self._build_neighbors()
+        self._corner_blocked = self._find_corner_blocked_steps()
+
+        # Unobstructed path length from a cell to one (|columns apart|, |rows apart|) away
+        steps_y, steps_x = np.mgrid[0:self.rows, 0:self.columns]
+        self._open_distance = np.maximum(steps_x, steps_y) + (math.sqrt(2) - 1) * np.minimum(steps_x, steps_y)
+
+        self.player_cell = None
+        self._steps = np.full((self.rows, self.columns), NO_STEP, dtype=np.int8)
+        # The arena is small and the player keeps crossing the same cells, so finished fields are kept
+        self._fields = OrderedDict()  # player cell -> step grid
+        self.max_cached = max_cached
+        self.rebuilds = 0
+        self.cache_hits = 0
+
+    def _find_blocked_cells(self, wall_grid, agent_size):
+        """Cells where an enemy centered anywhere inside the cell could hit a wall"""
+        rows, columns = np.mgrid[0:self.rows, 0:self.columns]
+        left = (self.origin_x + columns * self.cell_size - agent_size // 2).ravel()
+        top = (self.origin_y + rows * self.cell_size - agent_size // 2).ravel()
+        size = np.full(left.shape, agent_size + self.cell_size - 1)
+        return wall_grid.collides_any(left, top, size, size).reshape(self.rows, self.columns)
+
+    def _build_neighbors(self):
+        """Walkable neighbors of every cell (no squeezing diagonally past a wall corner)
+
+        Blocked cells get edges out to their free neighbors too, so a field can
+        still be grown from a player standing right next to a wall.
+        """
+        neighbors = [[] for _ in range(self.rows * self.columns)]
+        blocked = np.pad(self.blocked, 1, constant_values=True)  # off-grid counts as blocked
+        rows, columns = self.rows, self.columns
+        cells = np.arange(rows * columns).reshape(rows, columns)
+        for step_column, step_row, cost in NEIGHBOR_STEPS:
+            walkable = ~blocked[1 + step_row:1 + step_row + rows, 1 + step_column:1 + step_column + columns]
+            if step_column and step_row:
+                corner = (blocked[1:1 + rows, 1 + step_column:1 + step_column + columns]
+                          | blocked[1 + step_row:1 + step_row + rows, 1:1 + columns])
+                walkable &= self.blocked | ~corner
+            step = step_row * columns + step_column
+            for cell in cells[walkable].tolist():
+                neighbors[cell].append((cell + step, cost))
+        return neighbors
+
+    def _find_corner_blocked_steps(self):
+        """(rows, columns, 8) mask of diagonal steps that would cut a wall corner"""
+        blocked = np.pad(self.blocked, 1, constant_values=True)
+        corner_blocked = np.zeros((self.rows, self.columns, len(NEIGHBOR_STEPS)), dtype=bool)
+        for step, (step_column, step_row, _cost) in enumerate(NEIGHBOR_STEPS):
+            if step_column and step_row:
+                corner_blocked[:, :, step] = (blocked[1:1 + self.rows, 1 + step_column:1 + step_column + self.columns]
+                                              | blocked[1 + step_row:1 + step_row + self.rows, 1:1 + self.columns])
+        return corner_blocked
+
+    def cell_of(self, x, y):
+        """Grid cells (columns, rows) of NumPy arrays of points, clamped to the grid"""
+        column = np.minimum(np.maximum((x - self.origin_x) // self.cell_size, 0), self.columns - 1)
+        row = np.minimum(np.maximum((y - self.origin_y) // self.cell_size, 0), self.rows - 1)
+        return column, row
+
+    def update(self, player_center):
+        """Switch to the field for the player's cell if they moved, computing it if it isn't cached"""
+        column = min(max((player_center[0] - self.origin_x) // self.cell_size, 0), self.columns - 1)
+        row = min(max((player_center[1] - self.origin_y) // self.cell_size, 0), self.rows - 1)
+        player_cell = (column, row)
+        if player_cell == self.player_cell:
+            return
+        self.player_cell = player_cell
+        field = self._fields.get(player_cell)
+        if field is not None:
+            self._fields.move_to_end(player_cell)
+            self.cache_hits += 1
+        else:
+            field = self._compute_steps(self._compute_distances(player_cell), player_cell)
+            self._fields[player_cell] = field
+            if len(self._fields) > self.max_cached:
+                self._fields.popitem(last=False)
+            self.rebuilds += 1
+        self._steps = field
+
+    def reset(self):
+        """Forget the player's position (e.g. for a new game on the same walls); cached fields stay valid"""
+        self.player_cell = None
+
+    def _compute_distances(self, player_cell):
+        """Dijkstra from the player's cell over walkable cells (distances in cells, padded)"""
+        column, row = player_cell
+        start = row * self.columns + column
+        distance = [math.inf] * (self.rows * self.columns)
+        distance[start] = 0.0
+        queue = [(0.0, start)]
+        neighbors = self._neighbors
+        pop, push = heapq.heappop, heapq.heappush
+        while queue:
+            cell_distance, cell = pop(queue)
+            if cell_distance > distance[cell]:
+                continue
+            for neighbor, cost in neighbors[cell]:
+                new_distance = cell_distance + cost
+                if new_distance < distance[neighbor]:
+                    distance[neighbor] = new_distance
+                    push(queue, (new_distance, neighbor))
+        return np.array(distance).reshape(self.rows, self.columns)
+
+    def _compute_steps(self, distance, player_cell):
+        """Step grid for a distance field: the neighbor to move to, or NO_STEP to head straight
+
+        Only cells whose path is longer than on an empty grid get a step; from
+        everywhere else the player can be approached in a straight line.
+        """
+        column, row = player_cell
+        open_distance = self._open_distance[np.abs(np.arange(self.rows) - row)[:, None],
+                                            np.abs(np.arange(self.columns) - column)[None, :]]
+        padded = np.pad(distance, 1, constant_values=np.inf)
+        candidates = np.stack([
+            padded[1 + step_row:1 + step_row + self.rows, 1 + step_column:1 + step_column + self.columns] + cost
+            for step_column, step_row, cost in NEIGHBOR_STEPS
+        ], axis=2)
+        candidates[self._corner_blocked] = np.inf
+        best = np.argmin(candidates, axis=2)
+        reachable = np.isfinite(np.min(candidates, axis=2))  # cut off cells keep heading straight
+        detour = distance > open_distance + 0.01
+        return np.where(detour & reachable, best, NO_STEP).astype(np.int8)
+
+    def direction(self, center_x, center_y, player_center):
+        """directions() for a single enemy center given as plain ints"""
+        column = (center_x - self.origin_x) // self.cell_size
+        row = (center_y - self.origin_y) // self.cell_size
+        if not (0 <= column < self.columns and 0 <= row < self.rows):
+            column = min(max(column, 0), self.columns - 1)
+            row = min(max(row, 0), self.rows - 1)
+        step = self._steps.item(row, column)
+        if step != NO_STEP:
+            return STEP_UNIT_X_LIST[step], STEP_UNIT_Y_LIST[step]
+        dx = player_center[0] - center_x
+        dy = player_center[1] - center_y
+        straight = math.sqrt(dx * dx + dy * dy)
+        if straight == 0:
+            straight = 1.0
+        return dx / straight, dy / straight
+
+    def directions(self, center_x, center_y, player_center):
+        """Unit direction each enemy should move, given NumPy arrays of enemy centers
+
+        Where no wall lengthens the path, the enemy heads straight at the
+        player, which is smoother than following 8-way cell steps; otherwise it
+        follows the field around the walls.
+        """
+        dx = player_center[0] - center_x
+        dy = player_center[1] - center_y
+        straight = np.sqrt(dx * dx + dy * dy)
+        safe_straight = np.where(straight == 0, 1.0, straight)
+        seek_x = dx / safe_straight
+        seek_y = dy / safe_straight
+
+        column, row = self.cell_of(center_x, center_y)
+        step = self._steps[row, column]
+        detour = step != NO_STEP
+        return np.where(detour, STEP_UNIT_X[step], seek_x), np.where(detour, STEP_UNIT_Y[step], seek_y)
+
+
+def wall_layout(walls):
+    """Hashable description of a wall layout, to tell whether a field can be reused"""
+    return tuple(tuple(wall.rect) for wall in walls)
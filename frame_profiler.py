@@ -0,0 +1,192 @@
+# Frame Profiler - Where each frame's time goes, phase by phase
+#
+# Example:
+#   profiler = FrameProfiler(game_manager)
+#   profiler.toggle()                  # F3 in the game; the overlay shows p50/p95/p99 per phase
+#   profiler.start_frame()             # at the top of every drawn frame, before its ticks
+#   ...
+#   profiler.export("profile.csv")     # or .json; F4 in the game
+#
+# Enabling the profiler swaps timed wrappers in for the GameManager's phase
+# methods (on the instance only); disabling removes them again. A disabled
+# profiler leaves the game running exactly the code it runs without one.
+#
+# A row is one drawn frame. The game ticks at a fixed rate, so a frame can
+# run zero, one or several ticks: update phases hold the sum over the
+# frame's ticks, and the tick count is kept alongside. Headless runs draw
+# nothing, so there (per_tick=True) every update_game() starts a row.
+import csv
+import json
+import time
+import numpy as np
+from game_config import PROFILER_HISTORY, PROFILER_OVERLAY_REFRESH
+
+# (column name, GameManager method) in the order they run each frame
+PHASES = (
+    ("update", "update_game"),
+    ("update.movement", "_update_player"),
+    ("update.spawning", "_update_spawning"),
+    ("update.enemies", "_update_enemies"),
+    ("update.particles", "_update_particles"),
+    ("draw", "draw_game"),
+    ("draw.background", "_draw_background"),
+    ("draw.walls", "_draw_walls"),
+    ("draw.entities", "_draw_entities"),
+    ("draw.particles", "_draw_particles"),
+    ("draw.ui", "_draw_ui"),
+    ("present", "present"),
+)
+PHASE_NAMES = tuple(name for name, _ in PHASES)
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler:
+    """Times GameManager phases into ring buffers of the last PROFILER_HISTORY frames
+
+    A frame starts with start_frame() (or with update_game() when per_tick).
+    Phases that didn't run in a frame (e.g. update in a frame without a tick)
+    stay NaN and are left out of the statistics.
+    """
+
+    def __init__(self, game_manager, history=PROFILER_HISTORY, per_tick=False):
+        self.game_manager = game_manager
+        self.per_tick = per_tick
+        self.samples = np.full((history, len(PHASES)), np.nan)  # milliseconds
+        self.ticks = np.zeros(history, dtype=np.int64)  # ticks run in each frame
+        self.frames = 0  # frames recorded since the last clear()
+        self.enabled = False
+        self.show_overlay = True  # draw the table on screen while enabled
+        self._row = 0
+        self._overlay_rows = None
+
+    def enable(self):
+        """Start timing (replaces the phase methods with timed versions)"""
+        if self.enabled:
+            return
+        for column, (_, method_name) in enumerate(PHASES):
+            setattr(self.game_manager, method_name, self._timed(column, getattr(self.game_manager, method_name)))
+        self.enabled = True
+
+    def disable(self):
+        """Stop timing; the game goes back to calling its own methods directly"""
+        if not self.enabled:
+            return
+        for _, method_name in PHASES:
+            vars(self.game_manager).pop(method_name, None)
+        self.enabled = False
+
+    def toggle(self):
+        """Turn profiling and its overlay on or off"""
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def clear(self):
+        """Forget every recorded frame"""
+        self.samples[:] = np.nan
+        self.ticks[:] = 0
+        self.frames = 0
+        self._overlay_rows = None
+
+    def _timed(self, column, method):
+        perf_counter = time.perf_counter
+        samples = self.samples
+
+        def add(milliseconds):
+            # A phase can run several times a frame (once per tick): sum them
+            previous = samples[self._row, column]
+            samples[self._row, column] = milliseconds if np.isnan(previous) else previous + milliseconds
+
+        if column == 0:
+            def timed(*args):
+                if self.per_tick:
+                    self.start_frame()
+                self.ticks[self._row] += 1
+                start = perf_counter()
+                result = method(*args)
+                add((perf_counter() - start) * 1000)
+                return result
+        elif PHASE_NAMES[column] == "draw":
+            # The overlay is drawn after the timed part, on top of everything else
+            def timed(*args):
+                start = perf_counter()
+                result = method(*args)
+                add((perf_counter() - start) * 1000)
+                self._draw_overlay()
+                return result
+        else:
+            def timed(*args):
+                start = perf_counter()
+                result = method(*args)
+                add((perf_counter() - start) * 1000)
+                return result
+        return timed
+
+    def start_frame(self):
+        """Start a new row: the phases timed from now on belong to the next drawn frame"""
+        if not self.enabled:
+            return
+        self._row = self.frames % len(self.samples)
+        self.samples[self._row] = np.nan
+        self.ticks[self._row] = 0
+        self.frames += 1
+
+    def trace(self):
+        """Recorded frames oldest first, as a (frames, phases) array of milliseconds"""
+        return self._oldest_first(self.samples)
+
+    def tick_counts(self):
+        """Ticks run in each recorded frame, oldest first"""
+        return self._oldest_first(self.ticks)
+
+    def _oldest_first(self, rows):
+        history = len(rows)
+        if self.frames <= history:
+            return rows[:self.frames].copy()
+        return np.roll(rows, -(self.frames % history), axis=0)
+
+    def summary(self):
+        """{phase: {"p50": ms, "p95": ms, "p99": ms, "mean": ms, "frames": count}} for phases that ran"""
+        trace = self.trace()
+        result = {}
+        for column, name in enumerate(PHASE_NAMES):
+            values = trace[:, column]
+            values = values[~np.isnan(values)]
+            if values.size == 0:
+                continue
+            p50, p95, p99 = np.percentile(values, PERCENTILES)
+            result[name] = {"p50": float(p50), "p95": float(p95), "p99": float(p99),
+                            "mean": float(values.mean()), "frames": int(values.size)}
+        return result
+
+    def _draw_overlay(self):
+        renderer = self.game_manager.renderer
+        if renderer is None or not self.show_overlay:
+            return
+        # Percentiles are recomputed a few times per second, not every frame
+        if self._overlay_rows is None or self.frames % PROFILER_OVERLAY_REFRESH == 0:
+            rows = [("phase (ms)", "p50", "p95", "p99")]
+            for name, stats in self.summary().items():
+                rows.append((name, f"{stats['p50']:.2f}", f"{stats['p95']:.2f}", f"{stats['p99']:.2f}"))
+            self._overlay_rows = tuple(rows)
+        renderer.draw_profiler_overlay(self._overlay_rows)
+
+    def export(self, path):
+        """Write the recorded frames to a .csv trace (one row per frame) or a .json trace with a summary"""
+        trace = self.trace()
+        ticks = self.tick_counts()
+        first_frame = self.frames - len(trace)
+        if path.endswith(".json"):
+            frames = [[None if np.isnan(value) else round(float(value), 4) for value in row] for row in trace]
+            with open(path, "w") as trace_file:
+                json.dump({"phases": PHASE_NAMES, "first_frame": first_frame, "frames_ms": frames,
+                           "ticks": ticks.tolist(), "summary": self.summary()}, trace_file, indent=1)
+        elif path.endswith(".csv"):
+            with open(path, "w", newline="") as trace_file:
+                writer = csv.writer(trace_file)
+                writer.writerow(("frame", "ticks") + PHASE_NAMES)
+                for frame, (tick_count, row) in enumerate(zip(ticks.tolist(), trace), start=first_frame):
+                    writer.writerow([frame, tick_count] + ["" if np.isnan(value) else f"{value:.4f}" for value in row])
+        else:
+            raise ValueError(f"Profile traces are written as .csv or .json, not {path}")
@@ -5,7 +5,17 @@ UI_PANEL_WIDTH = 300  # Left panel for stats
 GAMEPLAY_WIDTH = 800   # Main game area width
 SCREEN_WIDTH = UI_PANEL_WIDTH + GAMEPLAY_WIDTH  # Total: 1100
 SCREEN_HEIGHT = 600
-FPS = 60
+FPS = 60  # simulation ticks per second; every speed and timer in the game is per tick
+
+# Frame Pacing (main_game.py ticks the simulation at FPS however fast frames are drawn)
+RENDER_FPS = 60  # frames drawn per second at most; 0 draws as fast as the machine can
+INTERPOLATE_RENDERING = True  # draw moving things part of the way between their last two ticks
+MAX_TICKS_PER_FRAME = 5  # after a stall, drop the lost time instead of racing to catch up
+SIMULATION_THREAD = False  # tick on a worker thread and draw snapshots of it (see sim_thread.py; --threaded)
+
+# Startup
+FAST_STARTUP = True  # init only the display and font modules (pygame.init() also starts audio and joysticks)
+REPORT_STARTUP_TIME = False  # print the time to the first frame and what it went to
 
 # Gameplay area boundaries (where player can move and enemies spawn)
 GAMEPLAY_LEFT = UI_PANEL_WIDTH  # Start gameplay area after UI panel
@@ -23,6 +33,7 @@ PLAYER_ATTACK_RANGE = 80
 START_EXP_TO_LEVEL = 5
 EXP_MULTIPLIER = 2  # Each level requires double the EXP
 EXP_PER_ENEMY_KILL = 2.2
+PROGRESSION_TABLE_LEVELS = 100  # levels precomputed in the progression lookup tables (later ones are computed per call)
 
 # Enemy Base Stats
 ENEMY_HEALTH = 5
@@ -32,6 +43,7 @@ ENEMY_MIN_DAMAGE = 3
 ENEMY_MAX_DAMAGE = 3
 ENEMY_ATTACK_RANGE = 60
 ENEMY_ATTACK_COOLDOWN = 1000  # milliseconds
+ENEMY_SIZE = 40  # pixels (square)
 
 # Golden Apple Settings
 GOLDEN_APPLE_EXP_VALUE = 5
@@ -43,6 +55,7 @@ BOSS_HEALTH_MULTIPLIER_MIN = 10
 BOSS_HEALTH_MULTIPLIER_MAX = 30
 BOSS_DAMAGE_MULTIPLIER_MIN = 3
 BOSS_DAMAGE_MULTIPLIER_MAX = 7
+BOSS_SIZE = 80  # pixels (square); bosses path around walls with their own flow field
 
 # Enemy Appearance Parts
 ENEMY_HEADS = [
@@ -68,6 +81,47 @@ ENEMY_ACCESSORIES = [
     ("Glasses", (0, 0, 0))
 ]
 
+# Wall Collision Grid
+WALL_GRID_CELL_SIZE = 80  # pixels per grid cell
+
+# Click Hit-Testing Grid
+HIT_GRID_CELL_SIZE = 80  # pixels; must be at least the largest clickable entity (bosses are 80x80)
+
+# Enemy Pathfinding
+FLOW_FIELD_CELL_SIZE = 20  # pixels per flow field cell
+FLOW_FIELD_CACHE_SIZE = 2048  # fields kept for visited player cells (~1.7 KB each; the arena has ~1,700 cells)
+
+# Enemy Update Level of Detail (far enemies move less often, by proportionally longer steps)
+ENEMY_LOD = True
+ENEMY_LOD_DISTANCES = (250, 400, 550)  # pixels from the player past which enemies move every 2nd / 4th / 8th tick
+ENEMY_LOD_MIN_ENEMIES = 1000  # below this many, moving everyone every tick is as cheap as scheduling
+ENEMY_LOD_MAX_STEP = 48  # pixels per move at most; a 40 px enemy needs 60 to jump a 20 px wall in one step
+
+# Text Rendering
+TEXT_CACHE_SIZE = 512  # rendered text surfaces kept by the renderer
+
+# Dirty-Rect Rendering (only push the parts of the window that changed)
+DIRTY_RECT_RENDERING = True
+DIRTY_RECT_FULL_UPDATE_RATIO = 0.5  # flip the whole window once this much of it is dirty
+DIRTY_RECT_MERGE_COUNT = 64  # merge into one bounding rect beyond this many dirty rects
+
+# Session Replays (seed + input log, see replay.py)
+RECORD_REPLAYS = False  # record every session (main_game.py --record turns it on for one)
+REPLAY_DIRECTORY = "replays"
+
+# Save Games (see save_state.py)
+SAVE_FILE = "savegame.sav"
+AUTOSAVE = False  # keep SAVE_FILE saved (main_game.py --autosave or --continue turns it on for one session)
+AUTOSAVE_SECONDS = 30  # real time between autosaves while playing; 0 only saves on quit
+
+# Game Messages (see event_bus.py)
+CONSOLE_LOG_LEVEL = "info"  # "debug" also prints every hit and attack; None prints nothing
+EVENT_BUFFER_SIZE = 1024  # queued events before the bus flushes on its own
+
+# Frame Profiler (see frame_profiler.py; F3 toggles it in the game, F4 saves a trace)
+PROFILER_HISTORY = 600  # frames kept per phase (10 seconds at 60 FPS)
+PROFILER_OVERLAY_REFRESH = 15  # frames between overlay updates
+
 # Spawning Settings
 ENEMY_SPAWN_TIME = 180  # frames (3 seconds at 60 FPS)
 
@@ -78,6 +132,7 @@ PET_EXP_PER_SECOND = 0
 # Visual Effects
 PARTICLES_PER_EXPLOSION = 10
 PARTICLE_LIFETIME = 30  # frames
+PARTICLE_POOL_CAPACITY = 2048  # most particles alive at once; extra ones are skipped
 
 # Color Constants
 WHITE = (255, 255, 255)
@@ -1,38 +1,73 @@
 import pygame
 import random
+from collections import namedtuple
 from game_config import *
 from game_math import calculate_spawn_time_for_level, calculate_distance
 from player import Player
 from golden_apple import GoldenApple
 from shield_fruit import ShieldFruit
-from walls import create_walls
-from graphics import Particle, GameRenderer
+from walls import create_walls, WallGrid
+from flow_field import FlowField, wall_layout
+from graphics import GameRenderer
+from particles import ParticlePool
 from enemies import Enemy, Boss
+from enemy_store import EnemyStore
+from sim_clock import SimulationClock
+from spatial_index import SpatialHash
+from event_bus import (bus, AppleCollected, EnemyDefeated, EnemyHit, EnemyOutOfRange, PetActivated,
+                       PetAlreadyOwned, PetRemoved, PetSlotsFull, PetTooExpensive, ShieldFruitCollected)
+
+
+# Everything drawing reads, copied after a tick so another thread can draw it (see take_snapshot)
+GameSnapshot = namedtuple("GameSnapshot", "frame game_state player enemies pickups particles walls "
+                                          "selected_pet_info confirm_purchase previous_positions")
 
 
 class GameManager:
     """Manages the overall game state and coordinates all game systems"""
 
-    def __init__(self, screen, font):
+    def __init__(self, screen=None, font=None, clock=None, dirty_rects=DIRTY_RECT_RENDERING, flow_field=None,
+                 boss_flow_field=None):
         self.screen = screen
         self.font = font
-        self.renderer = GameRenderer(screen, font)
+        # Without a screen the game runs headless: everything updates, nothing draws
+        self.headless = screen is None
+        self.renderer = None if self.headless else GameRenderer(screen, font, dirty_rects)
+        # All gameplay timers read this clock, so results don't depend on frame rate
+        self.clock = clock if clock is not None else SimulationClock()
         self.game_state = "playing"  # "playing", "game_over", "pet_shop", "pet_selection"
 
         # Pet shop state variables
         self.selected_pet_info = None  # Currently viewing pet info
         self.confirm_purchase = False  # Whether showing purchase confirmation
 
-        # Initialize game objects
+        # Drawing between ticks: where the player and pets were when the last tick started
+        self.track_previous_positions = not self.headless  # also wanted by a headless game that is snapshotted
+        self._previous_positions = {}  # player or pet -> rect.topleft
+        self._draw_alpha = 1.0  # how far through the last tick draw_game() is drawing
+
+        # Initialize game objects (flow fields can be shared by games stepped one after another)
+        self.flow_field = flow_field
+        self.boss_flow_field = boss_flow_field
         self.reset_game()
 
     def reset_game(self):
         """Reset all game objects to starting state"""
-        self.player = Player()
-        self.enemies = []
-        self.golden_apples = []
-        self.particles = []
+        self.clock.reset()
+        self.player = Player(self.clock)
+        self.enemies = EnemyStore(self.clock)
+        self.golden_apples = SpatialHash()  # Apples and shield fruits, indexed for clicks
+        self.particles = ParticlePool()
         self.walls = create_walls()
+        self.wall_grid = WallGrid(self.walls)  # Built once; used for all collision queries
+        # Shared enemy pathing around the walls; kept across games while the layout is the same
+        layout = wall_layout(self.walls)
+        if self.flow_field is None or self.flow_field.layout != layout:
+            self.flow_field = FlowField(self.wall_grid)
+        if self.boss_flow_field is None or self.boss_flow_field.layout != layout:
+            self.boss_flow_field = FlowField(self.wall_grid, agent_size=BOSS_SIZE)
+        self.flow_field.reset()
+        self.boss_flow_field.reset()
         self.enemy_spawn_timer = 0
         self.enemies_spawned_since_last_boss = 0
         self.apple_spawn_timer = 0
@@ -60,17 +95,20 @@ class GameManager:
                 return False
 
         if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_pos = event.pos
+            return self.click(event.pos)
 
-            if self.game_state == "playing":
-                self._handle_playing_input(mouse_pos)
-            elif self.game_state == "game_over":
-                return self._handle_game_over_input(mouse_pos)
-            elif self.game_state == "pet_shop":
-                self._handle_pet_shop_input(mouse_pos)
-            elif self.game_state == "pet_selection":
-                self._handle_pet_selection_input(mouse_pos)
+        return False
 
+    def click(self, mouse_pos):
+        """Handle a left click at a screen position (returns True if a new game was started)"""
+        if self.game_state == "playing":
+            self._handle_playing_input(mouse_pos)
+        elif self.game_state == "game_over":
+            return self._handle_game_over_input(mouse_pos)
+        elif self.game_state == "pet_shop":
+            self._handle_pet_shop_input(mouse_pos)
+        elif self.game_state == "pet_selection":
+            self._handle_pet_selection_input(mouse_pos)
         return False
 
     def _handle_playing_input(self, mouse_pos):
@@ -91,9 +129,8 @@ class GameManager:
             cancel_rect = pygame.Rect(SCREEN_WIDTH // 2 + 20, 430, 80, 40)
 
             if confirm_rect.collidepoint(mouse_pos):
-                # Buy the pet
-                if self.player.buy_pet(self.selected_pet_info):
-                    print(f"Successfully bought {self.selected_pet_info}!")
+                # Buy the pet (the player announces the purchase)
+                self.player.buy_pet(self.selected_pet_info)
                 self.confirm_purchase = False
                 self.selected_pet_info = None
             elif cancel_rect.collidepoint(mouse_pos):
@@ -109,14 +146,14 @@ class GameManager:
                 pet_rect = pygame.Rect(50, y_start + i * 60, 500, 50)
                 if pet_rect.collidepoint(mouse_pos):
                     if pet_name in self.player.owned_pets:
-                        print(f"{pet_name} already owned!")
+                        bus.emit(PetAlreadyOwned, pet_name)
                     elif self.player.can_buy_pet(pet_name):
                         # Show purchase confirmation
                         self.selected_pet_info = pet_name
                         self.confirm_purchase = True
                     else:
                         cost = get_pet_cost(pet_name)
-                        print(f"Need {cost} wins to buy {pet_name} (you have {self.player.wins})")
+                        bus.emit(PetTooExpensive, pet_name, cost, self.player.wins)
                     break
 
     def _handle_pet_selection_input(self, mouse_pos):
@@ -139,9 +176,9 @@ class GameManager:
                     if (slot < len(self.player.pet_objects) and
                             self.player.pet_objects[slot] is None):
                         self.player.set_active_pet(slot, pet_name)
-                        print(f"Added {pet_name} to slot {slot + 1}")
+                        bus.emit(PetActivated, pet_name, slot + 1)
                         return
-                print(f"All slots full! Click on a slot to replace a pet.")
+                bus.emit(PetSlotsFull, pet_name)
                 break
 
     def _show_pets_for_slot(self, slot, mouse_pos):
@@ -150,37 +187,39 @@ class GameManager:
         if 0 <= slot < len(self.player.pet_objects):
             # Remove pet from slot
             self.player.set_active_pet(slot, None)
-            print(f"Removed pet from slot {slot + 1}")
+            bus.emit(PetRemoved, slot + 1)
 
     def _handle_enemy_attacks(self, mouse_pos):
         """Check if player clicked on an enemy within attack range"""
-        for enemy in self.enemies[:]:
-            if enemy.rect.collidepoint(mouse_pos):
-                # Calculate distance to enemy
-                player_center = (self.player.rect.centerx, self.player.rect.centery)
-                enemy_center = (enemy.rect.centerx, enemy.rect.centery)
-                distance = calculate_distance(player_center, enemy_center)
-
-                # Check if enemy is within attack range (now pet-boosted)
-                if distance <= self.player.attack_range + enemy.rect.width / 2:
-                    # Deal damage using player's current damage stat (now pet-boosted)
-                    damage_dealt = self.player.damage
-                    if enemy.take_damage(damage_dealt):
-                        # Enemy died - give EXP, WINS, and create explosion
-                        self.player.gain_experience(EXP_PER_ENEMY_KILL)
-                        self.player.add_win()  # Add win for pet purchasing!
-                        self.enemies.remove(enemy)
-                        self._create_explosion_particles(enemy.rect.centerx, enemy.rect.centery)
-                        print(f"Defeated {enemy.name} with {damage_dealt} damage!")
-                    else:
-                        print(f"Hit {enemy.name} for {damage_dealt} damage! Enemy health: {enemy.health}")
-                else:
-                    print("Enemy too far away!")
-                break
+        enemy = self.enemies.enemy_at(mouse_pos)
+        if enemy is None:
+            return
+
+        # Calculate distance to enemy
+        enemy_rect = enemy.rect
+        player_center = (self.player.rect.centerx, self.player.rect.centery)
+        enemy_center = (enemy_rect.centerx, enemy_rect.centery)
+        distance = calculate_distance(player_center, enemy_center)
+
+        # Check if enemy is within attack range (now pet-boosted)
+        if distance <= self.player.attack_range + enemy_rect.width / 2:
+            # Deal damage using player's current damage stat (now pet-boosted)
+            damage_dealt = self.player.damage
+            if enemy.take_damage(damage_dealt):
+                # Enemy died - give EXP, WINS, and create explosion
+                self.player.gain_experience(EXP_PER_ENEMY_KILL)
+                self.player.add_win()  # Add win for pet purchasing!
+                self.enemies.remove(enemy)
+                self._create_explosion_particles(enemy_rect.centerx, enemy_rect.centery)
+                bus.emit(EnemyDefeated, enemy.name, damage_dealt)
+            else:
+                bus.emit(EnemyHit, enemy.name, damage_dealt, enemy.health)
+        else:
+            bus.emit(EnemyOutOfRange, enemy.name)
 
     def _handle_apple_collection(self, mouse_pos):
         """Check if player clicked on a golden apple or shield fruit within attack range"""
-        for apple in self.golden_apples[:]:
+        for apple in self.golden_apples.query_point(mouse_pos):
             if apple.is_clicked_by_player(mouse_pos, self.player):
                 # Handle different pickup types
                 if isinstance(apple, ShieldFruit):
@@ -188,13 +227,13 @@ class GameManager:
                     self.player.activate_shield(shield_duration)
                     self.golden_apples.remove(apple)
                     self._create_explosion_particles(apple.rect.centerx, apple.rect.centery)
-                    print(f"Collected {apple.name} for {shield_duration}s of immunity!")
+                    bus.emit(ShieldFruitCollected, shield_duration)
                 else:  # Regular golden apple
                     exp_gained = apple.get_exp_value()
                     self.player.gain_experience(exp_gained)
                     self.golden_apples.remove(apple)
                     self._create_explosion_particles(apple.rect.centerx, apple.rect.centery)
-                    print(f"Collected {apple.name} for {exp_gained} EXP!")
+                    bus.emit(AppleCollected, exp_gained)
                 break
 
     def _handle_game_over_input(self, mouse_pos):
@@ -213,15 +252,34 @@ class GameManager:
 
     def _create_explosion_particles(self, x, y):
         """Create particle explosion effect at given position"""
-        for _ in range(PARTICLES_PER_EXPLOSION):
-            self.particles.append(Particle(x, y))
+        self.particles.spawn_explosion(x, y)
 
     def update_game(self, keys):
         """Update all game objects for one frame"""
         if self.game_state == "playing":
+            if self.track_previous_positions:
+                self._remember_positions()
+            self.clock.tick()
             self._update_playing_state(keys)
         # Other states don't need updates (they're paused)
 
+    def _remember_positions(self):
+        """Note where everything is before a tick, so frames drawn during it can interpolate"""
+        positions = {self.player: self.player.rect.topleft}
+        for pet in self.player.pet_objects:
+            if pet is not None:
+                positions[pet] = pet.rect.topleft
+        self._previous_positions = positions  # enemies keep theirs in the store (EnemyStore.update_movement)
+
+    def _interpolated_position(self, entity):
+        """Where to draw an entity part of the way through the last tick (None = where it is)"""
+        previous = self._previous_positions.get(entity)
+        if previous is None or self._draw_alpha >= 1:
+            return None
+        x, y = entity.rect.topleft
+        return (round(previous[0] + (x - previous[0]) * self._draw_alpha),
+                round(previous[1] + (y - previous[1]) * self._draw_alpha))
+
     def _update_playing_state(self, keys):
         """Update game during playing state"""
         # Check for game over
@@ -229,23 +287,23 @@ class GameManager:
             self.game_state = "game_over"
             return
 
-        # Update player
-        self.player.handle_movement(keys, self.walls)
+        # Each phase is its own method so FrameProfiler can time it
+        self._update_player(keys)
+        self._update_spawning()
+        self._update_enemies()
+        self._update_particles()
+
+    def _update_player(self, keys):
+        """Move the player and their pets"""
+        self.player.handle_movement(keys, self.wall_grid)
         self.player.heal_over_time()  # Now uses pet-boosted regen
         self.player.update_pets()  # Update pet positions
 
-        # Spawn new enemies
+    def _update_spawning(self):
+        """Spawn new enemies, golden apples and shield fruits"""
         self._update_enemy_spawning()
-
-        # Spawn new golden apples
         self._update_apple_spawning()
 
-        # Update all enemies
-        self._update_enemies()
-
-        # Update visual effects
-        self._update_particles()
-
     def _update_enemy_spawning(self):
         """Handle enemy spawning based on level"""
         self.enemy_spawn_timer += 1
@@ -253,10 +311,10 @@ class GameManager:
 
         if self.enemy_spawn_timer >= spawn_time:
             if self.enemies_spawned_since_last_boss >= BOSS_SPAWN_INTERVAL:
-                self.enemies.append(Boss(self.walls, self.player.level))
+                Boss(self.enemies, self.player.level)
                 self.enemies_spawned_since_last_boss = 0
             else:
-                self.enemies.append(Enemy(self.walls, self.player.level))
+                Enemy(self.enemies, self.player.level)
                 self.enemies_spawned_since_last_boss += 1
             self.enemy_spawn_timer = 0
 
@@ -267,30 +325,64 @@ class GameManager:
         if self.apple_spawn_timer >= GOLDEN_APPLE_SPAWN_TIME:
             # 20% chance to spawn a shield fruit instead of a golden apple
             if random.random() < 0.2:
-                self.golden_apples.append(ShieldFruit())
+                pickup = ShieldFruit()
             else:
-                self.golden_apples.append(GoldenApple())
+                pickup = GoldenApple()
+            self.golden_apples.insert(pickup, pickup.rect.x, pickup.rect.y)
             self.apple_spawn_timer = 0
 
     def _update_enemies(self):
         """Update all enemies"""
-        for enemy in self.enemies:
-            # Move enemy towards player
-            enemy.update_movement(self.player, self.walls)
-
-            # Check if enemy can attack player
-            if enemy.can_attack_player(self.player):
-                enemy.attempt_attack(self.player)
+        # Move every enemy towards the player in one vectorized step
+        enemies = self.enemies
+        if enemies:
+            self.flow_field.update(self.player.rect.center)  # Only recomputed when the player changes cell
+            if enemies.is_boss[:enemies.count].any():
+                self.boss_flow_field.update(self.player.rect.center)
+        enemies.update_movement(self.player, self.wall_grid, self.flow_field, self.boss_flow_field)
+
+        # Only enemies in range with their cooldown over get to attack
+        for enemy in self.enemies.enemies_ready_to_attack(self.player):
+            enemy.attempt_attack(self.player)
 
     def _update_particles(self):
         """Update visual effect particles"""
-        for particle in self.particles[:]:
-            particle.update()
-            if not particle.is_alive():
-                self.particles.remove(particle)
-
-    def draw_game(self):
-        """Draw the entire game"""
+        self.particles.update()
+
+    def take_snapshot(self):
+        """Copy everything drawing reads; the copy stays as it is while this game keeps ticking"""
+        clock = self.clock.copy()
+        player = self.player.snapshot(clock)
+        previous_positions = {}
+        for original, copy in zip((self.player,) + tuple(self.player.pet_objects), (player,) + player.pet_objects):
+            if original in self._previous_positions:
+                previous_positions[copy] = self._previous_positions[original]
+        return GameSnapshot(clock.frame, self.game_state, player, self.enemies.snapshot(clock),
+                            tuple(self.golden_apples), self.particles.snapshot(), tuple(self.walls),
+                            self.selected_pet_info, self.confirm_purchase, previous_positions)
+
+    def show_snapshot(self, snapshot):
+        """Make draw_game() draw a snapshot of another game (this game is then only used for drawing)"""
+        self.game_state = snapshot.game_state
+        self.player = snapshot.player
+        self.enemies = snapshot.enemies
+        self.golden_apples = snapshot.pickups
+        self.particles = snapshot.particles
+        self.walls = snapshot.walls
+        self.selected_pet_info = snapshot.selected_pet_info
+        self.confirm_purchase = snapshot.confirm_purchase
+        self._previous_positions = snapshot.previous_positions
+
+    def draw_game(self, alpha=1.0):
+        """Draw the entire game
+
+        alpha is how far real time has got from the last tick towards the
+        next one: moving things are drawn that far between where they were
+        before the last tick (0) and where they are now (1).
+        """
+        if self.headless:
+            return None
+        self._draw_alpha = alpha
         if self.game_state == "playing":
             self._draw_playing_state()
         elif self.game_state == "game_over":
@@ -301,21 +393,41 @@ class GameManager:
             self._draw_pet_selection()
         return None
 
+    def present(self):
+        """Show the drawn frame in the window (only the changed parts in dirty-rect mode)"""
+        if not self.headless:
+            self.renderer.present()
+
     def _draw_playing_state(self):
-        """Draw everything during gameplay"""
-        # Draw background
+        """Draw everything during gameplay (each phase is its own method so FrameProfiler can time it)"""
+        self._draw_background()
+        self._draw_walls()
+        self._draw_entities()
+        self._draw_particles()
+        self._draw_ui()
+
+    def _draw_background(self):
+        """Draw the background"""
         self.renderer.draw_background()
 
-        # Draw walls
+    def _draw_walls(self):
+        """Draw the walls"""
         for wall in self.walls:
             self.renderer.draw_wall(wall)
 
+    def _draw_entities(self):
+        """Draw the player, enemies, pickups and pets"""
         # Draw player (with pet-boosted attack range)
-        self.renderer.draw_player(self.player)
+        self.renderer.draw_player(self.player, self._interpolated_position(self.player))
 
         # Draw enemies
-        for enemy in self.enemies:
-            self.renderer.draw_enemy(enemy)
+        if self._draw_alpha < 1:
+            xs, ys = self.enemies.interpolated_positions(self._draw_alpha)
+            for enemy, x, y in zip(self.enemies, xs, ys):
+                self.renderer.draw_enemy(enemy, (x, y))
+        else:
+            for enemy in self.enemies:
+                self.renderer.draw_enemy(enemy)
 
         # Draw golden apples and shield fruits
         for apple in self.golden_apples:
@@ -328,13 +440,15 @@ class GameManager:
         for i in range(3):
             if (i < len(self.player.pet_objects) and
                     self.player.pet_objects[i] is not None):
-                self.player.pet_objects[i].draw(self.screen)
+                pet = self.player.pet_objects[i]
+                self.renderer.draw_pet(pet, self._interpolated_position(pet))
 
-        # Draw visual effects
-        for particle in self.particles:
-            particle.draw(self.screen)
+    def _draw_particles(self):
+        """Draw visual effects"""
+        self.renderer.draw_particles(self.particles)
 
-        # Draw UI (now includes wins and pet info)
+    def _draw_ui(self):
+        """Draw UI (now includes wins and pet info)"""
         self.renderer.draw_ui(self.player)
 
     def _draw_pet_shop(self):
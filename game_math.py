@@ -1,4 +1,5 @@
 import random
+from types import MappingProxyType
 from game_config import *
 
 
@@ -18,6 +19,13 @@ def normalize_vector(dx, dy):
 
 
 def calculate_spawn_time_for_level(level):
+    """Enemy spawn interval in frames for a level (a table lookup)"""
+    if 0 <= level < len(SPAWN_TIME_BY_LEVEL):
+        return SPAWN_TIME_BY_LEVEL[level]
+    return _spawn_time_for_level(level)
+
+
+def _spawn_time_for_level(level):
     """Calculate enemy spawn rate based on level using exponential decrease"""
     if level >= 5:
         return 60  # Very fast spawning
@@ -28,6 +36,13 @@ def calculate_spawn_time_for_level(level):
 
 
 def calculate_enemy_stats_for_level(level):
+    """Read-only enemy stats for a level (a table lookup)"""
+    if 0 <= level < len(ENEMY_STATS_BY_LEVEL):
+        return ENEMY_STATS_BY_LEVEL[level]
+    return _enemy_stats_for_level(level)
+
+
+def _enemy_stats_for_level(level):
     """Calculate enemy strength using linear scaling formulas"""
     # Linear growth: base_value + (level - 1) * multiplier
     health_bonus = (level - 1) * 10
@@ -36,13 +51,13 @@ def calculate_enemy_stats_for_level(level):
     # Speed has a maximum cap to prevent impossible gameplay
     speed_bonus = min(2, level // 2)  # Integer division, max +2 speed
 
-    return {
+    return MappingProxyType({
         "health": ENEMY_HEALTH + health_bonus,
         "min_speed": ENEMY_MIN_SPEED + speed_bonus,
         "max_speed": ENEMY_MAX_SPEED + speed_bonus,
         "min_damage": ENEMY_MIN_DAMAGE + damage_bonus,
         "max_damage": ENEMY_MAX_DAMAGE + damage_bonus
-    }
+    })
 
 
 def calculate_boss_stats_for_level(level):
@@ -62,10 +77,26 @@ def calculate_boss_stats_for_level(level):
 
 
 def calculate_experience_needed(level):
+    """EXP needed for the next level (a table lookup)"""
+    if 0 <= level < len(EXP_NEEDED_BY_LEVEL):
+        return EXP_NEEDED_BY_LEVEL[level]
+    return _experience_needed(level)
+
+
+def _experience_needed(level):
     """Calculate EXP needed for next level using exponential growth"""
     return START_EXP_TO_LEVEL * (EXP_MULTIPLIER ** (level - 1))
 
 
+def rebuild_tables():
+    """Precompute the per-level tables from the current game_config values (call again after changing them)"""
+    global SPAWN_TIME_BY_LEVEL, ENEMY_STATS_BY_LEVEL, EXP_NEEDED_BY_LEVEL
+    levels = range(PROGRESSION_TABLE_LEVELS + 1)  # indexed by level; 0 is never used by the game
+    SPAWN_TIME_BY_LEVEL = tuple(_spawn_time_for_level(level) for level in levels)
+    ENEMY_STATS_BY_LEVEL = tuple(_enemy_stats_for_level(level) for level in levels)
+    EXP_NEEDED_BY_LEVEL = tuple(_experience_needed(level) for level in levels)
+
+
 def generate_random_spawn_position():
     """Generate a random position just outside the gameplay area boundaries"""
     side = random.randint(0, 3)
@@ -95,4 +126,7 @@ def calculate_health_percentage(current_health, max_health):
     """Calculate health as a percentage (0.0 to 1.0)"""
     if max_health == 0:
         return 0
-    return current_health / max_health
\ No newline at end of file
+    return current_health / max_health
+
+
+rebuild_tables()
@@ -6,17 +6,22 @@ from game_config import *
 class GoldenApple:
     """A collectible golden apple that gives experience when clicked"""
 
-    def __init__(self):
-        # Generate random spawn position within the gameplay area only
-        x = random.randint(GAMEPLAY_LEFT + 20, GAMEPLAY_RIGHT - 50)
-        y = random.randint(50, SCREEN_HEIGHT - 80)  # Y-axis is fine
+    __slots__ = ("rect", "exp_value")
+
+    # Apple properties (the same for every apple)
+    color = (255, 215, 0)  # Golden color
+    outline_color = (255, 165, 0)  # Orange outline
+    name = "Golden Apple"
+
+    def __init__(self, position=None):
+        # Generate random spawn position within the gameplay area only (unless given one)
+        if position is None:
+            x = random.randint(GAMEPLAY_LEFT + 20, GAMEPLAY_RIGHT - 50)
+            y = random.randint(50, SCREEN_HEIGHT - 80)  # Y-axis is fine
+        else:
+            x, y = position
         self.rect = pygame.Rect(x, y, 30, 30)  # Smaller than enemies
-
-        # Apple properties
-        self.color = (255, 215, 0)  # Golden color
-        self.outline_color = (255, 165, 0)  # Orange outline
         self.exp_value = GOLDEN_APPLE_EXP_VALUE
-        self.name = "Golden Apple"
 
     def is_clicked_by_player(self, mouse_pos, player):
         """Check if apple was clicked and is within player's attack range (now pet-boosted)"""
@@ -1,53 +1,84 @@
 import pygame
-import random
 from game_config import *
 from game_math import calculate_health_percentage
-from pets import get_pet_info, get_pet_cost
-
-
-class Particle:
-    """Explosion particle effect"""
-
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        # Random velocity for scatter effect
-        self.vx = random.uniform(-2, 2)
-        self.vy = random.uniform(-2, 2)
-        self.color = random.choice([RED, ORANGE])
-        self.lifetime = PARTICLE_LIFETIME
-
-    def update(self):
-        """Move particle and decrease lifetime"""
-        self.x += self.vx
-        self.y += self.vy
-        self.lifetime -= 1
-
-    def draw(self, screen):
-        """Draw particle if still alive"""
-        if self.lifetime > 0:
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), 3)
-
-    def is_alive(self):
-        """Check if particle should still be displayed"""
-        return self.lifetime > 0
+from particles import PARTICLE_COLORS, PARTICLE_RADIUS
+from text_cache import TextCache
+from sprites import SpriteCache
+from dirty_rects import DirtyRectTracker
+
+# UI panel labels that never change: baked into the cached background
+STATIC_UI_LABELS = [
+    ("PLAYER STATS", WHITE, (10, 10)),
+    ("Evolution:", WHITE, (10, 110)),
+    ("Specialty:", WHITE, (10, 160)),
+    ("CONTROLS:", WHITE, (10, SCREEN_HEIGHT - 120)),
+    ("WASD/Arrows: Move", WHITE, (10, SCREEN_HEIGHT - 100)),
+    ("Click: Attack", WHITE, (10, SCREEN_HEIGHT - 80)),
+    ("P: Pet Shop", WHITE, (10, SCREEN_HEIGHT - 60)),
+    ("T: Pet Team", WHITE, (10, SCREEN_HEIGHT - 40)),
+    ("Kill enemies for wins!", YELLOW, (10, SCREEN_HEIGHT - 20)),
+]
 
 
 class GameRenderer:
     """Handles all game drawing operations"""
 
-    def __init__(self, screen, font):
+    def __init__(self, screen, font, dirty_rects=False):
         self.screen = screen
         self.font = font
+        # Dirty-rect mode: only regions that changed are sent to the window
+        self.dirty_rects = DirtyRectTracker(screen.get_rect()) if dirty_rects else None
+        self._screen_key = None  # what was on screen last frame, for dirty-rect mode
+        self._ui_state = None  # UI panel values drawn last frame, for dirty-rect mode
+        # Aura surfaces keyed by (attack range, color); the color encodes the shield state
+        self._aura_cache = {}
+        self._aura_version = None  # player.attack_range_version the cache was built for
+        self.aura_allocations = 0  # aura surfaces created so far (was one per frame)
+        self._profiler_rows = None  # FrameProfiler table drawn into _profiler_surface
+        self._profiler_surface = None
+        self.text_cache = TextCache(font)
+        self.sprites = SpriteCache(self.text_cache)
+        self._particle_sprites = self._create_particle_sprites()
+        self._background = self._create_background()
+
+    def _create_particle_sprites(self):
+        """Pre-draw one particle dot per color so particles can be blitted in a batch"""
+        size = PARTICLE_RADIUS * 2 + 1
+        sprites = []
+        for color in PARTICLE_COLORS:
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (PARTICLE_RADIUS, PARTICLE_RADIUS), PARTICLE_RADIUS)
+            sprites.append(sprite)
+        return sprites
+
+    def present(self):
+        """Show the finished frame in the window"""
+        if self.dirty_rects is not None:
+            self.dirty_rects.present()
+        else:
+            pygame.display.flip()
+
+    def _mark(self, rect):
+        """Record a region drawn this frame (dirty-rect mode only)"""
+        if self.dirty_rects is not None:
+            self.dirty_rects.mark(rect)
+
+    def _mark_screen_changed(self, screen_key):
+        """Redraw the whole window when what it shows changes (dirty-rect mode only)"""
+        if self.dirty_rects is not None and screen_key != self._screen_key:
+            self.dirty_rects.mark_all()
+        self._screen_key = screen_key
+
+    def _create_background(self):
+        """Pre-render the gradient background and UI panel once"""
+        background = pygame.Surface(self.screen.get_size(), 0, self.screen)
 
-    def draw_background(self):
-        """Draw gradient background with UI panel"""
         # Draw UI panel background (dark gray)
         ui_panel_rect = pygame.Rect(0, 0, UI_PANEL_WIDTH, SCREEN_HEIGHT)
-        pygame.draw.rect(self.screen, DARK_GRAY, ui_panel_rect)
+        pygame.draw.rect(background, DARK_GRAY, ui_panel_rect)
 
         # Draw separator line
-        pygame.draw.line(self.screen, WHITE, (UI_PANEL_WIDTH, 0), (UI_PANEL_WIDTH, SCREEN_HEIGHT), 2)
+        pygame.draw.line(background, WHITE, (UI_PANEL_WIDTH, 0), (UI_PANEL_WIDTH, SCREEN_HEIGHT), 2)
 
         # Draw gradient background for gameplay area
         for y in range(SCREEN_HEIGHT):
@@ -58,10 +89,23 @@ class GameRenderer:
                 min(255, int(206 - y * 0.1)),
                 min(255, int(235 - y * 0.15))
             )
-            pygame.draw.line(self.screen, color, (UI_PANEL_WIDTH, y), (SCREEN_WIDTH, y))
+            pygame.draw.line(background, color, (UI_PANEL_WIDTH, y), (SCREEN_WIDTH, y))
+
+        # Static UI panel labels
+        for text, color, position in STATIC_UI_LABELS:
+            background.blit(self.font.render(text, True, color), position)
+
+        return background
+
+    def draw_background(self):
+        """Draw gradient background with UI panel (a single blit of the cached image)"""
+        self._mark_screen_changed("playing")
+        self.screen.blit(self._background, (0, 0))
+
+    def draw_player(self, player, position=None):
+        """Draw player with color-changing attack range visualization (at position, if given)"""
+        rect = player.rect if position is None else pygame.Rect(position, player.rect.size)
 
-    def draw_player(self, player):
-        """Draw player with color-changing attack range visualization"""
         # Determine aura color based on shield status
         if player.has_shield():
             # Blue aura when shield is active
@@ -71,219 +115,171 @@ class GameRenderer:
             aura_color = (255, 192, 203, 50)  # Semi-transparent pink
 
         # Draw attack range aura (using pet-boosted range)
-        aura_surface = pygame.Surface(
-            (player.attack_range * 2, player.attack_range * 2),
-            pygame.SRCALPHA
-        )
-        pygame.draw.circle(
-            aura_surface,
-            aura_color,
-            (player.attack_range, player.attack_range),
-            player.attack_range
-        )
-        aura_rect = aura_surface.get_rect(center=player.rect.center)
-        self.screen.blit(aura_surface, aura_rect)
+        aura_surface = self._get_aura_surface(player, aura_color)
+        aura_rect = aura_surface.get_rect(center=rect.center)
+        self._mark(self.screen.blit(aura_surface, aura_rect))
 
         # Draw player body and head
-        pygame.draw.rect(self.screen, player.body_color, player.rect)
-        head_pos = (player.rect.centerx, player.rect.top + 10)
-        pygame.draw.circle(self.screen, player.head_color, head_pos, 15)
+        sprite, (offset_x, offset_y) = self.sprites.player(player)
+        self._mark(self.screen.blit(sprite, (rect.x - offset_x, rect.y - offset_y)))
 
         # Draw additional shield indicator ring if shield is active
         if player.has_shield():
             shield_color = (80, 180, 255)  # Bright blue
-            pygame.draw.circle(self.screen, shield_color,
-                              (player.rect.centerx, player.rect.centery),
-                              player.rect.width + 8, 3)
-
-    def draw_enemy(self, enemy):
-        """Draw enemy with all its parts and health bar"""
-        # Draw enemy body
-        pygame.draw.rect(self.screen, enemy.body_color, enemy.rect)
-
-        # Draw enemy head
-        head_pos = (enemy.rect.centerx, enemy.rect.top + 10)
-        head_radius = 20 if enemy.is_boss else 12
-        pygame.draw.circle(self.screen, enemy.head_color, head_pos, head_radius)
-
-        # Draw enemy accessory
-        self._draw_enemy_accessory(enemy)
-
-        # Draw enemy name
-        name_text = self.font.render(enemy.name, True, BLACK)
-        self.screen.blit(name_text, (enemy.rect.x - 10, enemy.rect.y - 20))
-
-        # Draw health bar
-        self._draw_health_bar(enemy)
-
-    def _draw_enemy_accessory(self, enemy):
-        """Draw the enemy's accessory based on type"""
-        if enemy.accessory == "Hat":
-            points = [
-                (enemy.rect.centerx - 15, enemy.rect.top),
-                (enemy.rect.centerx + 15, enemy.rect.top),
-                (enemy.rect.centerx, enemy.rect.top - 15)
-            ]
-            pygame.draw.polygon(self.screen, enemy.accessory_color, points)
-
-        elif enemy.accessory == "Sword":
-            pygame.draw.line(
-                self.screen,
-                enemy.accessory_color,
-                (enemy.rect.right, enemy.rect.centery),
-                (enemy.rect.right + 20, enemy.rect.centery + 10),
-                3
-            )
-
-        elif enemy.accessory == "Cape":
-            points = [
-                (enemy.rect.left, enemy.rect.bottom),
-                (enemy.rect.right, enemy.rect.bottom),
-                (enemy.rect.centerx, enemy.rect.bottom + 20)
-            ]
-            pygame.draw.polygon(self.screen, enemy.accessory_color, points)
-
-        elif enemy.accessory == "Glasses":
-            pygame.draw.circle(
-                self.screen,
-                enemy.accessory_color,
-                (enemy.rect.centerx - 5, enemy.rect.top + 10),
-                3
+            self._mark(pygame.draw.circle(self.screen, shield_color,
+                                          rect.center, rect.width + 8, 3))
+
+    def _get_aura_surface(self, player, aura_color):
+        """Cached translucent aura circle for the player's current range and color"""
+        if player.attack_range_version != self._aura_version:
+            self._aura_cache.clear()  # Range changed (pets or level up)
+            self._aura_version = player.attack_range_version
+
+        key = (player.attack_range, aura_color)
+        aura_surface = self._aura_cache.get(key)
+        if aura_surface is None:
+            aura_surface = pygame.Surface(
+                (player.attack_range * 2, player.attack_range * 2),
+                pygame.SRCALPHA
             )
             pygame.draw.circle(
-                self.screen,
-                enemy.accessory_color,
-                (enemy.rect.centerx + 5, enemy.rect.top + 10),
-                3
+                aura_surface,
+                aura_color,
+                (player.attack_range, player.attack_range),
+                player.attack_range
             )
+            self._aura_cache[key] = aura_surface
+            self.aura_allocations += 1
+        return aura_surface
+
+    def draw_enemy(self, enemy, position=None):
+        """Draw enemy with all its parts and health bar (at position, if given)"""
+        rect = enemy.rect
+        if position is not None:
+            rect.topleft = position
+        sprite, (offset_x, offset_y) = self.sprites.enemy(enemy, rect)
+        self._mark(self.screen.blit(sprite, (rect.x - offset_x, rect.y - offset_y)))
+
+        # Draw health bar
+        self._draw_health_bar(enemy, rect)
 
     def draw_golden_apple(self, apple):
         """Draw a golden apple collectible"""
-        # Draw apple body (golden circle)
-        pygame.draw.circle(self.screen, apple.color, apple.rect.center, apple.rect.width // 2)
-
-        # Draw apple outline for better visibility
-        pygame.draw.circle(self.screen, apple.outline_color, apple.rect.center, apple.rect.width // 2, 2)
-
-        # Draw apple stem (small brown line on top)
-        stem_start = (apple.rect.centerx, apple.rect.top + 5)
-        stem_end = (apple.rect.centerx, apple.rect.top)
-        pygame.draw.line(self.screen, BROWN, stem_start, stem_end, 2)
-
-        # Draw apple leaf (small green triangle)
-        leaf_points = [
-            (apple.rect.centerx + 3, apple.rect.top + 2),
-            (apple.rect.centerx + 8, apple.rect.top - 2),
-            (apple.rect.centerx + 5, apple.rect.top + 5)
-        ]
-        pygame.draw.polygon(self.screen, GREEN, leaf_points)
-
-        # Draw EXP value text above apple
-        exp_text = self.font.render(f"+{apple.exp_value} EXP", True, BLACK)
-        text_rect = exp_text.get_rect(center=(apple.rect.centerx, apple.rect.top - 15))
-        self.screen.blit(exp_text, text_rect)
+        sprite, (offset_x, offset_y) = self.sprites.golden_apple(apple)
+        self._mark(self.screen.blit(sprite, (apple.rect.x - offset_x, apple.rect.y - offset_y)))
 
     def draw_shield_fruit(self, shield_fruit):
-        """
-        Draws a shield fruit collectible.
-        Expects shield_fruit to have at least .rect; optionally .color and .outline_color.
-        """
-        rect = shield_fruit.rect
-        color = getattr(shield_fruit, "color", (80, 200, 255))  # default cyan-ish
-        outline = getattr(shield_fruit, "outline_color", (40, 120, 200))
-
-        # Draw body (circle based on rect)
-        center = (rect.centerx, rect.centery)
-        radius = min(rect.width, rect.height) // 2
-        pygame.draw.circle(self.screen, color, center, radius)
-        pygame.draw.circle(self.screen, outline, center, radius, width=2)
-
-        # Optional: a simple shield emblem
-        emblem_w = int(radius * 1.1)
-        emblem_h = int(radius * 1.2)
-        emblem_rect = pygame.Rect(0, 0, emblem_w, emblem_h)
-        emblem_rect.center = center
-        # Shield shape: top arc + bottom point
-        top = (emblem_rect.centerx, emblem_rect.top)
-        left = (emblem_rect.left, emblem_rect.top + emblem_h // 3)
-        right = (emblem_rect.right, emblem_rect.top + emblem_h // 3)
-        bottom = (emblem_rect.centerx, emblem_rect.bottom)
-        pygame.draw.polygon(self.screen, (255, 255, 255), [top, right, bottom, left], width=2)
-
-    def _draw_health_bar(self, enemy):
+        """Draw a shield fruit collectible"""
+        sprite, (offset_x, offset_y) = self.sprites.shield_fruit(shield_fruit)
+        self._mark(self.screen.blit(sprite, (shield_fruit.rect.x - offset_x, shield_fruit.rect.y - offset_y)))
+
+    def draw_pet(self, pet, position=None):
+        """Draw a pet with cute bobbing animation (at position, if given)"""
+        sprite, (offset_x, offset_y) = self.sprites.pet(pet)
+        x, y = pet.rect.topleft if position is None else position
+        bob_y = int(pet.rect.centery + pet.get_bob_offset()) - pet.rect.centery
+        self._mark(self.screen.blit(sprite, (x - offset_x, y - offset_y + bob_y)))
+
+    def _draw_health_bar(self, enemy, rect):
         """Draw enemy health bar"""
         health_percentage = enemy.get_health_percentage()
-        health_width = int(health_percentage * enemy.rect.width)
+        health_width = int(health_percentage * rect.width)
 
         # Background (red)
-        pygame.draw.rect(self.screen, RED, (enemy.rect.x, enemy.rect.y + enemy.rect.height + 5, enemy.rect.width, 5))
+        self._mark(pygame.draw.rect(self.screen, RED, (rect.x, rect.y + rect.height + 5, rect.width, 5)))
         # Foreground (green)
-        pygame.draw.rect(self.screen, GREEN, (enemy.rect.x, enemy.rect.y + enemy.rect.height + 5, health_width, 5))
+        pygame.draw.rect(self.screen, GREEN, (rect.x, rect.y + rect.height + 5, health_width, 5))
+
+    def draw_particles(self, particle_pool):
+        """Draw every live particle with a single batched blit call"""
+        n = particle_pool.count
+        if n == 0:
+            return
+        xs = (particle_pool.x[:n].astype(int) - PARTICLE_RADIUS).tolist()
+        ys = (particle_pool.y[:n].astype(int) - PARTICLE_RADIUS).tolist()
+        sprites = self._particle_sprites
+        color_ids = particle_pool.color_id[:n].tolist()
+        blit_sequence = [(sprites[color_id], (x, y)) for color_id, x, y in zip(color_ids, xs, ys)]
+        if self.dirty_rects is not None:
+            self.dirty_rects.mark_many(self.screen.blits(blit_sequence))
+        else:
+            self.screen.blits(blit_sequence, doreturn=False)
+
+    def draw_profiler_overlay(self, rows):
+        """Draw the frame profiler's table in the top-right corner (re-rendered only when it changes)"""
+        if rows != self._profiler_rows:
+            self._profiler_rows = rows
+            cells = [[self.font.render(text, True, WHITE) for text in row] for row in rows]
+            column_widths = [max(row[column].get_width() for row in cells) + 12 for column in range(len(rows[0]))]
+            line_height = self.font.get_linesize()
+            surface = pygame.Surface((sum(column_widths) + 8, line_height * len(rows) + 12), pygame.SRCALPHA)
+            surface.fill((0, 0, 0, 180))
+            for row_index, row in enumerate(cells):
+                x = 10
+                for cell, width in zip(row, column_widths):
+                    surface.blit(cell, (x, 6 + row_index * line_height))
+                    x += width
+            self._profiler_surface = surface
+        rect = self._profiler_surface.get_rect(topright=(self.screen.get_width() - 8, 8))
+        self.screen.blit(self._profiler_surface, rect)
+        self._mark(rect)
 
     def draw_wall(self, wall):
         """Draw a wall"""
         pygame.draw.rect(self.screen, wall.color, wall.rect)
 
     def draw_ui(self, player):
-        """Draw all user interface elements in the left UI panel"""
-        # UI Panel title
-        title_text = self.font.render("PLAYER STATS", True, WHITE)
-        self.screen.blit(title_text, (10, 10))
+        """Draw the changing parts of the UI panel (static labels are in the background)"""
+        if self.dirty_rects is not None:
+            self._mark_ui_if_changed(player)
 
         # Player basic stats
-        level_exp_text = self.font.render(
-            f"Level: {player.level}", True, WHITE
+        level_exp_text = self.text_cache.render(
+            f"Level: {player.level}", WHITE
         )
         self.screen.blit(level_exp_text, (10, 40))
 
-        exp_text = self.font.render(
-            f"EXP: {player.exp:.1f}/{player.exp_to_next_level:.1f}", True, WHITE
+        exp_text = self.text_cache.render(
+            f"EXP: {player.exp:.1f}/{player.exp_to_next_level:.1f}", WHITE
         )
         self.screen.blit(exp_text, (10, 60))
 
-        wins_text = self.font.render(f"Wins: {player.wins}", True, WHITE)
+        wins_text = self.text_cache.render(f"Wins: {player.wins}", WHITE)
         self.screen.blit(wins_text, (10, 80))
 
-        evolution_text = self.font.render(f"Evolution:", True, WHITE)
-        self.screen.blit(evolution_text, (10, 110))
-
-        evo_name_text = self.font.render(f"{player.evolution}", True, YELLOW)
+        evo_name_text = self.text_cache.render(f"{player.evolution}", YELLOW)
         self.screen.blit(evo_name_text, (10, 130))
 
-        # Show specialty
-        specialty_text = self.font.render(f"Specialty:", True, WHITE)
-        self.screen.blit(specialty_text, (10, 160))
-
         # Split specialty text if too long
         specialty_words = player.specialty.split()
         if len(player.specialty) > 25:  # If too long, split into two lines
             line1 = " ".join(specialty_words[:3])
             line2 = " ".join(specialty_words[3:])
-            spec1_text = self.font.render(line1, True, CYAN)
-            spec2_text = self.font.render(line2, True, CYAN)
+            spec1_text = self.text_cache.render(line1, CYAN)
+            spec2_text = self.text_cache.render(line2, CYAN)
             self.screen.blit(spec1_text, (10, 180))
             self.screen.blit(spec2_text, (10, 200))
             y_offset = 220
         else:
-            spec_text = self.font.render(player.specialty, True, CYAN)
+            spec_text = self.text_cache.render(player.specialty, CYAN)
             self.screen.blit(spec_text, (10, 180))
             y_offset = 210
 
         # Combat stats
-        damage_text = self.font.render(f"Damage: {player.damage}", True, WHITE)
+        damage_text = self.text_cache.render(f"Damage: {player.damage}", WHITE)
         self.screen.blit(damage_text, (10, y_offset))
 
-        speed_text = self.font.render(f"Speed: {player.speed}", True, WHITE)
+        speed_text = self.text_cache.render(f"Speed: {player.speed}", WHITE)
         self.screen.blit(speed_text, (10, y_offset + 20))
 
-        range_text = self.font.render(f"Range: {player.attack_range}", True, WHITE)
+        range_text = self.text_cache.render(f"Range: {player.attack_range}", WHITE)
         self.screen.blit(range_text, (10, y_offset + 40))
 
         # Health stats
-        health_text = self.font.render(f"Health: {player.health:.0f}/{player.max_health}", True, WHITE)
+        health_text = self.text_cache.render(f"Health: {player.health:.0f}/{player.max_health}", WHITE)
         self.screen.blit(health_text, (10, y_offset + 70))
 
-        regen_text = self.font.render(f"Regen: {player.regen_rate:.2f}/sec", True, WHITE)
+        regen_text = self.text_cache.render(f"Regen: {player.regen_rate:.2f}/sec", WHITE)
         self.screen.blit(regen_text, (10, y_offset + 90))
 
         # Player health bar
@@ -292,12 +288,12 @@ class GameRenderer:
         # Show shield status if active
         if player.has_shield():
             shield_time = player.shield_time_remaining()
-            shield_text = self.font.render(f"SHIELD: {shield_time:.1f}s", True, (80, 180, 255))
+            shield_text = self.text_cache.render(f"SHIELD: {shield_time:.1f}s", (80, 180, 255))
             self.screen.blit(shield_text, (10, y_offset + 130))
             y_offset += 20  # Adjust offset for shield text
 
         # Show active pets
-        pets_title = self.font.render("Active Pets:", True, WHITE)
+        pets_title = self.text_cache.render("Active Pets:", WHITE)
         self.screen.blit(pets_title, (10, y_offset + 140))
 
         for i in range(3):
@@ -314,27 +310,23 @@ class GameRenderer:
                 pet_text = f"[{i + 1}]: Empty"
                 color = GRAY
 
-            pets_display = self.font.render(pet_text, True, color)
+            pets_display = self.text_cache.render(pet_text, color)
             self.screen.blit(pets_display, (10, pet_y))
 
-        # Instructions at bottom of UI panel
-        instructions1 = self.font.render("CONTROLS:", True, WHITE)
-        self.screen.blit(instructions1, (10, SCREEN_HEIGHT - 120))
-
-        instructions2 = self.font.render("WASD/Arrows: Move", True, WHITE)
-        self.screen.blit(instructions2, (10, SCREEN_HEIGHT - 100))
-
-        instructions3 = self.font.render("Click: Attack", True, WHITE)
-        self.screen.blit(instructions3, (10, SCREEN_HEIGHT - 80))
-
-        instructions4 = self.font.render("P: Pet Shop", True, WHITE)
-        self.screen.blit(instructions4, (10, SCREEN_HEIGHT - 60))
-
-        instructions5 = self.font.render("T: Pet Team", True, WHITE)
-        self.screen.blit(instructions5, (10, SCREEN_HEIGHT - 40))
-
-        instructions6 = self.font.render("Kill enemies for wins!", True, YELLOW)
-        self.screen.blit(instructions6, (10, SCREEN_HEIGHT - 20))
+    def _mark_ui_if_changed(self, player):
+        """Mark the UI panel dirty when any value it shows has changed since last frame"""
+        health_percentage = calculate_health_percentage(player.health, player.max_health)
+        shield_text = f"{player.shield_time_remaining():.1f}" if player.has_shield() else None
+        ui_state = (
+            player.level, f"{player.exp:.1f}/{player.exp_to_next_level:.1f}", player.wins,
+            player.evolution, player.specialty, player.damage, player.speed, player.attack_range,
+            f"{player.health:.0f}/{player.max_health}", f"{player.regen_rate:.2f}",
+            int(health_percentage * 280), shield_text,
+            tuple(pet.name if pet is not None else None for pet in player.pet_objects),
+        )
+        if ui_state != self._ui_state:
+            self.dirty_rects.mark(pygame.Rect(0, 0, UI_PANEL_WIDTH, SCREEN_HEIGHT))
+            self._ui_state = ui_state
 
     def _draw_player_health_bar(self, player, y_pos):
         """Draw the player's health bar in the UI panel"""
@@ -350,15 +342,18 @@ class GameRenderer:
 
     def draw_pet_shop(self, player, selected_pet_info, confirm_purchase):
         """Draw the pet shop interface"""
+        from pets import get_pet_info, get_pet_cost
+        self._mark_screen_changed(("pet_shop", selected_pet_info, confirm_purchase, player.wins,
+                                   player.level, tuple(player.owned_pets)))
         self.screen.fill(BLACK)
 
         # Title
-        title = self.font.render("PET SHOP", True, WHITE)
+        title = self.text_cache.render("PET SHOP", WHITE)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 50))
         self.screen.blit(title, title_rect)
 
         # Show wins
-        wins_text = self.font.render(f"Wins: {player.wins}", True, WHITE)
+        wins_text = self.text_cache.render(f"Wins: {player.wins}", WHITE)
         self.screen.blit(wins_text, (50, 70))
 
         # Show available pets
@@ -385,9 +380,9 @@ class GameRenderer:
             pygame.draw.rect(self.screen, WHITE, pet_rect, 2)  # White border
 
             # Pet info text
-            name_text = self.font.render(pet_name, True, WHITE)
-            desc_text = self.font.render(pet_info["description"], True, WHITE)
-            status_text = self.font.render(status, True, WHITE)
+            name_text = self.text_cache.render(pet_name, WHITE)
+            desc_text = self.text_cache.render(pet_info["description"], WHITE)
+            status_text = self.text_cache.render(status, WHITE)
 
             self.screen.blit(name_text, (60, y + 5))
             self.screen.blit(desc_text, (60, y + 20))
@@ -422,7 +417,7 @@ class GameRenderer:
             ]
 
             for i, text in enumerate(confirm_text):
-                rendered = self.font.render(text, True, BLACK)
+                rendered = self.text_cache.render(text, BLACK)
                 text_rect = rendered.get_rect(center=(SCREEN_WIDTH // 2, 330 + i * 25))
                 self.screen.blit(rendered, text_rect)
 
@@ -433,27 +428,30 @@ class GameRenderer:
             pygame.draw.rect(self.screen, GREEN, confirm_rect)
             pygame.draw.rect(self.screen, RED, cancel_rect)
 
-            confirm_btn_text = self.font.render("BUY", True, WHITE)
-            cancel_btn_text = self.font.render("CANCEL", True, WHITE)
+            confirm_btn_text = self.text_cache.render("BUY", WHITE)
+            cancel_btn_text = self.text_cache.render("CANCEL", WHITE)
 
             self.screen.blit(confirm_btn_text, confirm_btn_text.get_rect(center=confirm_rect.center))
             self.screen.blit(cancel_btn_text, cancel_btn_text.get_rect(center=cancel_rect.center))
 
         # Instructions
-        instructions = self.font.render("Click on pets to buy them! Press ESC to close.", True, WHITE)
+        instructions = self.text_cache.render("Click on pets to buy them! Press ESC to close.", WHITE)
         self.screen.blit(instructions, (50, SCREEN_HEIGHT - 50))
 
     def draw_pet_selection(self, player):
         """Draw the pet selection interface"""
+        from pets import get_pet_info
+        self._mark_screen_changed(("pet_selection", tuple(player.owned_pets),
+                                   tuple(pet.name if pet is not None else None for pet in player.pet_objects)))
         self.screen.fill(BLACK)
 
         # Title
-        title = self.font.render("PET TEAM SELECTION", True, WHITE)
+        title = self.text_cache.render("PET TEAM SELECTION", WHITE)
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 50))
         self.screen.blit(title, title_rect)
 
         # Show owned pets
-        owned_text = self.font.render("Your Pets:", True, WHITE)
+        owned_text = self.text_cache.render("Your Pets:", WHITE)
         self.screen.blit(owned_text, (50, 80))
 
         y_start = 100
@@ -467,7 +465,7 @@ class GameRenderer:
             pygame.draw.rect(self.screen, WHITE, pet_rect, 2)
 
             # Pet info
-            name_text = self.font.render(f"{pet_name}: {pet_info['description']}", True, WHITE)
+            name_text = self.text_cache.render(f"{pet_name}: {pet_info['description']}", WHITE)
             self.screen.blit(name_text, (60, y + 8))
 
             # Color indicator
@@ -475,7 +473,7 @@ class GameRenderer:
             pygame.draw.rect(self.screen, pet_info["color"], color_rect)
 
         # Show active slots
-        slots_text = self.font.render("Active Pet Slots (click to remove):", True, WHITE)
+        slots_text = self.text_cache.render("Active Pet Slots (click to remove):", WHITE)
         self.screen.blit(slots_text, (50, 280))
 
         for slot in range(3):
@@ -488,7 +486,7 @@ class GameRenderer:
             pygame.draw.rect(self.screen, WHITE, slot_rect, 2)
 
             # Slot title
-            slot_title = self.font.render(f"Slot {slot + 1}", True, WHITE)
+            slot_title = self.text_cache.render(f"Slot {slot + 1}", WHITE)
             self.screen.blit(slot_title, (x + 10, y + 10))
 
             # Pet in slot
@@ -502,7 +500,7 @@ class GameRenderer:
                 pygame.draw.rect(self.screen, pet_info["color"], pet_visual_rect)
 
                 # Pet name and description
-                name = self.font.render(pet.name, True, WHITE)
+                name = self.text_cache.render(pet.name, WHITE)
                 desc_lines = pet_info["description"].split()
 
                 # Wrap text to fit in slot
@@ -512,32 +510,33 @@ class GameRenderer:
                 name_rect = name.get_rect(center=(x + 80, y + 155))
                 self.screen.blit(name, name_rect)
 
-                desc1 = self.font.render(line1, True, WHITE)
+                desc1 = self.text_cache.render(line1, WHITE)
                 desc1_rect = desc1.get_rect(center=(x + 80, y + 170))
                 self.screen.blit(desc1, desc1_rect)
 
                 if line2:
-                    desc2 = self.font.render(line2, True, WHITE)
+                    desc2 = self.text_cache.render(line2, WHITE)
                     desc2_rect = desc2.get_rect(center=(x + 80, y + 185))
                     self.screen.blit(desc2, desc2_rect)
             else:
                 # Empty slot
-                empty_text = self.font.render("EMPTY", True, GRAY)
+                empty_text = self.text_cache.render("EMPTY", GRAY)
                 empty_rect = empty_text.get_rect(center=(x + 80, y + 100))
                 self.screen.blit(empty_text, empty_rect)
 
         # Instructions
-        instructions1 = self.font.render("Click your pets above to add them to slots.", True, WHITE)
-        instructions2 = self.font.render("Click active slots to remove pets. Press ESC to close.", True, WHITE)
+        instructions1 = self.text_cache.render("Click your pets above to add them to slots.", WHITE)
+        instructions2 = self.text_cache.render("Click active slots to remove pets. Press ESC to close.", WHITE)
         self.screen.blit(instructions1, (50, SCREEN_HEIGHT - 70))
         self.screen.blit(instructions2, (50, SCREEN_HEIGHT - 50))
 
     def draw_game_over_screen(self, player):
         """Draw the game over screen with final stats"""
+        self._mark_screen_changed("game_over")  # nothing on it changes until the next game
         self.screen.fill(BLACK)
 
         # Game Over title
-        title_text = self.font.render("Game Over", True, WHITE)
+        title_text = self.text_cache.render("Game Over", WHITE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 120))
         self.screen.blit(title_text, title_rect)
 
@@ -566,14 +565,14 @@ class GameRenderer:
                               player.rect.width + 5, 3)
 
         for text_line in stats_to_show:
-            stats_text = self.font.render(text_line, True, WHITE)
+            stats_text = self.text_cache.render(text_line, WHITE)
             stats_rect = stats_text.get_rect(center=(SCREEN_WIDTH // 2, y_offset))
             self.screen.blit(stats_text, stats_rect)
             y_offset += 35
 
         # Play Again button
         play_again_button = pygame.Rect(SCREEN_WIDTH // 2 - 75, y_offset + 10, 150, 50)
-        play_again_text = self.font.render("Play Again", True, BLACK)
+        play_again_text = self.text_cache.render("Play Again", BLACK)
         pygame.draw.rect(self.screen, WHITE, play_again_button)
         self.screen.blit(play_again_text, play_again_text.get_rect(center=play_again_button.center))
 
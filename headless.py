@@ -0,0 +1,221 @@
+# Headless Simulation - Run the game without a window, as fast as the CPU allows
+#
+# Example:
+#   python headless.py --seed 42 --frames 216000 --script bot.txt --quiet
+#   python headless.py --replay replays/session-20250101-120000.replay --quiet
+#   python headless.py --seed 42 --frames 36000 --quiet --profile profile.json
+#
+# Script files have one command per line: "<frame> <command> [args]"
+#   120 press d         hold a key down (movement keys: wasd / arrows)
+#   300 release d       let go of a held key
+#   400 click 650 320   left mouse click at a screen position
+#   500 key p           tap a key (P: pet shop, T: pet team, ESC: close menus)
+# Lines starting with "#" are ignored.
+import argparse
+import random
+import time
+import pygame
+from game_config import FPS
+from event_bus import bus, LEVELS
+from frame_profiler import FrameProfiler
+from game_manager import GameManager
+from replay import Replay, ReplayRecorder, play_replay, replay_matches
+
+# Key names usable in scripts (pygame.key.key_code needs pygame.init())
+KEY_NAMES = {
+    "a": pygame.K_a,
+    "d": pygame.K_d,
+    "w": pygame.K_w,
+    "s": pygame.K_s,
+    "p": pygame.K_p,
+    "t": pygame.K_t,
+    "left": pygame.K_LEFT,
+    "right": pygame.K_RIGHT,
+    "up": pygame.K_UP,
+    "down": pygame.K_DOWN,
+    "escape": pygame.K_ESCAPE,
+    "esc": pygame.K_ESCAPE,
+}
+
+
+class KeyState:
+    """Stand-in for pygame.key.get_pressed() that scripts and bots can drive"""
+
+    def __init__(self):
+        self.pressed = set()
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+    def press(self, key):
+        """Hold a key down"""
+        self.pressed.add(key)
+
+    def release(self, key):
+        """Let go of a key"""
+        self.pressed.discard(key)
+
+
+class ScriptedInput:
+    """Feeds key states and input events to the game from a frame-indexed script"""
+
+    def __init__(self, commands=()):
+        self.keys = KeyState()
+        self.commands = {}  # frame -> list of (command, args)
+        for frame, command, args in commands:
+            self.commands.setdefault(frame, []).append((command, args))
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a script file (see the top of this module for the format)"""
+        commands = []
+        with open(path) as script_file:
+            for line_number, line in enumerate(script_file, 1):
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                parts = line.split()
+                if len(parts) < 2:
+                    raise ValueError(f"{path}:{line_number}: expected '<frame> <command> [args]'")
+                commands.append((int(parts[0]), parts[1].lower(), parts[2:]))
+        return cls(commands)
+
+    def events_for_frame(self, frame):
+        """Apply this frame's commands and return the events to hand to the game"""
+        events = []
+        for command, args in self.commands.get(frame, ()):
+            if command == "press":
+                self.keys.press(KEY_NAMES[args[0].lower()])
+            elif command == "release":
+                self.keys.release(KEY_NAMES[args[0].lower()])
+            elif command == "key":
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=KEY_NAMES[args[0].lower()]))
+            elif command == "click":
+                pos = (int(args[0]), int(args[1]))
+                events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+            else:
+                raise ValueError(f"Unknown script command at frame {frame}: {command}")
+        return events
+
+
+def run_headless(seed=0, frames=FPS * 60, script=None, restart_on_death=False, record_path=None,
+                 profile_path=None):
+    """Step the game for a number of frames without drawing and return run statistics
+
+    With record_path the run's input is also saved as a replay file, and with
+    profile_path a frame profile of the update phases is written (.csv or .json).
+    """
+    random.seed(seed)
+    scripted_input = script if script is not None else ScriptedInput()
+    game_manager = GameManager()
+    recorder = ReplayRecorder(seed) if record_path else None
+    profiler = _start_profiler(game_manager, frames) if profile_path else None
+    deaths = 0
+
+    start_time = time.perf_counter()
+    for frame in range(frames):
+        events = scripted_input.events_for_frame(frame)
+        for event in events:
+            game_manager.handle_input(event)
+        if recorder is not None:
+            recorder.record_frame(scripted_input.keys, events)
+
+        game_manager.update_game(scripted_input.keys)
+
+        if game_manager.game_state == "game_over":
+            deaths += 1
+            if not restart_on_death:
+                frames = frame + 1
+                break
+            game_manager.reset_game()
+    elapsed = time.perf_counter() - start_time
+    bus.flush(wait=True)
+
+    if recorder is not None:
+        recorder.save(record_path, game_manager)
+    if profiler is not None:
+        profiler.export(profile_path)
+    return _run_stats(game_manager, seed, frames, elapsed, deaths)
+
+
+def run_replay(replay, profile_path=None):
+    """Play a recorded session back without drawing and return run statistics"""
+    game_manager = GameManager()
+    profiler = _start_profiler(game_manager, replay.frames) if profile_path else None
+    start_time = time.perf_counter()
+    play_replay(replay, game_manager)
+    elapsed = time.perf_counter() - start_time
+    bus.flush(wait=True)
+    if profiler is not None:
+        profiler.export(profile_path)
+    deaths = 1 if game_manager.game_state == "game_over" else 0
+    stats = _run_stats(game_manager, replay.seed, replay.frames, elapsed, deaths)
+    stats["replay_matches"] = replay_matches(replay, game_manager)
+    return stats
+
+
+def _start_profiler(game_manager, frames):
+    """Profile every frame of a run (timing adds a little to the run's own speed figures)"""
+    profiler = FrameProfiler(game_manager, history=frames, per_tick=True)  # nothing is drawn: a frame is a tick
+    profiler.enable()
+    return profiler
+
+
+def _run_stats(game_manager, seed, frames, elapsed, deaths):
+    player = game_manager.player
+    return {
+        "seed": seed,
+        "frames": frames,
+        "elapsed_seconds": elapsed,
+        "simulated_fps": frames / elapsed if elapsed > 0 else float("inf"),
+        "speedup": (frames / FPS) / elapsed if elapsed > 0 else float("inf"),
+        "deaths": deaths,
+        "game_state": game_manager.game_state,
+        "level": player.level,
+        "wins": player.wins,
+        "enemies": len(game_manager.enemies),
+    }
+
+
+def main():
+    """Command line entry point for headless runs"""
+    parser = argparse.ArgumentParser(description="Run the game headless, faster than real time")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the run")
+    parser.add_argument("--frames", type=int, default=FPS * 60, help="number of frames to simulate")
+    parser.add_argument("--script", help="scripted input file (see headless.py for the format)")
+    parser.add_argument("--restart-on-death", action="store_true",
+                        help="start a new game when the player dies instead of stopping")
+    parser.add_argument("--replay", help="play back a recorded session instead (ignores seed/frames/script)")
+    parser.add_argument("--record", help="save this run as a replay file")
+    parser.add_argument("--quiet", action="store_true", help="hide the game's console messages")
+    parser.add_argument("--profile", help="write a per-phase frame profile of the run (.csv or .json)")
+    parser.add_argument("--log-level", choices=sorted(LEVELS), help="which game messages to print (default: info)")
+    args = parser.parse_args()
+    if args.record and args.restart_on_death:
+        parser.error("--record can't be combined with --restart-on-death (restarts aren't player input)")
+
+    script = ScriptedInput.from_file(args.script) if args.script else None
+
+    if args.quiet:
+        bus.set_console_level(None)
+    elif args.log_level:
+        bus.set_console_level(args.log_level)
+
+    if args.replay:
+        result = run_replay(Replay.load(args.replay), args.profile)
+    else:
+        result = run_headless(args.seed, args.frames, script, args.restart_on_death, args.record, args.profile)
+
+    simulated_seconds = result["frames"] / FPS
+    print(f"Simulated {result['frames']} frames ({simulated_seconds:.1f}s of gameplay) "
+          f"in {result['elapsed_seconds']:.3f}s")
+    print(f"Simulated FPS: {result['simulated_fps']:.0f} ({result['speedup']:.1f}x real time)")
+    print(f"Final state: {result['game_state']}, level {result['level']}, "
+          f"{result['wins']} wins, {result['enemies']} enemies alive, {result['deaths']} deaths")
+    if "replay_matches" in result:
+        print("Replay ended in the recorded state" if result["replay_matches"]
+              else "Replay went out of sync with the recording!")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,31 @@
-import asyncio
+import time
+STARTUP_BEGAN = time.perf_counter()  # before the imports, which are most of the startup time
+import argparse
+import os
 import platform
+import random
+import types
 import pygame
-from game_config import SCREEN_WIDTH, SCREEN_HEIGHT, FPS
+from game_config import (SCREEN_WIDTH, SCREEN_HEIGHT, FPS, RENDER_FPS, INTERPOLATE_RENDERING, MAX_TICKS_PER_FRAME,
+                         SIMULATION_THREAD, FAST_STARTUP, REPORT_STARTUP_TIME, RECORD_REPLAYS, REPLAY_DIRECTORY,
+                         SAVE_FILE, AUTOSAVE, AUTOSAVE_SECONDS)
 from game_manager import GameManager
+from replay import ReplayRecorder
+from event_bus import bus
+# save_state, frame_profiler and sim_thread are imported when first needed, not before the first frame
 
 
-def initialize_pygame():
-    """Set up pygame and create the game window"""
-    pygame.init()
+def initialize_pygame(fast=FAST_STARTUP):
+    """Set up pygame and create the game window
+
+    The fast path only starts the display and font modules, which is all the
+    game uses; pygame.init() also brings up audio and joysticks.
+    """
+    if fast:
+        pygame.display.init()
+        pygame.font.init()
+    else:
+        pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Brainrot Evolution 2D")
     font = pygame.font.Font(None, 24)
@@ -15,47 +33,202 @@ def initialize_pygame():
     return screen, font, clock
 
 
-async def main():
-    """Main game loop"""
+def report_startup(steps):
+    """Print the time to the first frame, split into (step, time.perf_counter() at its end) pairs"""
+    previous = STARTUP_BEGAN
+    parts = []
+    for step, finished in steps:
+        parts.append(f"{step} {(finished - previous) * 1000:.0f}")
+        previous = finished
+    print(f"First frame after {(previous - STARTUP_BEGAN) * 1000:.0f} ms ({', '.join(parts)} ms)")
+
+
+@types.coroutine
+def next_frame():
+    """End a frame on the desktop: a bare yield back to run_on_desktop()"""
+    yield
+
+
+def next_browser_frame():
+    """End a frame in the browser: pygbag hands control back to the page on asyncio.sleep(0)"""
+    import asyncio
+    return asyncio.sleep(0)
+
+
+def run_on_desktop(coroutine):
+    """Run main() without an event loop: it only ever awaits next_frame(), so asyncio isn't needed"""
+    try:
+        while True:
+            coroutine.send(None)
+    except StopIteration:
+        pass
+
+
+def autosave(game_manager):
+    """Save a game in progress (menus and the game over screen are left alone)"""
+    if game_manager.game_state == "playing":
+        from save_state import save_game
+        save_game(game_manager, SAVE_FILE)
+
+
+async def main(resume=False, threaded=SIMULATION_THREAD, record=RECORD_REPLAYS, autosaving=AUTOSAVE,
+               end_frame=next_frame):
+    """Main game loop
+
+    The simulation ticks at a fixed FPS, as many times per frame as the real
+    time since the last frame covers, so the game runs at the same speed
+    whether frames are drawn at 30 or 144 per second. Frames are drawn part
+    of the way between the last two ticks.
+
+    Threaded, the ticks run on a SimulationThread instead and this loop only
+    handles input and draws the newest snapshot.
+    """
+    startup_steps = [("imports", time.perf_counter())] if REPORT_STARTUP_TIME else None
+
     # Initialize pygame
     screen, font, clock = initialize_pygame()
+    if startup_steps is not None:
+        startup_steps.append(("pygame", time.perf_counter()))
+
+    # Threaded, the real game ticks headless and this copy only draws its snapshots
+    # (created before seeding, so the real game starts exactly like its replay)
+    render_game = GameManager(screen, font) if threaded else None
+
+    # Seed the game so the session can be replayed from its inputs
+    seed = random.randrange(2 ** 32)
+    random.seed(seed)
+    recorder = ReplayRecorder(seed) if record else None
 
     # Create game manager
-    game_manager = GameManager(screen, font)
+    game_manager = GameManager(None if threaded else screen, font)
+    drawn_game = render_game if threaded else game_manager
+    if resume and os.path.exists(SAVE_FILE):
+        from save_state import SaveError, load_game
+        try:
+            load_game(game_manager, SAVE_FILE)
+            recorder = None  # Replays only work from a fresh game
+            print(f"Continuing from {SAVE_FILE}")
+        except SaveError as error:
+            print(f"Couldn't load {SAVE_FILE}: {error}")
+    last_save = time.monotonic()
+    profiler = None  # created on the first F3
+    simulation = None
+    if threaded:
+        from sim_thread import SimulationThread
+        simulation = SimulationThread(game_manager, pygame.key.get_pressed(), recorder)
+        simulation.start()
+    if startup_steps is not None:
+        startup_steps.append(("game setup", time.perf_counter()))
 
+    tick_seconds = 1.0 / FPS
+    unsimulated_time = 0.0  # real time not yet covered by ticks
+    last_frame_time = time.perf_counter()
+    pending_events = []  # game input waiting for the next tick
     running = True
 
     while running:
-        # Get current key states
-        keys = pygame.key.get_pressed()
-
-        # Handle events
+        # Handle events (game input is handed over on the next tick)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and simulation is not None:
+                print(simulation.describe())
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                if profiler is None:
+                    from frame_profiler import FrameProfiler
+                    profiler = FrameProfiler(game_manager)
+                profiler.toggle()
+            elif (event.type == pygame.KEYDOWN and event.key == pygame.K_F4
+                  and profiler is not None and profiler.frames):
+                path = time.strftime("profile-%Y%m%d-%H%M%S.csv")
+                profiler.export(path)
+                print(f"Saved frame profile to {path}")
             else:
-                # Let game manager handle other events
-                game_manager.handle_input(event)
+                pending_events.append(event)
+        if profiler is not None:
+            profiler.start_frame()  # a profiler row is one drawn frame, with however many ticks it ran
 
-        # Update game state
-        game_manager.update_game(keys)
+        keys = pygame.key.get_pressed()
+        if simulation is not None:
+            # The worker ticks on its own schedule; draw the newest tick it finished
+            simulation.send_input(keys, pending_events)
+            pending_events = []
+            alpha = simulation.show_latest(render_game)
+        else:
+            # Update game state: one tick per 1/FPS of real time
+            now = time.perf_counter()
+            unsimulated_time = min(unsimulated_time + now - last_frame_time, MAX_TICKS_PER_FRAME * tick_seconds)
+            last_frame_time = now
+            while unsimulated_time >= tick_seconds:
+                for event in pending_events:
+                    game_manager.handle_input(event)
+                if recorder is not None:
+                    recorder.record_frame(keys, pending_events)
+                pending_events = []
+                game_manager.update_game(keys)
+                unsimulated_time -= tick_seconds
+            alpha = unsimulated_time / tick_seconds
+
+        # Autosave (takes well under a millisecond, so it doesn't show as a hitch)
+        if autosaving and AUTOSAVE_SECONDS and time.monotonic() - last_save >= AUTOSAVE_SECONDS:
+            if simulation is not None:
+                simulation.run_between_ticks(autosave)
+            else:
+                autosave(game_manager)
+            last_save = time.monotonic()
 
-        # Draw everything
-        play_again_button = game_manager.draw_game()
+        # Draw everything, as far between the last two ticks as real time has got
+        drawn_game.draw_game(alpha if INTERPOLATE_RENDERING else 1.0)
 
-        # Update display
-        pygame.display.flip()
-        clock.tick(FPS)
+        # Update display, then print/deliver this frame's game messages (the worker only queues them)
+        drawn_game.present()
+        if startup_steps is not None:
+            startup_steps.append(("first frame", time.perf_counter()))
+            report_startup(startup_steps)
+            startup_steps = None
+        bus.flush()
+        clock.tick(RENDER_FPS)  # the only wait; 0 doesn't wait at all
+        await end_frame()
 
-        # Async sleep for web compatibility
-        await asyncio.sleep(1.0 / FPS)
+    if simulation is not None:
+        simulation.stop()
+    bus.flush(wait=True)  # the last game messages before the exit summaries
+    if simulation is not None:
+        print(simulation.describe())
+    if recorder is not None:
+        save_replay(recorder, game_manager)
+    if autosaving and game_manager.game_state != "game_over":
+        from save_state import save_game
+        save_game(game_manager, SAVE_FILE)
+
+
+def save_replay(recorder, game_manager):
+    """Write the session's replay to the replay directory"""
+    os.makedirs(REPLAY_DIRECTORY, exist_ok=True)
+    path = os.path.join(REPLAY_DIRECTORY, time.strftime("session-%Y%m%d-%H%M%S.replay"))
+    recorder.save(path, game_manager)
+    print(f"Saved replay to {path} ({recorder.frame} frames)")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Brainrot Evolution 2D")
+    parser.add_argument("--continue", dest="resume", action="store_true",
+                        help=f"pick up the game saved in {SAVE_FILE} (and keep saving it)")
+    parser.add_argument("--threaded", action="store_true", default=SIMULATION_THREAD,
+                        help="run the simulation on a worker thread and draw snapshots of it")
+    parser.add_argument("--record", action="store_true", default=RECORD_REPLAYS,
+                        help=f"save the session as a replay in {REPLAY_DIRECTORY}/ on quit")
+    parser.add_argument("--autosave", action="store_true", default=AUTOSAVE,
+                        help=f"save the game to {SAVE_FILE} while playing and on quit (implied by --continue)")
+    args = parser.parse_args()
+    autosaving = args.autosave or args.resume
+
     # Handle different platforms
     if platform.system() == "Emscripten":
-        # For web deployment
-        asyncio.ensure_future(main())
+        # For web deployment (the browser's event loop runs the game; no threads there)
+        import asyncio
+        asyncio.ensure_future(main(args.resume, threaded=False, record=args.record, autosaving=autosaving,
+                                   end_frame=next_browser_frame))
     else:
         # For desktop
-        asyncio.run(main())
\ No newline at end of file
+        run_on_desktop(main(args.resume, args.threaded, args.record, autosaving))
\ No newline at end of file
@@ -0,0 +1,75 @@
+import random
+import numpy as np
+from game_config import *
+
+PARTICLE_COLORS = (RED, ORANGE)
+PARTICLE_RADIUS = 3
+
+
+class ParticlePool:
+    """Fixed-capacity explosion particles stored in preallocated NumPy arrays
+
+    Live particles occupy slots 0..count-1. Every frame all of them move in one
+    vectorized step, and dead ones are squeezed out by shifting the survivors
+    forward inside the same arrays, so the pool never reallocates.
+    """
+
+    def __init__(self, capacity=PARTICLE_POOL_CAPACITY):
+        self.capacity = capacity
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.vx = np.zeros(capacity, dtype=np.float64)
+        self.vy = np.zeros(capacity, dtype=np.float64)
+        self.lifetime = np.zeros(capacity, dtype=np.int32)
+        self.color_id = np.zeros(capacity, dtype=np.int8)  # index into PARTICLE_COLORS
+
+    def __len__(self):
+        return self.count
+
+    def spawn_explosion(self, x, y, amount=PARTICLES_PER_EXPLOSION):
+        """Scatter particles from a point (extra particles are dropped when the pool is full)"""
+        for _ in range(amount):
+            # Random velocity for scatter effect
+            vx = random.uniform(-2, 2)
+            vy = random.uniform(-2, 2)
+            color_id = random.randrange(len(PARTICLE_COLORS))
+            if self.count == self.capacity:
+                continue
+            slot = self.count
+            self.x[slot], self.y[slot] = x, y
+            self.vx[slot], self.vy[slot] = vx, vy
+            self.lifetime[slot] = PARTICLE_LIFETIME
+            self.color_id[slot] = color_id
+            self.count += 1
+
+    def update(self):
+        """Move all particles, age them, and compact away the dead ones"""
+        n = self.count
+        if n == 0:
+            return
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.lifetime[:n] -= 1
+
+        alive = self.lifetime[:n] > 0
+        if alive.all():
+            return
+        survivors = np.nonzero(alive)[0]
+        kept = len(survivors)
+        for column in (self.x, self.y, self.vx, self.vy, self.lifetime, self.color_id):
+            column[:kept] = column[survivors]
+        self.count = kept
+
+    def snapshot(self):
+        """Copy of the live particles for drawing on another thread"""
+        n = self.count
+        pool = ParticlePool(capacity=n)
+        pool.count = n
+        for name in ("x", "y", "vx", "vy", "lifetime", "color_id"):
+            getattr(pool, name)[:] = getattr(self, name)[:n]
+        return pool
+
+    def clear(self):
+        """Remove every particle"""
+        self.count = 0
@@ -1,4 +1,5 @@
 # pets.py - Complete Pet System
+import copy
 import pygame
 import math
 from game_config import *
@@ -99,6 +100,11 @@ PET_DATA = {
 class Pet:
     """A pet that follows the player and provides stat boosts"""
 
+    __slots__ = ("name", "data", "slot_index", "color", "rect", "target_distance", "bob_timer")
+
+    size = 20
+    follow_speed = 3
+
     def __init__(self, pet_name, slot_index):
         self.name = pet_name
         self.data = PET_DATA[pet_name]
@@ -106,12 +112,10 @@ class Pet:
 
         # Visual properties
         self.color = self.data["color"]
-        self.size = 20
         self.rect = pygame.Rect(0, 0, self.size, self.size)
 
         # Following behavior
         self.target_distance = 40 + (slot_index * 25)  # Different distances for each pet
-        self.follow_speed = 3
         self.bob_timer = 0  # For cute bobbing animation
 
     def update(self, player_pos):
@@ -137,21 +141,15 @@ class Pet:
         # Update bobbing animation
         self.bob_timer += 0.2
 
-    def draw(self, screen):
-        """Draw the pet with cute bobbing animation"""
-        # Calculate bobbing offset
-        bob_offset = math.sin(self.bob_timer) * 3
-        draw_y = self.rect.centery + bob_offset
+    def snapshot(self):
+        """Copy for drawing on another thread while this pet keeps moving"""
+        pet = copy.copy(self)
+        pet.rect = self.rect.copy()
+        return pet
 
-        # Draw pet body (circle)
-        pygame.draw.circle(screen, self.color, (self.rect.centerx, int(draw_y)), self.size // 2)
-
-        # Draw cute eyes
-        eye_color = (0, 0, 0)
-        eye_size = 3
-        eye_offset = self.size // 4
-        pygame.draw.circle(screen, eye_color, (self.rect.centerx - eye_offset, int(draw_y) - 3), eye_size)
-        pygame.draw.circle(screen, eye_color, (self.rect.centerx + eye_offset, int(draw_y) - 3), eye_size)
+    def get_bob_offset(self):
+        """Vertical offset for the cute bobbing animation"""
+        return math.sin(self.bob_timer) * 3
 
     def get_boost_type(self):
         """Return what stat this pet boosts"""
@@ -163,12 +161,10 @@ class Pet:
 
 
 def get_available_pets_for_level(level):
-    """Return list of pet names that are unlocked at this level"""
-    available = []
-    for pet_name, pet_data in PET_DATA.items():
-        if level >= pet_data["unlock_level"]:
-            available.append(pet_name)
-    return available
+    """Return the names of the pets that are unlocked at this level (a tuple; a table lookup)"""
+    if 0 <= level < len(PETS_BY_LEVEL):
+        return PETS_BY_LEVEL[level]
+    return PETS_BY_LEVEL[-1] if level > 0 else PETS_BY_LEVEL[0]
 
 
 def get_pet_cost(pet_name):
@@ -178,4 +174,20 @@ def get_pet_cost(pet_name):
 
 def get_pet_info(pet_name):
     """Return pet information for display"""
-    return PET_DATA[pet_name]
\ No newline at end of file
+    return PET_DATA[pet_name]
+
+
+def rebuild_tables():
+    """Precompute the unlocked pets for every level (call again after changing PET_DATA)
+
+    From the highest unlock level on, every pet is available, so the table stops there.
+    """
+    global PETS_BY_LEVEL
+    last_unlock_level = max(pet_data["unlock_level"] for pet_data in PET_DATA.values())
+    PETS_BY_LEVEL = tuple(
+        tuple(pet_name for pet_name, pet_data in PET_DATA.items() if level >= pet_data["unlock_level"])
+        for level in range(max(0, last_unlock_level) + 1)
+    )
+
+
+rebuild_tables()
@@ -1,20 +1,25 @@
+import copy
 import pygame
-import time
 from game_config import *
+from event_bus import (bus, ExpGained, InvalidPetSlot, LevelUp, PetBought, ShieldActivated,
+                       ShieldBlocked, WinAdded)
 from game_math import calculate_experience_needed, clamp_value
 from evolutions import get_evolution_data
-from pets import Pet, get_available_pets_for_level
 
 
 class Player:
-    def __init__(self):
+    def __init__(self, clock):
+        self.clock = clock  # SimulationClock shared with the GameManager
         self.level = 1
         self.exp = 0
         self.exp_to_next_level = START_EXP_TO_LEVEL
         self.wins = 0  # Track enemy kills for buying pets
 
         # Shield system
-        self._shield_end_time = 0.0  # time.monotonic() when shield ends
+        self._shield_end_time = 0.0  # clock.get_seconds() when shield ends
+
+        # Bumped whenever attack_range changes, so cached aura surfaces can be dropped
+        self.attack_range_version = 0
 
         # Pet system
         self.owned_pets = []  # List of pet names the player owns
@@ -27,6 +32,16 @@ class Player:
         # Position and size - 40x40 collision box (head is visual only)
         self.rect = pygame.Rect(40, 40, 40, 40)
 
+    def snapshot(self, clock):
+        """Copy for drawing on another thread while this player keeps playing (reads the given clock)"""
+        player = copy.copy(self)
+        player.clock = clock
+        player.rect = self.rect.copy()
+        player.owned_pets = tuple(self.owned_pets)
+        player.active_pets = tuple(self.active_pets)
+        player.pet_objects = tuple(None if pet is None else pet.snapshot() for pet in self.pet_objects)
+        return player
+
     def _update_evolution_and_stats(self):
         """Update player appearance AND stats based on current level"""
         evolution_data = get_evolution_data(self.level)
@@ -86,13 +101,16 @@ class Player:
         self.max_health = self.base_max_health * (1 + health_boost)
         self.speed = self.base_speed * (1 + speed_boost)
         self.damage = self.base_damage * (1 + damage_boost)
-        self.attack_range = PLAYER_ATTACK_RANGE * (1 + aura_boost)
+        attack_range = PLAYER_ATTACK_RANGE * (1 + aura_boost)
+        if attack_range != getattr(self, 'attack_range', None):
+            self.attack_range = attack_range
+            self.attack_range_version += 1
         self.regen_rate = (self.base_max_health / 1000) * (1 + regen_boost)
 
     def add_win(self):
         """Increase win counter when player kills an enemy"""
         self.wins += 1
-        print(f"Win! Total wins: {self.wins}")
+        bus.emit(WinAdded, self.wins)
 
     def buy_pet(self, pet_name):
         """Buy a pet if player has enough wins"""
@@ -102,14 +120,14 @@ class Player:
         if self.wins >= cost and pet_name not in self.owned_pets:
             self.wins -= cost
             self.owned_pets.append(pet_name)
-            print(f"Bought {pet_name} for {cost} wins!")
+            bus.emit(PetBought, pet_name, cost)
             return True
         return False
 
     def set_active_pet(self, slot_index, pet_name):
         """Set a pet to be active in the given slot (0, 1, or 2)"""
         if not (0 <= slot_index < 3):
-            print(f"Invalid slot index: {slot_index}")
+            bus.emit(InvalidPetSlot, slot_index)
             return
 
         if pet_name in self.owned_pets or pet_name is None:
@@ -119,6 +137,7 @@ class Player:
 
             # Add new pet if not None
             if pet_name is not None:
+                from pets import Pet
                 new_pet = Pet(pet_name, slot_index)
                 self.pet_objects[slot_index] = new_pet
             else:
@@ -141,6 +160,7 @@ class Player:
 
     def get_available_pets(self):
         """Get list of pets available for purchase at current level"""
+        from pets import get_available_pets_for_level
         return get_available_pets_for_level(self.level)
 
     def can_buy_pet(self, pet_name):
@@ -151,7 +171,7 @@ class Player:
                 pet_name not in self.owned_pets and
                 pet_name in self.get_available_pets())
 
-    def handle_movement(self, keys, walls):
+    def handle_movement(self, keys, wall_grid):
         """Handle player movement with precise collision detection"""
         # Calculate proposed movement
         move_x = 0
@@ -167,7 +187,7 @@ class Player:
 
         # Move horizontally and check for collisions
         self.rect.x += move_x
-        collided_walls = self._get_colliding_walls(walls)
+        collided_walls = self._get_colliding_walls(wall_grid)
         for wall in collided_walls:
             if move_x > 0:  # Moving right; Hit the left side of the wall
                 self.rect.right = wall.rect.left
@@ -176,7 +196,7 @@ class Player:
 
         # Move vertically and check for collisions
         self.rect.y += move_y
-        collided_walls = self._get_colliding_walls(walls)
+        collided_walls = self._get_colliding_walls(wall_grid)
         for wall in collided_walls:
             if move_y > 0:  # Moving down; Hit the top side of the wall
                 self.rect.bottom = wall.rect.top
@@ -187,18 +207,14 @@ class Player:
         self.rect.x = clamp_value(self.rect.x, GAMEPLAY_LEFT, GAMEPLAY_RIGHT - self.rect.width)
         self.rect.y = clamp_value(self.rect.y, 0, SCREEN_HEIGHT - self.rect.height)
 
-    def _get_colliding_walls(self, walls):
+    def _get_colliding_walls(self, wall_grid):
         """Return a list of walls the player is colliding with"""
-        colliding_walls = []
-        for wall in walls:
-            if self.rect.colliderect(wall.rect):
-                colliding_walls.append(wall)
-        return colliding_walls
+        return wall_grid.colliding_walls(self.rect)
 
     def gain_experience(self, amount):
         """Add experience and handle level up"""
         self.exp += amount
-        print(f"Gained {amount} EXP! Total EXP: {self.exp}")
+        bus.emit(ExpGained, amount, self.exp)
 
         while self.exp >= self.exp_to_next_level:
             self._level_up()
@@ -212,14 +228,12 @@ class Player:
         # Update evolution and all stats
         self._update_evolution_and_stats()
 
-        print(f"Leveled up to {self.level}! Evolved to {self.evolution}")
-        print(f"New stats - Damage: {self.damage}, Health: {self.max_health}, Speed: {self.speed}")
-        print(f"Specialty: {self.specialty}")
+        bus.emit(LevelUp, self.level, self.evolution, self.damage, self.max_health, self.speed, self.specialty)
 
     def take_damage(self, amount):
         """Reduce health by damage amount (unless shielded)"""
         if self.has_shield():
-            print(f"Shield blocked {amount} damage! {self.shield_time_remaining():.1f}s remaining")
+            bus.emit(ShieldBlocked, amount, self.shield_time_remaining())
             return
 
         self.health -= amount
@@ -239,15 +253,15 @@ class Player:
 
     def activate_shield(self, duration_seconds: float) -> None:
         """Grant/extend a temporary shield that blocks all damage."""
-        now = time.monotonic()
+        now = self.clock.get_seconds()
         # Stack the shield duration (extend current shield)
         self._shield_end_time = max(self._shield_end_time, now + duration_seconds)
-        print(f"Shield activated for {duration_seconds}s! Total shield time: {self.shield_time_remaining():.1f}s")
+        bus.emit(ShieldActivated, duration_seconds, self.shield_time_remaining())
 
     def has_shield(self) -> bool:
         """True while shield is active."""
-        return time.monotonic() < self._shield_end_time
+        return self.clock.get_seconds() < self._shield_end_time
 
     def shield_time_remaining(self) -> float:
         """Seconds left on the shield timer."""
-        return max(0.0, self._shield_end_time - time.monotonic())
\ No newline at end of file
+        return max(0.0, self._shield_end_time - self.clock.get_seconds())
\ No newline at end of file
@@ -0,0 +1,259 @@
+# Replays - Record a session as its seed plus every input, and play it back exactly
+#
+# File layout (all integers are unsigned LEB128 varints unless noted):
+#   b"BRRP", format version (1 byte), seed, frame count, state checksum (4 bytes, big endian)
+#   then a zlib-compressed record stream. Each record starts with
+#   (frames since the previous record << 2 | record type):
+#     KEYS   new movement key mask (1 byte, see TRACKED_KEYS)
+#     CLICK  button, then x and y as zigzag varints relative to the previous click
+#     KEY    key code of a KEYDOWN
+#     END    the session ended this many frames after the last record
+# Key state is only written when it changes and clicks are delta coded, so a
+# 30 minute session comes to a few kilobytes.
+import random
+import struct
+import zlib
+import pygame
+from game_manager import GameManager
+
+REPLAY_MAGIC = b"BRRP"
+REPLAY_VERSION = 1
+
+RECORD_KEYS = 0
+RECORD_CLICK = 1
+RECORD_KEY = 2
+RECORD_END = 3
+
+# Held keys the game reads each frame (Player.handle_movement), one bit each
+TRACKED_KEYS = (
+    pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s,
+    pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+)
+KEY_BITS = {key: 1 << bit for bit, key in enumerate(TRACKED_KEYS)}
+
+
+class ReplayError(Exception):
+    """A replay file that can't be read"""
+
+
+def _write_varint(buffer, value):
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data, position):
+    value = 0
+    shift = 0
+    while True:
+        if position >= len(data):
+            raise ReplayError("Replay data ends in the middle of a number")
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value):
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def key_mask(keys):
+    """Pack the tracked keys of a pygame.key.get_pressed() result into one byte"""
+    mask = 0
+    for key, bit in KEY_BITS.items():
+        if keys[key]:
+            mask |= bit
+    return mask
+
+
+class ReplayKeys(dict):
+    """Answers keys[pygame.K_...] like pygame.key.get_pressed(), from a recorded key mask"""
+
+    def __init__(self, mask=0):
+        # A plain dict lookup per key; the game asks for 8 keys every frame
+        super().__init__((key, bool(mask & bit)) for key, bit in KEY_BITS.items())
+        self.mask = mask
+
+    def __missing__(self, key):
+        return False
+
+
+def state_checksum(game_manager):
+    """CRC of the game state a replay must reproduce (to detect replays that went out of sync)"""
+    player = game_manager.player
+    enemies = game_manager.enemies
+    state = repr((
+        game_manager.game_state, player.level, player.exp, player.health, player.wins,
+        tuple(player.rect), player.owned_pets, game_manager.clock.frame,
+    )).encode()
+    checksum = zlib.crc32(state)
+    for column in (enemies.x, enemies.y, enemies.health):
+        checksum = zlib.crc32(column[:enemies.count].tobytes(), checksum)
+    return checksum
+
+
+class ReplayRecorder:
+    """Collects the inputs of a session as compact records"""
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.frame = 0  # frames recorded so far
+        self._records = bytearray()
+        self._last_record_frame = 0
+        self._mask = 0
+        self._click = (0, 0)
+
+    def _start_record(self, record_type):
+        _write_varint(self._records, (self.frame - self._last_record_frame) << 2 | record_type)
+        self._last_record_frame = self.frame
+
+    def record_frame(self, keys, events):
+        """Record one frame: the held keys and the events handed to GameManager.handle_input"""
+        for event in events:
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                self._start_record(RECORD_CLICK)
+                x, y = event.pos
+                _write_varint(self._records, event.button)
+                _write_varint(self._records, _zigzag(x - self._click[0]))
+                _write_varint(self._records, _zigzag(y - self._click[1]))
+                self._click = (x, y)
+            elif event.type == pygame.KEYDOWN:
+                self._start_record(RECORD_KEY)
+                _write_varint(self._records, event.key)
+
+        mask = key_mask(keys)
+        if mask != self._mask:
+            self._start_record(RECORD_KEYS)
+            self._records.append(mask)
+            self._mask = mask
+        self.frame += 1
+
+    def to_bytes(self, game_manager=None):
+        """Encode the replay; pass the game to store a checksum of where the session ended"""
+        records = bytearray(self._records)
+        _write_varint(records, (self.frame - self._last_record_frame) << 2 | RECORD_END)
+
+        header = bytearray(REPLAY_MAGIC)
+        header.append(REPLAY_VERSION)
+        _write_varint(header, self.seed)
+        _write_varint(header, self.frame)
+        header += struct.pack(">I", state_checksum(game_manager) if game_manager is not None else 0)
+        return bytes(header) + zlib.compress(bytes(records), 9)
+
+    def save(self, path, game_manager=None):
+        """Write the replay to a file"""
+        with open(path, "wb") as replay_file:
+            replay_file.write(self.to_bytes(game_manager))
+
+
+class Replay:
+    """A decoded replay: the seed plus, per frame, the key mask and input events"""
+
+    def __init__(self, seed, frames, checksum, records):
+        self.seed = seed
+        self.frames = frames
+        self.checksum = checksum  # 0 if the recording didn't store one
+        self.records = records  # list of (frame, record type, value)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decode a replay made by ReplayRecorder.to_bytes()"""
+        if len(data) < 10 or data[:4] != REPLAY_MAGIC:
+            raise ReplayError("Not a replay file")
+        if data[4] != REPLAY_VERSION:
+            raise ReplayError(f"Unsupported replay version {data[4]}")
+        seed, position = _read_varint(data, 5)
+        frames, position = _read_varint(data, position)
+        (checksum,) = struct.unpack_from(">I", data, position)
+        try:
+            stream = zlib.decompress(data[position + 4:])
+        except zlib.error as error:
+            raise ReplayError(f"Corrupt replay data: {error}") from error
+
+        records = []
+        frame = 0
+        click_x = click_y = 0
+        position = 0
+        while True:
+            head, position = _read_varint(stream, position)
+            frame += head >> 2
+            record_type = head & 3
+            if record_type == RECORD_END:
+                break
+            if record_type == RECORD_KEYS:
+                if position >= len(stream):
+                    raise ReplayError("Replay data ends in the middle of a record")
+                records.append((frame, RECORD_KEYS, stream[position]))
+                position += 1
+            elif record_type == RECORD_CLICK:
+                button, position = _read_varint(stream, position)
+                delta_x, position = _read_varint(stream, position)
+                delta_y, position = _read_varint(stream, position)
+                click_x += _unzigzag(delta_x)
+                click_y += _unzigzag(delta_y)
+                records.append((frame, RECORD_CLICK, (button, click_x, click_y)))
+            else:
+                key, position = _read_varint(stream, position)
+                records.append((frame, RECORD_KEY, key))
+        if frame != frames:
+            raise ReplayError(f"Replay says {frames} frames but its records cover {frame}")
+        return cls(seed, frames, checksum, records)
+
+    @classmethod
+    def load(cls, path):
+        """Read a replay file"""
+        with open(path, "rb") as replay_file:
+            return cls.from_bytes(replay_file.read())
+
+    def frames_with_input(self):
+        """Yield (frame, keys, events) for every frame, ready for handle_input/update_game"""
+        keys = ReplayKeys()
+        records = self.records
+        index = 0
+        for frame in range(self.frames):
+            events = []
+            while index < len(records) and records[index][0] == frame:
+                _, record_type, value = records[index]
+                index += 1
+                if record_type == RECORD_CLICK:
+                    button, x, y = value
+                    events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(x, y), button=button))
+                elif record_type == RECORD_KEY:
+                    events.append(pygame.event.Event(pygame.KEYDOWN, key=value))
+                else:
+                    keys = ReplayKeys(value)  # held from this frame's update on
+            yield frame, keys, events
+
+
+def play_replay(replay, game_manager=None, on_frame=None):
+    """Run a replay through the normal input/update path as fast as possible
+
+    Returns the GameManager at the end of the replay. on_frame(frame,
+    game_manager) is called after every update, e.g. to draw.
+    """
+    random.seed(replay.seed)
+    if game_manager is None:
+        game_manager = GameManager()
+    else:
+        game_manager.reset_game()
+
+    for frame, keys, events in replay.frames_with_input():
+        for event in events:
+            game_manager.handle_input(event)
+        game_manager.update_game(keys)
+        if on_frame is not None:
+            on_frame(frame, game_manager)
+    return game_manager
+
+
+def replay_matches(replay, game_manager):
+    """True if a finished playback ended in the recorded state (or no checksum was recorded)"""
+    return replay.checksum == 0 or replay.checksum == state_checksum(game_manager)
@@ -0,0 +1,244 @@
+# Save States - Snapshot a running game to bytes and restore it later
+#
+# Example:
+#   data = save_state(game_manager)       # e.g. for autosave
+#   load_state(game_manager, data)        # back to exactly that frame
+#   save_game(game_manager, "savegame.sav") / load_game(game_manager, "savegame.sav")
+#
+# File layout (little endian, see the struct formats below):
+#   b"BRSV", format version (1 byte)
+#   random module state, game manager fields, player, pets,
+#   enemy columns (raw NumPy bytes, one block per EnemyStore column),
+#   pickups, particles (raw NumPy bytes)
+# Everything derived from these (stats, evolution, flow field, walls) is
+# rebuilt on load instead of stored. No pickle: loading a file never runs code.
+import os
+import random
+import struct
+import numpy as np
+from game_config import *
+from player import Player
+from pets import Pet, PET_DATA
+from enemies import Enemy, Boss
+from enemy_store import ENEMY_FIELDS
+from golden_apple import GoldenApple
+from shield_fruit import ShieldFruit
+from spatial_index import SpatialHash
+
+SAVE_MAGIC = b"BRSV"
+SAVE_VERSION = 2
+
+GAME_STATES = ("playing", "game_over", "pet_shop", "pet_selection")
+PICKUP_TYPES = (GoldenApple, ShieldFruit)
+
+HEADER = struct.Struct("<4sB")
+RANDOM_STATE = struct.Struct("<625I?d")  # Mersenne Twister words + index, cached gauss
+GAME = struct.Struct("<Bq3q?")  # state, clock frame, spawn timers, confirm_purchase
+PLAYER = struct.Struct("<qqqq")  # level, wins, rect x, rect y
+NUMBER = struct.Struct("<?d")  # is_int, value (keeps ints ints, so printed stats don't change)
+PET = struct.Struct("<qqd")  # rect x, rect y, bob timer
+COUNT = struct.Struct("<I")
+PICKUP = struct.Struct("<Bqq")  # type, rect x, rect y
+PARTICLE_COLUMNS = (("x", "<f8"), ("y", "<f8"), ("vx", "<f8"), ("vy", "<f8"),
+                    ("lifetime", "<i4"), ("color_id", "i1"))
+
+
+class SaveError(Exception):
+    """A save file that can't be loaded"""
+
+
+def _pack_number(buffer, value):
+    buffer += NUMBER.pack(isinstance(value, int), value)
+
+
+def _pack_string(buffer, text):
+    if text is None:
+        buffer.append(0xFF)  # longer than any name we store
+        return
+    encoded = text.encode()
+    buffer.append(len(encoded))
+    buffer += encoded
+
+
+def _pack_column(buffer, column, count, dtype):
+    buffer += np.ascontiguousarray(column[:count], dtype=dtype).tobytes()
+
+
+class _Reader:
+    """Walks through save data, turning truncated data into SaveError"""
+
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.position = 0
+
+    def take(self, size):
+        if self.position + size > len(self.data):
+            raise SaveError("Save data ends too early")
+        chunk = self.data[self.position:self.position + size]
+        self.position += size
+        return chunk
+
+    def unpack(self, layout):
+        return layout.unpack(self.take(layout.size))
+
+    def number(self):
+        is_int, value = self.unpack(NUMBER)
+        return int(value) if is_int else value
+
+    def string(self):
+        length = self.take(1)[0]
+        if length == 0xFF:
+            return None
+        return bytes(self.take(length)).decode()
+
+    def pet_name(self):
+        name = self.string()
+        if name is not None and name not in PET_DATA:
+            raise SaveError(f"Unknown pet {name!r}")
+        return name
+
+    def column(self, count, dtype):
+        dtype = np.dtype(dtype)
+        return np.frombuffer(self.take(count * dtype.itemsize), dtype=dtype)
+
+
+def save_state(game_manager):
+    """Snapshot the complete game state as bytes"""
+    buffer = bytearray(HEADER.pack(SAVE_MAGIC, SAVE_VERSION))
+
+    _, words, gauss_next = random.getstate()
+    buffer += RANDOM_STATE.pack(*words, gauss_next is not None, gauss_next or 0.0)
+
+    buffer += GAME.pack(GAME_STATES.index(game_manager.game_state), game_manager.clock.frame,
+                        game_manager.enemy_spawn_timer, game_manager.enemies_spawned_since_last_boss,
+                        game_manager.apple_spawn_timer, game_manager.confirm_purchase)
+    _pack_string(buffer, game_manager.selected_pet_info)
+
+    player = game_manager.player
+    buffer += PLAYER.pack(player.level, player.wins, player.rect.x, player.rect.y)
+    for value in (player.exp, player.exp_to_next_level, player.health, player._shield_end_time):
+        _pack_number(buffer, value)
+    buffer += COUNT.pack(len(player.owned_pets))
+    for name in player.owned_pets:
+        _pack_string(buffer, name)
+    for pet in player.pet_objects:
+        _pack_string(buffer, pet.name if pet is not None else None)
+        if pet is not None:
+            buffer += PET.pack(pet.rect.x, pet.rect.y, pet.bob_timer)
+
+    enemies = game_manager.enemies
+    count = enemies.count
+    buffer += COUNT.pack(count)
+    for name, dtype in ENEMY_FIELDS:
+        _pack_column(buffer, getattr(enemies, name), count, np.dtype(dtype).newbyteorder("<"))
+    # Click priority among overlapping enemies follows spatial hash insertion order
+    index = enemies.index
+    order = np.array([index.cells[index.entries[enemy]][enemy] for enemy in enemies.views], dtype=np.int64)
+    _pack_column(buffer, np.argsort(np.argsort(order)), count, "<i8")  # as ranks 0..count-1
+
+    buffer += COUNT.pack(len(game_manager.golden_apples))
+    for pickup in game_manager.golden_apples:
+        buffer += PICKUP.pack(PICKUP_TYPES.index(type(pickup)), pickup.rect.x, pickup.rect.y)
+
+    particles = game_manager.particles
+    buffer += COUNT.pack(particles.count)
+    for name, dtype in PARTICLE_COLUMNS:
+        _pack_column(buffer, getattr(particles, name), particles.count, dtype)
+    return bytes(buffer)
+
+
+def load_state(game_manager, data):
+    """Put a game back into the state captured by save_state()
+
+    Raises SaveError without touching the game if the data can't be read.
+    """
+    reader = _Reader(data)
+    try:
+        magic, version = reader.unpack(HEADER)
+    except SaveError:
+        raise SaveError("Not a save file") from None
+    if magic != SAVE_MAGIC:
+        raise SaveError("Not a save file")
+    if version != SAVE_VERSION:
+        raise SaveError(f"Unsupported save version {version}")
+
+    try:
+        *words, has_gauss, gauss_next = reader.unpack(RANDOM_STATE)
+        random_state = (3, tuple(words), gauss_next if has_gauss else None)
+
+        state_index, frame, enemy_spawn_timer, since_boss, apple_spawn_timer, confirm = reader.unpack(GAME)
+        game_state = GAME_STATES[state_index]
+        selected_pet_info = reader.pet_name()
+
+        player = Player(game_manager.clock)
+        player.level, player.wins, x, y = reader.unpack(PLAYER)
+        exp, exp_to_next_level, health, shield_end_time = (reader.number() for _ in range(4))
+        player.owned_pets = [reader.pet_name() for _ in range(reader.unpack(COUNT)[0])]
+        for slot in range(len(player.pet_objects)):
+            name = reader.pet_name()
+            if name is not None:
+                pet = Pet(name, slot)
+                pet.rect.x, pet.rect.y, pet.bob_timer = reader.unpack(PET)
+                player.pet_objects[slot] = pet
+        player._update_evolution_and_stats()  # stats and looks come from level and pets
+        player.exp, player.exp_to_next_level = exp, exp_to_next_level
+        player.health, player._shield_end_time = health, shield_end_time
+        player.rect.topleft = (x, y)
+        # Make sure a renderer's cached aura isn't mistaken for this player's
+        player.attack_range_version = game_manager.player.attack_range_version + 1
+
+        (count,) = reader.unpack(COUNT)
+        enemy_columns = [reader.column(count, np.dtype(dtype).newbyteorder("<")) for _, dtype in ENEMY_FIELDS]
+        order = reader.column(count, "<i8").astype(np.int64)
+
+        pickups = SpatialHash()
+        pickup_list, pickup_cells = [], []
+        for _ in range(reader.unpack(COUNT)[0]):
+            kind, x, y = reader.unpack(PICKUP)
+            pickup_list.append(PICKUP_TYPES[kind](position=(x, y)))
+            pickup_cells.append(pickups.cell_of(x, y))
+        pickups.insert_many(pickup_list, pickup_cells)
+
+        (particle_count,) = reader.unpack(COUNT)
+        particle_columns = [reader.column(particle_count, dtype) for _, dtype in PARTICLE_COLUMNS]
+        if reader.position != len(reader.data):
+            raise SaveError(f"Save data has {len(reader.data) - reader.position} bytes past the end")
+    except (IndexError, UnicodeDecodeError) as error:
+        raise SaveError(f"Corrupt save data: {error}") from error
+    if particle_count > game_manager.particles.capacity:
+        raise SaveError("Save has more particles than the particle pool holds")
+
+    # Everything read fine; swap the new state in
+    random.setstate(random_state)
+    game_manager.game_state = game_state
+    game_manager.clock.frame = frame
+    game_manager.enemy_spawn_timer = enemy_spawn_timer
+    game_manager.enemies_spawned_since_last_boss = since_boss
+    game_manager.apple_spawn_timer = apple_spawn_timer
+    game_manager.selected_pet_info = selected_pet_info
+    game_manager.confirm_purchase = confirm
+    game_manager.player = player
+    game_manager.enemies.replace_all(enemy_columns, order, (Enemy, Boss))  # reuses the store and its views
+    game_manager.golden_apples = pickups
+    particles = game_manager.particles
+    particles.count = particle_count
+    for (name, _), column in zip(PARTICLE_COLUMNS, particle_columns):
+        getattr(particles, name)[:particle_count] = column
+    game_manager.flow_field.reset()
+    game_manager.boss_flow_field.reset()
+    if game_manager.renderer is not None and game_manager.renderer.dirty_rects is not None:
+        game_manager.renderer.dirty_rects.mark_all()
+
+
+def save_game(game_manager, path):
+    """Write a save file (via a temporary file, so a crash mid-write keeps the old save)"""
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as save_file:
+        save_file.write(save_state(game_manager))
+    os.replace(temporary_path, path)
+
+
+def load_game(game_manager, path):
+    """Load a save file written by save_game()"""
+    with open(path, "rb") as save_file:
+        load_state(game_manager, save_file.read())
@@ -6,19 +6,24 @@ from game_math import calculate_distance
 class ShieldFruit:
     """A collectible shield fruit that gives temporary damage immunity"""
 
-    def __init__(self):
-        # Generate random spawn position within the gameplay area only
+    __slots__ = ("rect",)
+
+    # Shield fruit properties (the same for every fruit)
+    color = (80, 180, 255)  # Light blue
+    outline_color = (0, 100, 255)  # Darker blue outline
+    shield_duration = 10.0  # 10 seconds of immunity
+    name = "Shield Fruit"
+
+    def __init__(self, position=None):
+        # Generate random spawn position within the gameplay area only (unless given one)
         import random
-        x = random.randint(GAMEPLAY_LEFT + 20, GAMEPLAY_RIGHT - 50)
-        y = random.randint(50, SCREEN_HEIGHT - 80)  # Y-axis is fine
+        if position is None:
+            x = random.randint(GAMEPLAY_LEFT + 20, GAMEPLAY_RIGHT - 50)
+            y = random.randint(50, SCREEN_HEIGHT - 80)  # Y-axis is fine
+        else:
+            x, y = position
         self.rect = pygame.Rect(x, y, 30, 30)  # Same size as golden apple
 
-        # Shield fruit properties
-        self.color = (80, 180, 255)  # Light blue
-        self.outline_color = (0, 100, 255)  # Darker blue outline
-        self.shield_duration = 10.0  # 10 seconds of immunity
-        self.name = "Shield Fruit"
-
     def is_clicked_by_player(self, mouse_pos, player):
         """Check if fruit was clicked and is within player's attack range"""
         if not self.rect.collidepoint(mouse_pos):
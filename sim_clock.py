@@ -0,0 +1,35 @@
+from game_config import FPS
+
+
+class SimulationClock:
+    """Game-time clock that advances one step per simulated frame
+
+    Timers read this instead of the wall clock, so cooldowns and shields
+    behave the same whether the game runs at 60 FPS or 10,000 FPS headless.
+    """
+
+    def __init__(self, fps=FPS):
+        self.fps = fps
+        self.frame = 0
+
+    def tick(self):
+        """Advance the clock by one simulation frame"""
+        self.frame += 1
+
+    def copy(self):
+        """A separate clock stopped at the same frame"""
+        clock = SimulationClock(self.fps)
+        clock.frame = self.frame
+        return clock
+
+    def reset(self):
+        """Rewind the clock to the start of a game"""
+        self.frame = 0
+
+    def get_ticks(self):
+        """Elapsed game time in milliseconds (drop-in for pygame.time.get_ticks)"""
+        return self.frame * 1000 // self.fps
+
+    def get_seconds(self):
+        """Elapsed game time in seconds (drop-in for time.monotonic)"""
+        return self.frame / self.fps
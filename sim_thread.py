@@ -0,0 +1,140 @@
+# Simulation Thread - Game ticks on a worker thread, drawing from snapshots on the main thread
+#
+# Example:
+#   simulation = SimulationThread(GameManager(), pygame.key.get_pressed())
+#   simulation.start()
+#   while running:
+#       simulation.send_input(pygame.key.get_pressed(), events)   # handled before the next tick
+#       alpha = simulation.show_latest(render_game)               # a GameManager with a screen
+#       render_game.draw_game(alpha)
+#   simulation.stop()
+#
+# The worker owns its GameManager; nothing on the main thread touches it while
+# the thread runs (use run_between_ticks() for that). After every tick the
+# worker copies what drawing needs into a GameSnapshot and publishes it by
+# swapping one reference, so the main thread always draws a complete tick
+# while the next one is being filled in. Published snapshots never change.
+# Game messages the worker emits wait on the event bus for the main thread's
+# bus.flush(), so subscribers are always called on the main thread.
+#
+# Threads share the GIL: pure-Python drawing can still hold a tick back for
+# a few milliseconds (the interpreter's switch interval), but a slow frame
+# no longer holds back whole ticks.
+import threading
+import time
+from collections import deque
+import numpy as np
+from game_config import FPS, MAX_TICKS_PER_FRAME, PROFILER_HISTORY
+from frame_profiler import PERCENTILES
+
+
+class SimulationThread:
+    """Ticks a headless GameManager at FPS on a worker thread and publishes GameSnapshots"""
+
+    def __init__(self, game_manager, keys, recorder=None):
+        self.game_manager = game_manager
+        game_manager.track_previous_positions = True  # snapshots carry them for interpolation
+        self.recorder = recorder  # ReplayRecorder fed every tick, or None
+        self.error = None  # exception that stopped the worker
+        self.dropped_ticks = 0  # ticks skipped after falling too far behind
+        # Milliseconds per tick / snapshot (worker side) and between drawn frames (main side)
+        self.timings = {name: deque(maxlen=PROFILER_HISTORY) for name in ("tick", "snapshot", "frame")}
+
+        self._lock = threading.Lock()
+        self._keys = keys
+        self._events = []  # input events for the next tick
+        self._tasks = []  # functions to call with the GameManager between ticks
+        self._latest = (game_manager.take_snapshot(), time.perf_counter())  # (snapshot, published at)
+        self._last_shown = None
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """Finish the current tick and stop; the GameManager belongs to the caller again"""
+        self._stopping.set()
+        self._thread.join()
+
+    def send_input(self, keys, events):
+        """Hand over the held keys and new input events; they're used from the next tick on"""
+        if self.error is not None:
+            raise RuntimeError("The simulation thread stopped") from self.error
+        with self._lock:
+            self._keys = keys
+            self._events.extend(events)
+
+    def run_between_ticks(self, task):
+        """Call task(game_manager) on the worker before its next tick (e.g. to save the game)"""
+        with self._lock:
+            self._tasks.append(task)
+
+    def show_latest(self, render_game):
+        """Point a drawing-only GameManager at the newest snapshot
+
+        Returns how far (0-1) real time has got from that tick towards the
+        next one, to pass on to draw_game().
+        """
+        snapshot, published = self._latest
+        render_game.show_snapshot(snapshot)
+        now = time.perf_counter()
+        if self._last_shown is not None:
+            self.timings["frame"].append((now - self._last_shown) * 1000)
+        self._last_shown = now
+        return min(1.0, (now - published) * FPS)
+
+    def stats(self):
+        """{"tick" / "snapshot" / "frame": {"p50": ms, "p95": ms, "p99": ms}} over the recent history"""
+        result = {}
+        for name, values in self.timings.items():
+            if values:
+                p50, p95, p99 = np.percentile(np.array(values), PERCENTILES)
+                result[name] = {"p50": float(p50), "p95": float(p95), "p99": float(p99)}
+        return result
+
+    def describe(self):
+        """One line summary of stats() for the console"""
+        parts = [f"{name} p50 {stats['p50']:.2f} ms (p99 {stats['p99']:.2f})" for name, stats in self.stats().items()]
+        return f"Simulation thread: {', '.join(parts)}, {self.dropped_ticks} ticks dropped"
+
+    def _run(self):
+        try:
+            tick_seconds = 1.0 / FPS
+            next_tick = time.perf_counter()
+            while not self._stopping.is_set():
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    self._stopping.wait(delay)
+                    continue
+                if -delay > MAX_TICKS_PER_FRAME * tick_seconds:
+                    # Too far behind (e.g. the machine slept): drop the lost time
+                    self.dropped_ticks += int(-delay / tick_seconds)
+                    next_tick = time.perf_counter()
+                self._tick()
+                next_tick += tick_seconds
+        except BaseException as error:
+            self.error = error
+            raise
+
+    def _tick(self):
+        with self._lock:
+            keys, events, tasks = self._keys, self._events, self._tasks
+            self._events, self._tasks = [], []
+        game_manager = self.game_manager
+        for task in tasks:
+            task(game_manager)
+
+        started = time.perf_counter()
+        for event in events:
+            game_manager.handle_input(event)
+        if self.recorder is not None:
+            self.recorder.record_frame(keys, events)
+        game_manager.update_game(keys)
+        ticked = time.perf_counter()
+        snapshot = game_manager.take_snapshot()
+        published = time.perf_counter()
+        self._latest = (snapshot, published)  # one reference swap: the main thread sees all of it or none
+
+        self.timings["tick"].append((ticked - started) * 1000)
+        self.timings["snapshot"].append((published - ticked) * 1000)
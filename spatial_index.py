@@ -0,0 +1,105 @@
+import numpy as np
+from game_config import HIT_GRID_CELL_SIZE
+
+
+class SpatialHash:
+    """Buckets moving entities by grid cell for constant-time point queries
+
+    Each entity is filed under the cell holding the top-left corner of its
+    rect. Entities are never bigger than a cell, so a point can only be
+    covered by entities filed in its own cell or the cells up and to the
+    left of it. Inserting, moving and removing are all O(1).
+
+    Iterating the hash yields entities in insertion order, so it can stand in
+    for the plain lists the game used to keep.
+    """
+
+    def __init__(self, cell_size=HIT_GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> {entity: insertion order}
+        self.entries = {}  # entity -> (column, row)
+        self._next_order = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(list(self.entries))
+
+    def __contains__(self, entity):
+        return entity in self.entries
+
+    def cell_of(self, x, y):
+        """Grid cell containing a point"""
+        return x // self.cell_size, y // self.cell_size
+
+    def insert(self, entity, x, y):
+        """Add an entity whose rect's top-left corner is at (x, y)"""
+        self.move_to_cell(entity, self.cell_of(x, y))
+
+    def insert_many(self, entities, cells):
+        """Add new entities at precomputed cells, oldest first (bulk version of insert)"""
+        order = self._next_order
+        for entity, cell in zip(entities, cells):
+            self.cells.setdefault(cell, {})[entity] = order
+            self.entries[entity] = cell
+            order += 1
+        self._next_order = order
+
+    def replace_all(self, entities, columns, rows, orders):
+        """Replace the contents with entities at precomputed cells and insertion orders
+
+        columns, rows and orders are NumPy arrays parallel to the entities
+        list; one argsort puts everything oldest first, so each cell is
+        filled in order without comparing orders in Python.
+        """
+        oldest_first = np.argsort(orders, kind="stable")
+        entities = [entities[index] for index in oldest_first.tolist()]
+        entity_cells = list(zip(columns[oldest_first].tolist(), rows[oldest_first].tolist()))
+        orders = orders[oldest_first].tolist()
+        self.entries = dict(zip(entities, entity_cells))
+        cells = {}
+        for entity, cell, order in zip(entities, entity_cells, orders):
+            bucket = cells.get(cell)
+            if bucket is None:
+                cells[cell] = bucket = {}
+            bucket[entity] = order
+        self.cells = cells
+        self._next_order = orders[-1] + 1 if orders else 0
+
+    def move(self, entity, x, y):
+        """Update an entity after its rect moved (adds it if it isn't indexed yet)"""
+        self.move_to_cell(entity, self.cell_of(x, y))
+
+    def move_to_cell(self, entity, cell):
+        """File an entity under a precomputed cell"""
+        old_cell = self.entries.get(entity)
+        if old_cell == cell:
+            return
+        if old_cell is None:
+            order = self._next_order
+            self._next_order += 1
+        else:
+            order = self.cells[old_cell].pop(entity)
+            if not self.cells[old_cell]:
+                del self.cells[old_cell]
+        self.cells.setdefault(cell, {})[entity] = order
+        self.entries[entity] = cell
+
+    def remove(self, entity):
+        """Remove an entity from the index"""
+        cell = self.entries.pop(entity)
+        del self.cells[cell][entity]
+        if not self.cells[cell]:
+            del self.cells[cell]
+
+    def query_point(self, point):
+        """Entities whose rect contains the point, oldest first"""
+        column, row = self.cell_of(point[0], point[1])
+        found = []
+        for cell in ((column - 1, row - 1), (column, row - 1), (column - 1, row), (column, row)):
+            for entity, order in self.cells.get(cell, {}).items():
+                if entity.rect.collidepoint(point):
+                    found.append((order, entity))
+        found.sort(key=lambda item: item[0])
+        return [entity for _, entity in found]
@@ -0,0 +1,194 @@
+import pygame
+from game_config import *
+
+# Room around an entity on the scratch surface while baking (names stick out a lot)
+BAKE_MARGIN = 200
+
+
+class SpriteCache:
+    """Bakes each entity appearance into a surface on first use
+
+    Entities only come in a handful of looks (100 enemy part combinations, the
+    boss, 20 evolutions, 11 pets and two pickups), so every look is drawn from
+    primitives once and afterwards drawing an entity is a single blit.
+
+    Each cached sprite is stored with the offset of the entity's rect inside
+    it, because accessories and labels stick out past the collision box.
+    """
+
+    def __init__(self, text_cache):
+        self.text_cache = text_cache
+        self._sprites = {}  # appearance key -> (surface, (offset_x, offset_y))
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def _get(self, key, rect_size, draw):
+        """Return the sprite for a key, baking it with draw(surface, rect) if needed"""
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = self._bake(rect_size, draw)
+            self._sprites[key] = sprite
+        return sprite
+
+    def _bake(self, rect_size, draw):
+        """Draw onto a scratch surface and crop it to the area that was touched"""
+        width, height = rect_size
+        scratch = pygame.Surface((width + BAKE_MARGIN * 2, height + BAKE_MARGIN * 2), pygame.SRCALPHA)
+        rect = pygame.Rect(BAKE_MARGIN, BAKE_MARGIN, width, height)
+        touched = draw(scratch, rect)
+        bounds = touched[0].unionall(touched[1:]).clip(scratch.get_rect())
+        return scratch.subsurface(bounds).copy(), (rect.x - bounds.x, rect.y - bounds.y)
+
+    def enemy(self, enemy, rect):
+        """Sprite for an enemy or boss: body, head, accessory and name"""
+        key = ("enemy", enemy.name, enemy.is_boss, rect.size)
+        return self._get(key, rect.size, lambda surface, local_rect: self._draw_enemy(surface, local_rect, enemy))
+
+    def player(self, player):
+        """Sprite for the player's current evolution (aura and shield ring are drawn live)"""
+        key = ("player", player.body_color, player.head_color, player.rect.size)
+        return self._get(key, player.rect.size, lambda surface, rect: _draw_player(surface, rect, player))
+
+    def pet(self, pet):
+        """Sprite for a pet (the bobbing offset is applied when blitting)"""
+        key = ("pet", pet.color, pet.size)
+        return self._get(key, pet.rect.size, lambda surface, rect: _draw_pet(surface, rect, pet))
+
+    def golden_apple(self, apple):
+        """Sprite for a golden apple including its EXP label"""
+        key = ("golden_apple", apple.color, apple.outline_color, apple.exp_value, apple.rect.size)
+        return self._get(key, apple.rect.size, lambda surface, rect: self._draw_golden_apple(surface, rect, apple))
+
+    def shield_fruit(self, shield_fruit):
+        """Sprite for a shield fruit"""
+        color = getattr(shield_fruit, "color", (80, 200, 255))  # default cyan-ish
+        outline = getattr(shield_fruit, "outline_color", (40, 120, 200))
+        key = ("shield_fruit", color, outline, shield_fruit.rect.size)
+        return self._get(key, shield_fruit.rect.size,
+                         lambda surface, rect: _draw_shield_fruit(surface, rect, color, outline))
+
+    def _draw_enemy(self, surface, rect, enemy):
+        """Draw enemy with all its parts"""
+        # Draw enemy body
+        touched = [pygame.draw.rect(surface, enemy.body_color, rect)]
+
+        # Draw enemy head
+        head_pos = (rect.centerx, rect.top + 10)
+        head_radius = 20 if enemy.is_boss else 12
+        touched.append(pygame.draw.circle(surface, enemy.head_color, head_pos, head_radius))
+
+        # Draw enemy accessory
+        touched.extend(_draw_enemy_accessory(surface, rect, enemy.accessory, enemy.accessory_color))
+
+        # Draw enemy name
+        name_text = self.text_cache.render(enemy.name, BLACK)
+        touched.append(surface.blit(name_text, (rect.x - 10, rect.y - 20)))
+        return touched
+
+    def _draw_golden_apple(self, surface, rect, apple):
+        """Draw a golden apple collectible"""
+        # Draw apple body (golden circle)
+        touched = [pygame.draw.circle(surface, apple.color, rect.center, rect.width // 2)]
+
+        # Draw apple outline for better visibility
+        touched.append(pygame.draw.circle(surface, apple.outline_color, rect.center, rect.width // 2, 2))
+
+        # Draw apple stem (small brown line on top)
+        stem_start = (rect.centerx, rect.top + 5)
+        stem_end = (rect.centerx, rect.top)
+        touched.append(pygame.draw.line(surface, BROWN, stem_start, stem_end, 2))
+
+        # Draw apple leaf (small green triangle)
+        leaf_points = [
+            (rect.centerx + 3, rect.top + 2),
+            (rect.centerx + 8, rect.top - 2),
+            (rect.centerx + 5, rect.top + 5)
+        ]
+        touched.append(pygame.draw.polygon(surface, GREEN, leaf_points))
+
+        # Draw EXP value text above apple
+        exp_text = self.text_cache.render(f"+{apple.exp_value} EXP", BLACK)
+        text_rect = exp_text.get_rect(center=(rect.centerx, rect.top - 15))
+        touched.append(surface.blit(exp_text, text_rect))
+        return touched
+
+
+def _draw_enemy_accessory(surface, rect, accessory, accessory_color):
+    """Draw the enemy's accessory based on type"""
+    if accessory == "Hat":
+        points = [
+            (rect.centerx - 15, rect.top),
+            (rect.centerx + 15, rect.top),
+            (rect.centerx, rect.top - 15)
+        ]
+        return [pygame.draw.polygon(surface, accessory_color, points)]
+
+    elif accessory == "Sword":
+        return [pygame.draw.line(
+            surface,
+            accessory_color,
+            (rect.right, rect.centery),
+            (rect.right + 20, rect.centery + 10),
+            3
+        )]
+
+    elif accessory == "Cape":
+        points = [
+            (rect.left, rect.bottom),
+            (rect.right, rect.bottom),
+            (rect.centerx, rect.bottom + 20)
+        ]
+        return [pygame.draw.polygon(surface, accessory_color, points)]
+
+    elif accessory == "Glasses":
+        return [
+            pygame.draw.circle(surface, accessory_color, (rect.centerx - 5, rect.top + 10), 3),
+            pygame.draw.circle(surface, accessory_color, (rect.centerx + 5, rect.top + 10), 3),
+        ]
+
+    return []
+
+
+def _draw_player(surface, rect, player):
+    """Draw player body and head"""
+    touched = [pygame.draw.rect(surface, player.body_color, rect)]
+    head_pos = (rect.centerx, rect.top + 10)
+    touched.append(pygame.draw.circle(surface, player.head_color, head_pos, 15))
+    return touched
+
+
+def _draw_pet(surface, rect, pet):
+    """Draw the pet's body and cute eyes"""
+    # Draw pet body (circle)
+    touched = [pygame.draw.circle(surface, pet.color, rect.center, pet.size // 2)]
+
+    # Draw cute eyes
+    eye_color = (0, 0, 0)
+    eye_size = 3
+    eye_offset = pet.size // 4
+    touched.append(pygame.draw.circle(surface, eye_color, (rect.centerx - eye_offset, rect.centery - 3), eye_size))
+    touched.append(pygame.draw.circle(surface, eye_color, (rect.centerx + eye_offset, rect.centery - 3), eye_size))
+    return touched
+
+
+def _draw_shield_fruit(surface, rect, color, outline):
+    """Draw a shield fruit collectible"""
+    # Draw body (circle based on rect)
+    center = (rect.centerx, rect.centery)
+    radius = min(rect.width, rect.height) // 2
+    touched = [pygame.draw.circle(surface, color, center, radius)]
+    touched.append(pygame.draw.circle(surface, outline, center, radius, width=2))
+
+    # Optional: a simple shield emblem
+    emblem_w = int(radius * 1.1)
+    emblem_h = int(radius * 1.2)
+    emblem_rect = pygame.Rect(0, 0, emblem_w, emblem_h)
+    emblem_rect.center = center
+    # Shield shape: top arc + bottom point
+    top = (emblem_rect.centerx, emblem_rect.top)
+    left = (emblem_rect.left, emblem_rect.top + emblem_h // 3)
+    right = (emblem_rect.right, emblem_rect.top + emblem_h // 3)
+    bottom = (emblem_rect.centerx, emblem_rect.bottom)
+    touched.append(pygame.draw.polygon(surface, (255, 255, 255), [top, right, bottom, left], width=2))
+    return touched
@@ -0,0 +1,20 @@
+import os
+import sys
+import pytest
+
+# The game modules live at the top of the repository, next to this directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from game_config import CONSOLE_LOG_LEVEL  # noqa: E402
+from event_bus import bus  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def quiet_bus():
+    """Keep game messages out of the test output"""
+    bus.set_console_level(None)
+    yield
+    bus.clear()
+    bus.set_console_level(CONSOLE_LOG_LEVEL)
@@ -0,0 +1,85 @@
+import random
+import pygame
+from game_manager import GameManager
+from enemies import Enemy, Boss
+from enemy_store import EnemyStore, ENEMY_FIELDS
+from sim_clock import SimulationClock
+
+
+def _row(store, slot):
+    return {name: getattr(store, name)[slot].item() for name, _ in ENEMY_FIELDS}
+
+
+def _check_store(store, expected):
+    """Every live enemy sits in its own slot with its own values and is filed under its corner's cell"""
+    assert store.count == len(store.views) == len(store.index) == len(expected)
+    for slot, enemy in enumerate(store.views):
+        assert enemy._slot == slot
+        assert _row(store, slot) == expected[enemy]
+        assert store.index.entries[enemy] == store.index.cell_of(enemy.rect.x, enemy.rect.y)
+
+
+def test_add_remove_reindex_round_trip():
+    random.seed(1)
+    store = EnemyStore(SimulationClock(), capacity=4)  # small, so adding has to grow it
+    expected = {}
+    for index in range(200):
+        enemy = (Boss if index % 7 == 6 else Enemy)(store, player_level=index % 5 + 1)
+        expected[enemy] = _row(store, enemy._slot)
+    _check_store(store, expected)
+
+    rng = random.Random(2)
+    for _ in range(120):
+        enemy = rng.choice(store.views)
+        values, name, rect = expected.pop(enemy), enemy.name, enemy.rect
+        store.remove(enemy)
+        # A removed enemy keeps its last values (callers still read them), detached from the store
+        assert (enemy.name, enemy.rect, enemy.health) == (name, rect, values["health"])
+        assert enemy not in store.index
+
+        survivor = rng.choice(store.views)
+        survivor.rect = pygame.Rect(rng.randrange(-50, 1200), rng.randrange(-50, 700), survivor.rect.width,
+                                    survivor.rect.height)
+        expected[survivor] = _row(store, survivor._slot)
+        assert (expected[survivor]["x"], expected[survivor]["y"]) == survivor.rect.topleft
+    _check_store(store, expected)
+
+    for _ in range(50):  # refill the freed slots
+        enemy = Enemy(store)
+        expected[enemy] = _row(store, enemy._slot)
+    _check_store(store, expected)
+
+
+def test_removed_enemy_stays_readable_after_its_slot_is_reused():
+    random.seed(3)
+    store = EnemyStore(SimulationClock())
+    first, second = Enemy(store), Boss(store)
+    name, rect = first.name, first.rect
+    store.remove(first)
+    Enemy(store)  # writes over the row the removed enemy was copied out of
+    assert (first.name, first.rect) == (name, rect)
+    assert second._slot == 0 and second.is_boss
+
+
+def test_vectorized_movement_matches_one_enemy_at_a_time():
+    games = []
+    for _ in range(2):
+        random.seed(4)
+        game = GameManager()
+        for index in range(60):
+            (Boss if index % 10 == 9 else Enemy)(game.enemies)
+        games.append(game)
+    vectorized, scalar = games
+    for tick in range(200):
+        for game in games:
+            game.clock.tick()
+            game.flow_field.update(game.player.rect.center)
+            game.boss_flow_field.update(game.player.rect.center)
+        vectorized.enemies.update_movement(vectorized.player, vectorized.wall_grid,
+                                           vectorized.flow_field, vectorized.boss_flow_field)
+        scalar.enemies._update_movement_scalar(scalar.player, scalar.wall_grid,
+                                               scalar.flow_field, scalar.boss_flow_field)
+        count = vectorized.enemies.count
+        for name in ("x", "y", "cell_column", "cell_row"):
+            vectorized_column = getattr(vectorized.enemies, name)[:count]
+            assert (vectorized_column == getattr(scalar.enemies, name)[:count]).all(), (tick, name)
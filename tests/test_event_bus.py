@@ -0,0 +1,54 @@
+from event_bus import EventBus, EnemyDefeated, EnemyHit, InvalidPetSlot, PetBought
+
+
+def test_console_prints_events_at_its_level_and_above(capsys):
+    bus = EventBus(console_level="info")
+    bus.emit(EnemyHit, "Skibidi", 10, 40)
+    bus.emit(EnemyDefeated, "Skibidi", 10)
+    bus.emit(InvalidPetSlot, 9)
+    assert capsys.readouterr().out == ""  # nothing goes out before flush()
+    bus.flush(wait=True)
+    assert capsys.readouterr().out == "Defeated Skibidi with 10 damage!\nInvalid slot index: 9\n"
+
+    bus.set_console_level("debug")
+    bus.emit(EnemyHit, "Skibidi", 10, 40)
+    bus.flush(wait=True)
+    assert capsys.readouterr().out == "Hit Skibidi for 10 damage! Enemy health: 40\n"
+
+
+def test_unwanted_events_are_not_built(capsys):
+    class Unbuildable:
+        log_level = 20
+
+        def __init__(self, *fields):
+            raise AssertionError("built an event nobody wants")
+
+    bus = EventBus(console_level=None)
+    bus.emit(Unbuildable, "anything")
+    bus.flush(wait=True)
+    assert capsys.readouterr().out == ""
+
+
+def test_subscribers_get_their_types_in_order():
+    bus = EventBus(console_level=None)
+    received = []
+    bus.subscribe(lambda event: received.append(("kills", event)), EnemyDefeated)
+    bus.subscribe(lambda event: received.append(("all", event)))
+    bus.emit(PetBought, "Tralalero", 3)
+    bus.emit(EnemyDefeated, "Skibidi", 10)
+    bus.emit(EnemyHit, "Skibidi", 5, 20)
+    assert received == []
+    bus.flush()
+
+    bought, defeated, hit = PetBought("Tralalero", 3), EnemyDefeated("Skibidi", 10), EnemyHit("Skibidi", 5, 20)
+    assert received == [("all", bought), ("kills", defeated), ("all", defeated), ("all", hit)]
+
+
+def test_unsubscribed_callbacks_stop_receiving():
+    bus = EventBus(console_level=None)
+    received = []
+    bus.subscribe(received.append, EnemyDefeated)
+    bus.unsubscribe(received.append, EnemyDefeated)
+    bus.emit(EnemyDefeated, "Skibidi", 10)
+    bus.flush()
+    assert received == []
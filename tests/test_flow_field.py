@@ -0,0 +1,51 @@
+import math
+import numpy as np
+from game_config import BOSS_SIZE
+from flow_field import FlowField, NEIGHBOR_STEPS, NO_STEP
+from walls import WallGrid, create_walls
+
+PLAYER_CENTERS = [(150, 150), (640, 360), (1100, 600), (400, 500)]
+
+
+def test_open_arena_heads_straight_everywhere():
+    field = FlowField(WallGrid([]))
+    for center in PLAYER_CENTERS:
+        field.update(center)
+        assert (field._steps == NO_STEP).all()
+
+
+def test_steps_lead_downhill_to_the_player():
+    field = FlowField(WallGrid(create_walls()))
+    for center in PLAYER_CENTERS:
+        player_cell = tuple(int(value) for value in field.cell_of(np.array(center[0]), np.array(center[1])))
+        distance = field._compute_distances(player_cell)
+        field.update(center)
+        rows, columns = np.nonzero(field._steps != NO_STEP)
+        assert len(rows) > 0  # the level's walls force some detours
+        for row, column in zip(rows.tolist(), columns.tolist()):
+            step_column, step_row, cost = NEIGHBOR_STEPS[field._steps[row, column]]
+            assert not field._corner_blocked[row, column, field._steps[row, column]]
+            next_distance = distance[row + step_row, column + step_column]
+            if field.blocked[row, column]:  # nothing steps into a blocked cell, but there's a way out
+                assert math.isfinite(next_distance)
+            else:
+                assert math.isclose(next_distance + cost, distance[row, column])
+
+
+def test_cached_fields_match_fresh_ones():
+    cached = FlowField(WallGrid(create_walls()))
+    for center in PLAYER_CENTERS + PLAYER_CENTERS:
+        cached.update(center)
+        fresh = FlowField(WallGrid(create_walls()))
+        fresh.update(center)
+        assert (cached._steps == fresh._steps).all()
+    assert cached.cache_hits == len(PLAYER_CENTERS)
+
+
+def test_bosses_are_blocked_wherever_enemies_are():
+    wall_grid = WallGrid(create_walls())
+    enemy_field = FlowField(wall_grid)
+    boss_field = FlowField(wall_grid, agent_size=BOSS_SIZE)
+    rows, columns = enemy_field.blocked.shape
+    assert boss_field.blocked[:rows, :columns][enemy_field.blocked].all()
+    assert boss_field.blocked.sum() > enemy_field.blocked.sum()
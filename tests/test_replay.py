@@ -0,0 +1,70 @@
+import pygame
+import pytest
+from headless import ScriptedInput, run_headless, run_replay
+from replay import (Replay, ReplayError, ReplayRecorder, RECORD_CLICK, RECORD_KEY, RECORD_KEYS, key_mask,
+                    play_replay, replay_matches, state_checksum)
+
+SCRIPT = [(0, "press", ["d"]), (90, "press", ["s"]), (200, "release", ["d"]), (260, "key", ["p"]),
+          (270, "key", ["esc"]), (300, "release", ["s"]), (320, "press", ["left"])]
+SCRIPT += [(frame, "click", [str(frame % 1280), str(frame % 720)]) for frame in range(15, 900, 45)]
+
+
+def test_recorded_session_replays_to_the_same_state(tmp_path):
+    path = str(tmp_path / "session.replay")
+    stats = run_headless(seed=11, frames=900, script=ScriptedInput(SCRIPT), record_path=path)
+
+    replay = Replay.load(path)
+    assert (replay.seed, replay.frames) == (11, stats["frames"])
+    assert replay.checksum != 0
+    game_manager = play_replay(replay)
+    assert replay_matches(replay, game_manager)
+    assert state_checksum(game_manager) == replay.checksum
+    assert run_replay(replay)["replay_matches"]
+
+
+def test_replay_notices_a_different_ending(tmp_path):
+    path = str(tmp_path / "session.replay")
+    run_headless(seed=12, frames=300, script=ScriptedInput(SCRIPT), record_path=path)
+    replay = Replay.load(path)
+    replay.seed += 1  # same input, different enemies
+    assert not replay_matches(replay, play_replay(replay))
+
+
+def test_records_round_trip_through_bytes():
+    script = ScriptedInput(SCRIPT)
+    recorder = ReplayRecorder(seed=300)
+    expected = []
+    mask = 0  # nothing held when recording starts
+    for frame in range(900):
+        events = script.events_for_frame(frame)
+        for event in events:
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                expected.append((frame, RECORD_CLICK, (event.button, *event.pos)))
+            else:
+                expected.append((frame, RECORD_KEY, event.key))
+        if key_mask(script.keys) != mask:
+            mask = key_mask(script.keys)
+            expected.append((frame, RECORD_KEYS, mask))
+        recorder.record_frame(script.keys, events)
+
+    replay = Replay.from_bytes(recorder.to_bytes())
+    assert (replay.seed, replay.frames, replay.checksum) == (300, 900, 0)
+    assert replay.records == expected
+
+    held = {frame: keys for frame, keys, _events in replay.frames_with_input()}
+    assert held[100][pygame.K_d] and held[100][pygame.K_s] and not held[100][pygame.K_LEFT]
+    assert held[899][pygame.K_LEFT] and not held[899][pygame.K_s]
+
+
+@pytest.mark.parametrize("damage, message", [
+    (lambda data: b"XXXX" + data[4:], "Not a replay file"),
+    (lambda data: data[:4] + bytes([99]) + data[5:], "Unsupported replay version"),
+    (lambda data: data[:-4], "Corrupt replay data"),
+])
+def test_damaged_replays_are_rejected(damage, message):
+    recorder = ReplayRecorder(seed=1)
+    script = ScriptedInput(SCRIPT)
+    for frame in range(300):
+        recorder.record_frame(script.keys, script.events_for_frame(frame))
+    with pytest.raises(ReplayError, match=message):
+        Replay.from_bytes(damage(recorder.to_bytes()))
@@ -0,0 +1,81 @@
+import random
+import pytest
+from enemies import Enemy, Boss
+from game_config import ENEMY_LOD_MIN_ENEMIES
+from game_manager import GameManager
+from headless import ScriptedInput
+from replay import state_checksum
+from save_state import SaveError, load_state, save_state, load_game, save_game
+
+# Walk a loop around the arena, clicking at the middle now and then
+SCRIPT = []
+for start, key in ((0, "d"), (240, "s"), (480, "a"), (720, "w"), (960, "d")):
+    SCRIPT += [(start, "press", [key]), (start + 200, "release", [key])]
+SCRIPT += [(frame, "click", ["640", "360"]) for frame in range(30, 1200, 30)]
+
+
+def _play(game_manager, script, start, stop):
+    for frame in range(start, stop):
+        for event in script.events_for_frame(frame):
+            game_manager.handle_input(event)
+        game_manager.update_game(script.keys)
+
+
+def _started_game(seed, frames=600, extra_enemies=0):
+    random.seed(seed)
+    game_manager = GameManager()
+    for index in range(extra_enemies):
+        (Boss if index % 10 == 9 else Enemy)(game_manager.enemies)
+    script = ScriptedInput(SCRIPT)
+    _play(game_manager, script, 0, frames)
+    return game_manager, script
+
+
+@pytest.mark.parametrize("extra_enemies", [0, ENEMY_LOD_MIN_ENEMIES + 100])  # with and without LOD scheduling
+def test_loaded_game_carries_on_exactly_like_the_original(extra_enemies):
+    original, script = _started_game(5, extra_enemies=extra_enemies)
+    assert len(original.enemies) > 0
+    data = save_state(original)
+
+    random.seed(999)  # load_state has to bring back the random state too
+    loaded = GameManager()
+    load_state(loaded, data)
+    assert state_checksum(loaded) == state_checksum(original)
+    assert save_state(loaded) == data
+
+    loaded_script = ScriptedInput(SCRIPT)
+    loaded_script.keys.pressed = set(script.keys.pressed)  # the keys held when the game was saved
+    _play(original, script, 600, 1200)
+    original_checksum, original_data = state_checksum(original), save_state(original)
+
+    load_state(loaded, data)  # the random state now comes from the save again
+    _play(loaded, loaded_script, 600, 1200)
+    assert state_checksum(loaded) == original_checksum
+    assert save_state(loaded) == original_data
+
+
+def test_save_file_round_trip(tmp_path):
+    game_manager, _ = _started_game(6)
+    path = str(tmp_path / "game.save")
+    save_game(game_manager, path)
+    loaded = GameManager()
+    load_game(loaded, path)
+    assert state_checksum(loaded) == state_checksum(game_manager)
+    assert not (tmp_path / "game.save.tmp").exists()
+
+
+@pytest.mark.parametrize("damage, message", [
+    (lambda data: b"XXXX" + data[4:], "Not a save file"),
+    (lambda data: data[:2], "Not a save file"),
+    (lambda data: data[:4] + bytes([99]) + data[5:], "Unsupported save version 99"),
+    (lambda data: data[:-3], "ends too early"),
+    (lambda data: data + b"\0\0", "2 bytes past the end"),
+])
+def test_damaged_saves_are_rejected_without_touching_the_game(damage, message):
+    game_manager, _ = _started_game(7, frames=300)
+    data = save_state(game_manager)
+    target = GameManager()
+    before = save_state(target)
+    with pytest.raises(SaveError, match=message):
+        load_state(target, damage(data))
+    assert save_state(target) == before
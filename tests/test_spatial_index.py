@@ -0,0 +1,60 @@
+import random
+import numpy as np
+import pygame
+from spatial_index import SpatialHash
+
+
+class Box:
+    __slots__ = ("rect",)
+
+    def __init__(self, x, y, size=40):
+        self.rect = pygame.Rect(x, y, size, size)
+
+
+def _brute_force(boxes, point):
+    return [box for box in boxes if box.rect.collidepoint(point)]
+
+
+def test_query_point_returns_overlapping_entities_oldest_first():
+    rng = random.Random(1)
+    index = SpatialHash(cell_size=80)
+    boxes = []  # oldest first
+    for _ in range(300):
+        box = Box(rng.randrange(0, 600), rng.randrange(0, 400), rng.randrange(1, 81))
+        index.insert(box, box.rect.x, box.rect.y)
+        boxes.append(box)
+    for _ in range(200):  # moving keeps an entity's place in line
+        box = rng.choice(boxes)
+        box.rect.topleft = (rng.randrange(0, 600), rng.randrange(0, 400))
+        index.move(box, box.rect.x, box.rect.y)
+    for box in boxes[::3]:
+        index.remove(box)
+    boxes = [box for box in boxes if box in index]
+
+    for _ in range(2000):
+        point = (rng.randrange(-10, 700), rng.randrange(-10, 500))
+        assert index.query_point(point) == _brute_force(boxes, point)
+    assert list(index) == boxes
+
+
+def test_replace_all_matches_inserting_one_at_a_time():
+    rng = random.Random(2)
+    boxes = [Box(rng.randrange(0, 600), rng.randrange(0, 400)) for _ in range(100)]
+    orders = np.array(rng.sample(range(100), 100))  # insertion rank of each box
+    one_at_a_time = SpatialHash()
+    for rank in range(100):
+        box = boxes[int(np.flatnonzero(orders == rank)[0])]
+        one_at_a_time.insert(box, box.rect.x, box.rect.y)
+
+    bulk = SpatialHash()
+    cells = [bulk.cell_of(box.rect.x, box.rect.y) for box in boxes]
+    columns, rows = (np.array(values) for values in zip(*cells))
+    bulk.replace_all(boxes, columns, rows, orders)
+    assert bulk.entries == one_at_a_time.entries
+    assert bulk.cells == one_at_a_time.cells
+    for cell, bucket in one_at_a_time.cells.items():
+        assert list(bulk.cells[cell]) == list(bucket)
+
+    newest = Box(10, 10)  # new entities still go after every loaded one
+    bulk.insert(newest, 10, 10)
+    assert bulk.query_point((15, 15))[-1] is newest
@@ -0,0 +1,42 @@
+import random
+import numpy as np
+import pygame
+import pytest
+from walls import Wall, WallGrid, create_walls
+
+
+def _random_walls(rng, count):
+    return [Wall(rng.randrange(0, 1000), rng.randrange(0, 560), rng.randrange(1, 200), rng.randrange(1, 200))
+            for _ in range(count)]
+
+
+def _random_rects(rng, count):
+    # Reaching past every side of the walls' bounding box, down to 1x1
+    return [pygame.Rect(rng.randrange(-150, 1250), rng.randrange(-150, 750),
+                        rng.randrange(1, 120), rng.randrange(1, 120))
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize("layout", ["level", "random", "one", "none"])
+def test_queries_match_a_brute_force_scan(layout):
+    rng = random.Random(layout)
+    walls = {"level": create_walls(), "random": _random_walls(rng, 40),
+             "one": [Wall(500, 300, 1, 1)], "none": []}[layout]
+    grid = WallGrid(walls)
+    rects = _random_rects(rng, 3000)
+
+    expected = [[wall for wall in walls if rect.colliderect(wall.rect)] for rect in rects]
+    columns = [np.array([getattr(rect, name) for rect in rects]) for name in ("x", "y", "width", "height")]
+    assert grid.collides_any(*columns).tolist() == [bool(hits) for hits in expected]
+    for rect, hits in zip(rects, expected):
+        assert grid.collides(rect) == bool(hits)
+        assert grid.collides_at(rect.x, rect.y, rect.width, rect.height) == bool(hits)
+        assert grid.colliding_walls(rect) == hits
+
+
+def test_touching_edges_do_not_collide():
+    grid = WallGrid([Wall(100, 100, 50, 50)])
+    assert not grid.collides_at(50, 100, 50, 50)  # ends where the wall starts
+    assert not grid.collides_at(150, 100, 50, 50)
+    assert not grid.collides_at(100, 150, 50, 50)
+    assert grid.collides_at(51, 100, 50, 50)
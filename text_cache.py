@@ -0,0 +1,52 @@
+from collections import OrderedDict
+from game_config import TEXT_CACHE_SIZE
+
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces keyed by (text, color, antialias)
+
+    Most text on screen is identical from one frame to the next, so after the
+    first frame nearly every render() is a dictionary lookup instead of glyph
+    rasterization. The hit/miss counters show how well that holds up.
+    """
+
+    def __init__(self, font, max_entries=TEXT_CACHE_SIZE):
+        self.font = font
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def render(self, text, color, antialias=True):
+        """Return a rendered surface for the text, rasterizing it only on a cache miss"""
+        key = (text, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)  # Drop the least recently used text
+        return surface
+
+    def reset_stats(self):
+        """Zero the hit/miss counters (e.g. after the first frame has warmed the cache)"""
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self):
+        """Counters for checking how much text is still being rasterized"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._surfaces),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
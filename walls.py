@@ -1,15 +1,106 @@
 import pygame
-from game_config import GRAY, GAMEPLAY_LEFT, GAMEPLAY_RIGHT, GAMEPLAY_BOTTOM
+import numpy as np
+from game_config import GRAY, GAMEPLAY_LEFT, GAMEPLAY_RIGHT, GAMEPLAY_BOTTOM, WALL_GRID_CELL_SIZE
 
 
 class Wall:
     """A wall obstacle that blocks movement"""
 
+    __slots__ = ("rect", "color")
+
     def __init__(self, x, y, width, height, color=GRAY):
         self.rect = pygame.Rect(x, y, width, height)
         self.color = color
 
 
+class WallGrid:
+    """Uniform grid over the static walls, built once, for fast collision queries
+
+    Each cell lists the walls overlapping it, so a query only tests the few
+    walls near the rect instead of every wall in the level. Batched queries
+    from the enemy store use a summed-area table of wall pixels instead,
+    which answers "does this rect touch a wall" in constant time.
+    """
+
+    def __init__(self, walls, cell_size=WALL_GRID_CELL_SIZE):
+        self.walls = walls
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> indices of walls overlapping that cell
+        for index, wall in enumerate(walls):
+            for cell in self._cells_overlapping(wall.rect):
+                self.cells.setdefault(cell, []).append(index)
+        self._build_coverage_table()
+
+    def _cells_overlapping(self, rect):
+        """All grid cells a rect touches"""
+        size = self.cell_size
+        for column in range(rect.left // size, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield column, row
+
+    def colliding_walls(self, rect):
+        """Walls overlapping a rect, in the same order as the wall list"""
+        hits = set()
+        for cell in self._cells_overlapping(rect):
+            for index in self.cells.get(cell, ()):
+                if rect.colliderect(self.walls[index].rect):
+                    hits.add(index)
+        return [self.walls[index] for index in sorted(hits)]
+
+    def collides(self, rect):
+        """True if a rect overlaps any wall"""
+        for cell in self._cells_overlapping(rect):
+            for index in self.cells.get(cell, ()):
+                if rect.colliderect(self.walls[index].rect):
+                    return True
+        return False
+
+    def _build_coverage_table(self):
+        """Summed-area table of wall pixels, so any rect can be tested with 4 lookups"""
+        if not self.walls:
+            self._left = self._top = 0
+            self._coverage = np.zeros((1, 1), dtype=np.int32)
+            return
+        self._left = min(wall.rect.left for wall in self.walls)
+        self._top = min(wall.rect.top for wall in self.walls)
+        right = max(wall.rect.right for wall in self.walls)
+        bottom = max(wall.rect.bottom for wall in self.walls)
+
+        occupied = np.zeros((bottom - self._top, right - self._left), dtype=np.int32)
+        for wall in self.walls:
+            occupied[wall.rect.top - self._top:wall.rect.bottom - self._top,
+                     wall.rect.left - self._left:wall.rect.right - self._left] = 1
+
+        # coverage[y, x] = number of wall pixels above and left of (x, y)
+        self._coverage = np.zeros((occupied.shape[0] + 1, occupied.shape[1] + 1), dtype=np.int32)
+        self._coverage[1:, 1:] = occupied.cumsum(axis=0).cumsum(axis=1)
+
+    def collides_at(self, x, y, width, height):
+        """Scalar collides_any() for one rect given as plain ints"""
+        coverage = self._coverage
+        max_y, max_x = coverage.shape[0] - 1, coverage.shape[1] - 1
+        left, right = x - self._left, x + width - self._left
+        top, bottom = y - self._top, y + height - self._top
+        if left < 0 or right > max_x or top < 0 or bottom > max_y:
+            left, right = min(max(left, 0), max_x), min(max(right, 0), max_x)
+            top, bottom = min(max(top, 0), max_y), min(max(bottom, 0), max_y)
+        item = coverage.item
+        return (item(bottom, right) - item(top, right) - item(bottom, left) + item(top, left)) > 0
+
+    def collides_any(self, x, y, width, height):
+        """Vectorized collides(): one bool per rect given as NumPy columns"""
+        max_y, max_x = self._coverage.shape[0] - 1, self._coverage.shape[1] - 1
+        # Clip each rect to the walls' bounding box; parts outside it can't hit a wall
+        left = np.minimum(np.maximum(x - self._left, 0), max_x)
+        right = np.minimum(np.maximum(x + width - self._left, 0), max_x)
+        top = np.minimum(np.maximum(y - self._top, 0), max_y)
+        bottom = np.minimum(np.maximum(y + height - self._top, 0), max_y)
+
+        coverage = self._coverage
+        wall_pixels = coverage[bottom, right] - coverage[top, right] - coverage[bottom, left] + coverage[top, left]
+        return wall_pixels > 0
+
+
 def create_level_walls():
     """Create the wall layout for the current level - positioned in gameplay area"""
     walls = []